@@ -1,6 +1,9 @@
 from datetime import date, timedelta
 import sqlite3
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import get_connection, transaccion
+from src.repositories.cliente_repository import ClienteRepository
+from src.repositories.resumen_mensual_repository import ResumenMensualRepository
+from src.domain.cliente import Cliente
 
 # ==============================================================================
 # CONFIGURACIÓN DE ESCENARIOS DE PRUEBA
@@ -64,17 +67,20 @@ def generar_empleados(cursor):
 def generar_clientes(cursor, cantidad=100):
     print(f"Generando {cantidad} Clientes (IDs 1 al {cantidad})...")
     # Generamos 100 clientes fijos: Cliente 1, Cliente 2...
-    for i in range(1, cantidad + 1):
-        nombre = f"Cliente{i}"
-        apellido = "Prueba"
-        dni = str(10000000 + i) # DNIs del 10000001 al 10000100
-        email = f"cliente{i}@test.com"
-        telefono = f"351{i:07d}"
-        
-        cursor.execute("""
-            INSERT INTO clientes (nombre, apellido, dni, email, telefono, activo)
-            VALUES (?, ?, ?, ?, ?, 1)
-        """, (nombre, apellido, dni, email, telefono))
+    # DNIs del 10000001 al 10000100. Se insertan todos juntos con executemany.
+    clientes = [
+        Cliente(
+            id=None,
+            nombre=f"Cliente{i}",
+            apellido="Prueba",
+            dni=str(10000000 + i),
+            email=f"cliente{i}@test.com",
+            telefono=f"351{i:07d}",
+            activo=True,
+        )
+        for i in range(1, cantidad + 1)
+    ]
+    ClienteRepository.crear_muchos(clientes)
 
 def generar_vehiculos(cursor, cantidad=25):
     print(f"Generando {cantidad} Vehículos (IDs 1 al {cantidad})...")
@@ -196,16 +202,20 @@ def generar_escenario_reportes(cursor):
 if __name__ == "__main__":
     conn = get_connection()
     try:
-        limpiar_datos(conn.cursor())
-        
-        generar_admin(conn.cursor())
-        generar_empleados(conn.cursor())
-        generar_clientes(conn.cursor()) # 100
-        generar_vehiculos(conn.cursor()) # 25
-        
-        generar_escenario_reportes(conn.cursor())
-        
-        conn.commit()
+        # Todo el script en una sola transacción: un único commit al final
+        with transaccion():
+            limpiar_datos(conn.cursor())
+
+            generar_admin(conn.cursor())
+            generar_empleados(conn.cursor())
+            generar_clientes(conn.cursor()) # 100
+            generar_vehiculos(conn.cursor()) # 25
+
+            generar_escenario_reportes(conn.cursor())
+
+            # Los datos se insertaron directo en las tablas
+            ResumenMensualRepository.reconstruir()
+
         print("\n=========================================")
         print(" DATOS FIJOS GENERADOS EXITOSAMENTE")
         print("=========================================")
@@ -1,9 +1,26 @@
-from src.repositories.db_connection import init_db
+import sys
+
+from src.repositories.db_connection import init_db, get_connection
+from src.repositories.indices import verificar_indices
+from src.repositories.resumen_mensual_repository import ResumenMensualRepository
 
 def main():
     print("Inicializando base de datos...")
-    init_db()
+    init_db(progreso=lambda etapa, hechos, total: print(f"  {etapa} ({hechos}/{total})"))
     print("BD lista.\n")
 
+    # python main.py --reconstruir-resumen: recalcula resumen_mensual tras
+    # cargas masivas o importaciones hechas por fuera de los servicios.
+    if "--reconstruir-resumen" in sys.argv[1:]:
+        print("Reconstruyendo resumen mensual...")
+        ResumenMensualRepository.reconstruir()
+        print("Resumen mensual actualizado.\n")
+
+    faltantes = verificar_indices(get_connection())
+    if faltantes:
+        print("Consultas sin índice adecuado:")
+        for consulta, detalle in faltantes:
+            print(f"  - {consulta}: {detalle}")
+
 if __name__ == "__main__":
     main()
@@ -1,7 +1,11 @@
+from src.repositories.db_connection import init_db
 from src.ui.gui.app import App
 
 
 def main():
+    # Igual que main.py: la interfaz depende de las tablas que crean las
+    # migraciones (p. ej. resumen_mensual); si ya están, es una sola consulta.
+    init_db()
     app = App()
     app.mainloop()
 
@@ -0,0 +1,84 @@
+"""
+Control del tiempo de arranque de la interfaz.
+
+Importa main_gui en un intérprete nuevo con `python -X importtime` y falla
+(código de salida 1) si los imports superan IMPORTS_ARRANQUE_MAX_MS o si
+se cargó alguna librería que sólo usan pantallas posteriores al login.
+
+    python medir_arranque.py                 # main_gui, 3 corridas
+    python medir_arranque.py --detalle 20    # muestra los 20 más lentos
+"""
+import argparse
+import subprocess
+import sys
+
+from src.config.settings import IMPORTS_ARRANQUE_MAX_MS
+
+# Librerías que no deben cargarse para mostrar Home y Login
+NO_PERMITIDAS_AL_ARRANCAR = ("matplotlib", "reportlab", "tkcalendar", "numpy")
+
+
+def medir(modulo):
+    """
+    Importa `modulo` en un proceso aparte y devuelve
+    (total_ms, [(ms_acumulado, paquete)] de primer nivel, paquetes cargados).
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True,
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1] if proceso.stderr else "error al importar")
+
+    primer_nivel = []
+    cargados = set()
+    for linea in proceso.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not linea.startswith("import time:") or "imported package" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        paquete = nombre.strip()
+        cargados.add(paquete.split(".")[0])
+        # Los imports anidados vienen indentados: sólo se suman los de primer nivel
+        if nombre[1:2] != " ":
+            primer_nivel.append((int(acumulado) / 1000, paquete))
+
+    return sum(ms for ms, _ in primer_nivel), primer_nivel, cargados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica el presupuesto de tiempo de imports del arranque.")
+    parser.add_argument("--modulo", default="main_gui")
+    parser.add_argument("--presupuesto-ms", type=float, default=IMPORTS_ARRANQUE_MAX_MS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--detalle", type=int, default=10, help="cantidad de imports más lentos a listar")
+    args = parser.parse_args()
+
+    try:
+        # Se queda con la corrida más rápida: la primera suele incluir compilar .pyc
+        total, primer_nivel, cargados = min(
+            (medir(args.modulo) for _ in range(max(1, args.repeticiones))),
+            key=lambda medicion: medicion[0],
+        )
+    except RuntimeError as e:
+        print(f"No se pudo importar {args.modulo}: {e}")
+        return 2
+
+    print(f"Imports de {args.modulo}: {total:.0f} ms (presupuesto {args.presupuesto_ms:.0f} ms)")
+    for ms, paquete in sorted(primer_nivel, reverse=True)[:args.detalle]:
+        print(f"  {ms:8.1f} ms  {paquete}")
+
+    errores = []
+    if total > args.presupuesto_ms:
+        errores.append(f"se excedió el presupuesto por {total - args.presupuesto_ms:.0f} ms")
+    for libreria in NO_PERMITIDAS_AL_ARRANCAR:
+        if libreria in cargados:
+            errores.append(f"{libreria} se importa al arrancar (debería cargarse a demanda)")
+
+    for error in errores:
+        print(f"ERROR: {error}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,53 @@
 # src/config/settings.py
 
 DB_PATH = "data/alquileres.db"
+
+# Pool de conexiones: cada hilo usa su propia conexión a SQLite.
+DB_POOL_MAX_CONEXIONES = 8     # conexiones simultáneas como máximo
+DB_POOL_TIMEOUT = 10.0         # segundos a esperar una conexión libre
+
+# Perfiles de PRAGMA aplicados a cada conexión al abrirla.
+# WAL permite que los lectores (reportes) y los escritores (alquileres)
+# trabajen en simultáneo desde varias terminales.
+DB_PRAGMA_PERFILES = {
+    # Máxima durabilidad: cada commit se sincroniza completo a disco.
+    "safe": {
+        "busy_timeout": 5000,          # ms a esperar si otra terminal tiene el lock
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,           # negativo = KiB (8 MB)
+        "temp_store": "DEFAULT",
+    },
+    # Rendimiento: en WAL, NORMAL sólo arriesga la última transacción ante un corte de luz.
+    "fast": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,          # 64 MB
+        "mmap_size": 268435456,        # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+DB_PERFIL = "fast"
+
+# Cada cuánto se mira PRAGMA data_version para detectar commits de otra
+# terminal (generacion_datos). Los de este proceso se detectan enseguida.
+GENERACION_VERIFICAR_CADA_MS = 250
+
+# Caché LRU de entidades (clientes, vehículos, empleados) leídas por id.
+CACHE_ENTIDADES_MAX = 2000
+
+# Caché LRU de resultados de reportes (por reporte, rango y generación de datos).
+CACHE_REPORTES_MAX = 64
+
+# SnapshotAlquileres aplica de a una las filas cambiadas hasta este número de
+# anotaciones en alquileres_cambios; con más, recarga la tabla completa.
+# Debe ser menor que las 10000 que conserva la migración 4.
+SNAPSHOT_CAMBIOS_MAX = 5000
+
+# Pantallas que la interfaz mantiene construidas al navegar (LRU); el resto
+# se destruye y se vuelve a armar al abrirla.
+PANTALLAS_EN_CACHE_MAX = 4
+
+# Presupuesto de tiempo de los imports al abrir la interfaz (medir_arranque.py).
+IMPORTS_ARRANQUE_MAX_MS = 600
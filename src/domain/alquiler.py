@@ -1,4 +1,10 @@
 class Alquiler:
+    __slots__ = (
+        "id_alquiler", "id_cliente", "id_vehiculo", "id_empleado",
+        "fecha_inicio", "fecha_fin", "precio_por_dia", "estado", "total",
+        "km_inicial", "km_final", "combustible_inicial", "combustible_final",
+    )
+
     def __init__(
         self,
         id_alquiler,
@@ -1,6 +1,10 @@
 # src/domain/cliente.py
 
 class Cliente:
+    __slots__ = (
+        "id", "nombre", "apellido", "dni", "email", "telefono", "activo",
+    )
+
     def __init__(
         self,
         id: int,
@@ -1,6 +1,11 @@
 # src/domain/empleado.py
 
 class Empleado:
+    __slots__ = (
+        "id_empleado", "nombre", "apellido", "dni", "email", "telefono",
+        "usuario", "password", "rol", "activo",
+    )
+
     def __init__(
         self,
         id_empleado,
@@ -1,4 +1,8 @@
 class Incidente:
+    __slots__ = (
+        "id_incidente", "id_alquiler", "tipo", "descripcion", "monto", "estado",
+    )
+
     def __init__(self, id_incidente, id_alquiler, tipo, descripcion, monto, estado="PENDIENTE"):
         self.id_incidente = id_incidente
         self.id_alquiler = id_alquiler
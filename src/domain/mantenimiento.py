@@ -1,4 +1,9 @@
 class Mantenimiento:
+    __slots__ = (
+        "id_mantenimiento", "id_vehiculo", "fecha_inicio", "fecha_fin",
+        "descripcion",
+    )
+
     def __init__(self, id_mantenimiento, id_vehiculo, fecha_inicio, fecha_fin, descripcion):
         self.id_mantenimiento = id_mantenimiento
         self.id_vehiculo = id_vehiculo
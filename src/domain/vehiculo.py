@@ -1,6 +1,11 @@
 # src/domain/vehiculo.py
 
 class Vehiculo:
+    __slots__ = (
+        "id_vehiculo", "patente", "marca", "modelo", "anio", "tipo",
+        "precio_por_dia", "activo", "estado", "km_actual", "combustible_actual",
+    )
+
     def __init__(
         self,
         id_vehiculo,
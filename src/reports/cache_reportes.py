@@ -0,0 +1,116 @@
+import copy
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+from src.config.settings import CACHE_REPORTES_MAX
+from src.repositories.db_connection import (
+    get_connection, generacion_datos, suscribir_cambios, TODAS_LAS_TABLAS,
+)
+
+
+# Tablas de las que leen los reportes: un aviso sobre cualquiera vacía la caché
+TABLAS_REPORTES = {"alquileres", "incidentes", "vehiculos", "clientes", "mantenimientos", "resumen_mensual"}
+
+
+class CacheReportes:
+    """
+    Caché LRU de resultados de reportes (Singleton).
+
+    La clave es (reporte, argumentos, generación de datos): la tabla, el
+    gráfico y el PDF de un mismo rango comparten un único cálculo, y
+    cualquier commit (propio o de otra terminal, ver generacion_datos())
+    deja inalcanzables los resultados anteriores, que se descartan en la
+    siguiente consulta.
+
+    No se guarda lo calculado dentro de una transacción abierta: puede
+    incluir cambios que después se revierten.
+    """
+    _instance = None
+    _lock_instancia = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock_instancia:
+                if cls._instance is None:
+                    instancia = super(CacheReportes, cls).__new__(cls)
+                    instancia._lock = threading.Lock()
+                    instancia._entradas = OrderedDict()   # (reporte, args, generación) -> resultado
+                    instancia._max = CACHE_REPORTES_MAX
+                    instancia._generacion = None
+                    instancia.aciertos = 0
+                    instancia.fallos = 0
+                    suscribir_cambios(instancia._on_cambio)
+                    cls._instance = instancia
+        return cls._instance
+
+    def _on_cambio(self, tablas):
+        if TODAS_LAS_TABLAS in tablas or tablas & TABLAS_REPORTES:
+            self.limpiar()
+
+    def obtener(self, reporte, argumentos, calcular):
+        """
+        Devuelve el resultado de `reporte` para `argumentos` (tupla hashable);
+        si no está en caché lo calcula con calcular(). Siempre entrega una
+        copia: quien llama puede modificar las filas sin tocar la caché.
+        """
+        generacion = generacion_datos()
+        clave = (reporte, argumentos, generacion)
+        with self._lock:
+            if generacion != self._generacion:
+                self._entradas.clear()
+                self._generacion = generacion
+            resultado = self._entradas.get(clave)
+            if resultado is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(resultado)
+            self.fallos += 1
+
+        # Se calcula sin el lock: otro hilo puede resolver otro reporte a la vez
+        resultado = calcular()
+        if get_connection().in_transaction:
+            return resultado
+
+        with self._lock:
+            if generacion == self._generacion:
+                self._entradas[clave] = copy.deepcopy(resultado)
+                while len(self._entradas) > self._max:
+                    self._entradas.popitem(last=False)
+        return resultado
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "max": self._max,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": (self.aciertos / consultas) if consultas else 0.0,
+            }
+
+
+def cacheado(funcion):
+    """
+    Decorador para las funciones obtener_* de los reportes. Los argumentos
+    se normalizan con la firma (posicionales, por nombre o por defecto dan
+    la misma clave).
+    """
+    firma = inspect.signature(funcion)
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        ligados = firma.bind(*args, **kwargs)
+        ligados.apply_defaults()
+        return CacheReportes().obtener(
+            funcion.__name__, tuple(ligados.arguments.items()),
+            lambda: funcion(*args, **kwargs),
+        )
+
+    return envoltura
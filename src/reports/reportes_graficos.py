@@ -173,3 +173,39 @@ def grafico_facturacion_mensual(fecha_desde: str, fecha_hasta: str):
     ax.grid(axis="y", linestyle="--", alpha=0.5)
 
     return True, fig
+
+
+def grafico_timeline_flota(fecha_desde: str, fecha_hasta: str):
+    """
+    Devuelve (ok, fig_o_msg).
+    Áreas apiladas con la cantidad diaria de vehículos disponibles,
+    alquilados y en mantenimiento a lo largo del período.
+    """
+    ok, data = rpt.obtener_timeline_flota(fecha_desde, fecha_hasta)
+    if not ok:
+        return False, data
+
+    dias = data["dias"]
+    if not data["vehiculos"]:
+        return False, "No hay vehículos activos para graficar la ocupación de la flota."
+
+    fechas = [date.fromisoformat(d["fecha"]) for d in dias]
+
+    fig = Figure(figsize=(8, 4))
+    ax = fig.add_subplot(111)
+
+    ax.stackplot(
+        fechas,
+        [d["alquilados"] for d in dias],
+        [d["mantenimiento"] for d in dias],
+        [d["disponibles"] for d in dias],
+        labels=["Alquilados", "Mantenimiento", "Disponibles"],
+        alpha=0.8,
+    )
+    ax.set_ylabel("Vehículos")
+    ax.set_title(f"Ocupación de la flota\n{fecha_desde} a {fecha_hasta}")
+    ax.legend(loc="upper left")
+    ax.grid(axis="y", linestyle="--", alpha=0.5)
+    fig.autofmt_xdate()
+
+    return True, fig
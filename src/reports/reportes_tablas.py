@@ -1,70 +1,25 @@
 from collections import defaultdict
+from datetime import date, timedelta
 
-from src.repositories.alquiler_repository import AlquilerRepository
-from src.repositories.incidente_repository import IncidenteRepository
-from src.repositories.vehiculo_repository import VehiculoRepository
+from src.reports.cache_reportes import cacheado
+from src.reports.snapshot_alquileres import SnapshotAlquileres
 from src.repositories.cliente_repository import ClienteRepository
-from src.repositories.mantenimiento_repository import MantenimientoRepository
-
-
-def _en_rango(fecha: str, desde: str, hasta: str) -> bool:
-    """
-    Compara fechas en formato 'AAAA-MM-DD' de forma inclusiva.
-    Asume que todas vienen en ese formato.
-    """
-    if not fecha:
-        return False
-    return desde <= fecha <= hasta
+from src.repositories.vehiculo_repository import VehiculoRepository
+from src.repositories.resumen_mensual_repository import ResumenMensualRepository
+from src.services.flota_status_service import FlotaStatusService
 
 
 # ---------------------------------------------------------------------
 # 1) RESUMEN ECONÓMICO
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_resumen_economico(fecha_desde: str, fecha_hasta: str):
     if fecha_desde > fecha_hasta:
         return False, "La fecha DESDE no puede ser mayor que la fecha HASTA."
 
-    alquileres = AlquilerRepository.listar()
-    incidentes = IncidenteRepository.listar()
-
-    alquiler_por_id = {a.id_alquiler: a for a in alquileres}
-
-    total_alquileres = 0.0
-    for a in alquileres:
-        fecha_ini = getattr(a, "fecha_inicio", "") or ""
-        estado = (getattr(a, "estado", "") or "").upper()
-        if estado != "CERRADO":
-            continue
-        if not _en_rango(fecha_ini, fecha_desde, fecha_hasta):
-            continue
-
-        total = getattr(a, "total", 0.0) or 0.0
-        try:
-            total_alquileres += float(total)
-        except (TypeError, ValueError):
-            pass
-
-    total_incidentes = 0.0
-    for inc in incidentes:
-        estado = (getattr(inc, "estado", "") or "").upper()
-        if estado != "PAGADO":
-            continue
-
-        id_alq = getattr(inc, "id_alquiler", None)
-        alq = alquiler_por_id.get(id_alq)
-        if alq is None:
-            continue
-
-        fecha_ini = getattr(alq, "fecha_inicio", "") or ""
-        if not _en_rango(fecha_ini, fecha_desde, fecha_hasta):
-            continue
-
-        monto = getattr(inc, "monto", 0.0) or 0.0
-        try:
-            total_incidentes += float(monto)
-        except (TypeError, ValueError):
-            pass
-
+    periodos = ResumenMensualRepository.por_periodo(fecha_desde, fecha_hasta)
+    total_alquileres = float(sum(p[2] for p in periodos))
+    total_incidentes = float(sum(p[4] for p in periodos))
     total_general = total_alquileres + total_incidentes
 
     data = {
@@ -78,39 +33,20 @@ def obtener_resumen_economico(fecha_desde: str, fecha_hasta: str):
 # ---------------------------------------------------------------------
 # 2) TOP VEHÍCULOS
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_top_vehiculos(fecha_desde: str, fecha_hasta: str, limite: int = 10):
     if fecha_desde > fecha_hasta:
         return False, "La fecha DESDE no puede ser mayor que la fecha HASTA."
 
-    alquileres = AlquilerRepository.listar()
-    vehiculos = VehiculoRepository.listar()
-    veh_por_id = {v.id_vehiculo: v for v in vehiculos}
-
-    stats = defaultdict(lambda: {"cantidad": 0, "total": 0.0})
-
-    for a in alquileres:
-        fecha_ini = getattr(a, "fecha_inicio", "") or ""
-        estado = (getattr(a, "estado", "") or "").upper()
-        if estado != "CERRADO":
-            continue
-        if not _en_rango(fecha_ini, fecha_desde, fecha_hasta):
-            continue
-
-        id_v = getattr(a, "id_vehiculo", None)
-        if id_v is None:
-            continue
-
-        stats[id_v]["cantidad"] += 1
-        total = getattr(a, "total", 0.0) or 0.0
-        try:
-            stats[id_v]["total"] += float(total)
-        except (TypeError, ValueError):
-            pass
+    snapshot = SnapshotAlquileres().actual()
+    mascara = snapshot.mascara("CERRADO", fecha_desde, fecha_hasta)
+    resumen = snapshot.agrupar(snapshot.id_vehiculo, mascara, limite)
+    vehiculos = VehiculoRepository.obtener_por_ids(id_v for id_v, _, _ in resumen)
 
     filas = []
-    for id_v, info in stats.items():
-        v = veh_por_id.get(id_v)
-        if v is not None:
+    for id_v, cantidad, total in resumen:
+        v = vehiculos.get(id_v)
+        if v is not None and v.activo:
             texto_v = f"{v.patente} ({v.marca} {v.modelo})"
         else:
             texto_v = f"Vehículo {id_v}"
@@ -118,21 +54,18 @@ def obtener_top_vehiculos(fecha_desde: str, fecha_hasta: str, limite: int = 10):
         filas.append(
             {
                 "vehiculo": texto_v,
-                "cantidad": info["cantidad"],
-                "total": round(info["total"], 2),
+                "cantidad": cantidad,
+                "total": round(float(total or 0.0), 2),
             }
         )
 
-    filas.sort(key=lambda x: x["cantidad"], reverse=True)
-    if limite and limite > 0:
-        filas = filas[:limite]
-
     return True, filas
 
 
 # ---------------------------------------------------------------------
 # 3) TOP CLIENTES
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_top_clientes(fecha_desde: str, fecha_hasta: str, limite: int = 10):
     """
     Devuelve lista de diccionarios con:
@@ -144,152 +77,49 @@ def obtener_top_clientes(fecha_desde: str, fecha_hasta: str, limite: int = 10):
     if fecha_desde > fecha_hasta:
         return False, "La fecha DESDE no puede ser mayor que la fecha HASTA."
 
-    alquileres = AlquilerRepository.listar()
-    clientes = ClienteRepository.listar()
-
-    # Soportar Cliente con atributo id_cliente, id o incluso dict
-    cli_por_id = {}
-    for c in clientes:
-        if isinstance(c, dict):
-            cid = c.get("id_cliente") or c.get("id")
-        else:
-            cid = getattr(c, "id_cliente", None)
-            if cid is None:
-                cid = getattr(c, "id", None)
-        if cid is None:
-            continue
-        cli_por_id[cid] = c
-
-    stats = defaultdict(lambda: {"cantidad": 0, "total": 0.0})
-
-    for a in alquileres:
-        fecha_ini = getattr(a, "fecha_inicio", "") or ""
-        estado = (getattr(a, "estado", "") or "").upper()
-        if estado != "CERRADO":
-            continue
-        if not _en_rango(fecha_ini, fecha_desde, fecha_hasta):
-            continue
-
-        id_c = getattr(a, "id_cliente", None)
-        if id_c is None:
-            continue
-
-        stats[id_c]["cantidad"] += 1
-        total = getattr(a, "total", 0.0) or 0.0
-        try:
-            stats[id_c]["total"] += float(total)
-        except (TypeError, ValueError):
-            pass
+    snapshot = SnapshotAlquileres().actual()
+    mascara = snapshot.mascara("CERRADO", fecha_desde, fecha_hasta)
+    resumen = snapshot.agrupar(snapshot.id_cliente, mascara, limite)
+    clientes = ClienteRepository.obtener_por_ids(id_c for id_c, _, _ in resumen)
 
     filas = []
-    for id_c, info in stats.items():
-        c = cli_por_id.get(id_c)
-
-        if isinstance(c, dict):
-            nombre = c.get("nombre", "")
-            apellido = c.get("apellido", "")
-            dni = c.get("dni", "")
-        elif c is not None:
-            nombre = getattr(c, "nombre", "") or ""
-            apellido = getattr(c, "apellido", "") or ""
-            dni = getattr(c, "dni", "") or ""
-        else:
-            nombre = ""
-            apellido = ""
-            dni = ""
-
-        if c is not None:
-            texto_c = f"{nombre} {apellido}".strip() or f"Cliente {id_c}"
+    for id_c, cantidad, total in resumen:
+        c = clientes.get(id_c)
+        if c is not None and c.activo:
+            texto_c = f"{c.nombre or ''} {c.apellido or ''}".strip() or f"Cliente {id_c}"
+            dni = c.dni
         else:
             texto_c = f"Cliente {id_c}"
+            dni = None
 
         filas.append(
             {
                 "cliente": texto_c,
-                "dni": dni,
-                "cantidad": info["cantidad"],
-                "total": round(info["total"], 2),
+                "dni": dni or "",
+                "cantidad": cantidad,
+                "total": round(float(total or 0.0), 2),
             }
         )
 
-    filas.sort(key=lambda x: x["cantidad"], reverse=True)
-    if limite and limite > 0:
-        filas = filas[:limite]
-
     return True, filas
 
 
 # ---------------------------------------------------------------------
 # 4) ESTADO DE FLOTA EN UNA FECHA
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_estado_flota(fecha_ref: str):
-    vehiculos = VehiculoRepository.listar()
-    alquileres = AlquilerRepository.listar()
-    mantenimientos = MantenimientoRepository.listar()
-
-    alq_por_veh = defaultdict(list)
-    for a in alquileres:
-        alq_por_veh[getattr(a, "id_vehiculo", None)].append(a)
-
-    mant_por_veh = defaultdict(list)
-    for m in mantenimientos:
-        mant_por_veh[getattr(m, "id_vehiculo", None)].append(m)
-
-    detalle = []
-    resumen = {"disponibles": 0, "alquilados": 0, "mantenimiento": 0}
-
-    for v in vehiculos:
-        if not v.activo:
-            continue
-
-        id_v = v.id_vehiculo
-        texto_v = f"{v.patente} ({v.marca} {v.modelo})"
-
-        estado_actual = "DISPONIBLE"
-
-        # mantenimiento
-        en_mant = False
-        for m in mant_por_veh.get(id_v, []):
-            f_ini = getattr(m, "fecha_inicio", "") or ""
-            f_fin = getattr(m, "fecha_fin", "") or ""
-            if f_ini and f_fin and f_ini <= fecha_ref <= f_fin:
-                en_mant = True
-                break
-
-        if en_mant:
-            estado_actual = "MANTENIMIENTO"
-        else:
-            # alquiler
-            en_alquiler = False
-            for a in alq_por_veh.get(id_v, []):
-                estado_alq = (getattr(a, "estado", "") or "").upper()
-                if estado_alq != "ABIERTO":
-                    continue
-                f_ini = getattr(a, "fecha_inicio", "") or ""
-                f_fin = getattr(a, "fecha_fin", "") or ""
-                if f_ini and f_fin and f_ini <= fecha_ref <= f_fin:
-                    en_alquiler = True
-                    break
-
-            if en_alquiler:
-                estado_actual = "ALQUILADO"
-
-        if estado_actual == "MANTENIMIENTO":
-            resumen["mantenimiento"] += 1
-        elif estado_actual == "ALQUILADO":
-            resumen["alquilados"] += 1
-        else:
-            resumen["disponibles"] += 1
-
-        detalle.append(
-            {
-                "vehiculo": texto_v,
-                "estado": estado_actual,
-            }
-        )
+    estado = FlotaStatusService().estado_en(fecha_ref)
+    detalle = [
+        {
+            "vehiculo": f"{v.patente} ({v.marca} {v.modelo})",
+            "estado": estado_vehiculo,
+        }
+        for v, estado_vehiculo in estado.detalle
+    ]
 
     data = {
-        "resumen": resumen,
+        "resumen": dict(estado.resumen),
         "detalle": detalle,
     }
     return True, data
@@ -298,6 +128,7 @@ def obtener_estado_flota(fecha_ref: str):
 # ---------------------------------------------------------------------
 # 5) ALQUILERES POR MES
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_alquileres_por_mes(fecha_desde: str, fecha_hasta: str):
     """
     Devuelve (ok, filas_o_msg).
@@ -316,28 +147,11 @@ def obtener_alquileres_por_mes(fecha_desde: str, fecha_hasta: str):
     if fecha_desde > fecha_hasta:
         return False, "La fecha DESDE no puede ser mayor que la fecha HASTA."
 
-    alquileres = AlquilerRepository.listar()
-    stats = defaultdict(lambda: {"cantidad": 0, "total": 0.0})
-
-    for a in alquileres:
-        fecha_ini = getattr(a, "fecha_inicio", "") or ""
-        estado = (getattr(a, "estado", "") or "").upper()
-        if estado != "CERRADO":
-            continue
-        if not _en_rango(fecha_ini, fecha_desde, fecha_hasta):
-            continue
-
-        periodo = fecha_ini[:7]  # AAAA-MM
-        stats[periodo]["cantidad"] += 1
-
-        total = getattr(a, "total", 0.0) or 0.0
-        try:
-            stats[periodo]["total"] += float(total)
-        except (TypeError, ValueError):
-            pass
-
     filas = []
-    for periodo, info in stats.items():
+    for periodo, cantidad, total, _, _ in ResumenMensualRepository.por_periodo(fecha_desde, fecha_hasta):
+        if not cantidad:
+            # Meses que sólo tienen incidentes pagados
+            continue
         try:
             anio = int(periodo[:4])
             mes = int(periodo[5:7])
@@ -349,8 +163,8 @@ def obtener_alquileres_por_mes(fecha_desde: str, fecha_hasta: str):
                 "periodo": periodo,
                 "anio": anio,
                 "mes": mes,
-                "cantidad": info["cantidad"],
-                "total": round(info["total"], 2),
+                "cantidad": cantidad,
+                "total": round(float(total or 0.0), 2),
             }
         )
 
@@ -361,6 +175,7 @@ def obtener_alquileres_por_mes(fecha_desde: str, fecha_hasta: str):
 # ---------------------------------------------------------------------
 # 6) ALQUILERES POR TRIMESTRE
 # ---------------------------------------------------------------------
+@cacheado
 def obtener_alquileres_por_trimestre(fecha_desde: str, fecha_hasta: str):
     """
     Devuelve (ok, filas_o_msg).
@@ -404,3 +219,113 @@ def obtener_alquileres_por_trimestre(fecha_desde: str, fecha_hasta: str):
 
     filas_trim.sort(key=lambda x: (x["anio"], x["trimestre"]))
     return True, filas_trim
+
+
+# ---------------------------------------------------------------------
+# 7) ESTADO DE FLOTA DÍA POR DÍA
+# ---------------------------------------------------------------------
+@cacheado
+def obtener_timeline_flota(fecha_desde: str, fecha_hasta: str):
+    """
+    Devuelve (ok, data_o_msg).
+
+    data = {
+      "dias": [{"fecha": "AAAA-MM-DD", "disponibles": 20, "alquilados": 4, "mantenimiento": 1}, ...],
+      "vehiculos": [
+        {"vehiculo": "AB123CD (Ford Ka)", "dias_alquilado": 12, "dias_mantenimiento": 2,
+         "pct_alquilado": 40.0, "pct_mantenimiento": 6.67, "pct_ocupado": 46.67},
+        ...
+      ],
+    }
+
+    Cada día cuenta lo mismo que obtener_estado_flota para esa fecha, pero
+    todo el rango sale de un único barrido: los mantenimientos y alquileres
+    se convierten en eventos de entrada/salida por día y se recorren una vez,
+    O(días + ocupaciones) en vez de una consulta completa por día.
+    """
+    if fecha_desde > fecha_hasta:
+        return False, "La fecha DESDE no puede ser mayor que la fecha HASTA."
+    try:
+        desde = date.fromisoformat(fecha_desde)
+        hasta = date.fromisoformat(fecha_hasta)
+    except ValueError:
+        return False, "Las fechas deben tener formato AAAA-MM-DD."
+
+    vehiculos = VehiculoRepository.listar()
+    cant_dias = (hasta - desde).days + 1
+
+    # eventos[i] = [(id_vehiculo, en_mantenimiento, +1 entra / -1 sale)] del día i
+    eventos = defaultdict(list)
+    for id_v, en_mant, f_ini, f_fin in VehiculoRepository.listar_ocupaciones_en_rango(fecha_desde, fecha_hasta):
+        try:
+            ini = max((date.fromisoformat(f_ini) - desde).days, 0)
+            fin = min((date.fromisoformat(f_fin) - desde).days, cant_dias - 1)
+        except (TypeError, ValueError):
+            continue
+        eventos[ini].append((id_v, en_mant, 1))
+        eventos[fin + 1].append((id_v, en_mant, -1))
+
+    # Por vehículo: ocupaciones vigentes [mantenimientos, alquileres], estado
+    # actual y desde qué día lo tiene (los días se suman al cambiar de estado)
+    vigentes = {v.id_vehiculo: [0, 0] for v in vehiculos}
+    estado = dict.fromkeys(vigentes, "DISPONIBLE")
+    desde_dia = dict.fromkeys(vigentes, 0)
+    dias_en = {id_v: {"ALQUILADO": 0, "MANTENIMIENTO": 0} for id_v in vigentes}
+    conteo = {"DISPONIBLE": len(vigentes), "ALQUILADO": 0, "MANTENIMIENTO": 0}
+
+    def cambiar_estado(id_v, nuevo, dia):
+        anterior = estado[id_v]
+        if anterior != "DISPONIBLE":
+            dias_en[id_v][anterior] += dia - desde_dia[id_v]
+        conteo[anterior] -= 1
+        conteo[nuevo] += 1
+        estado[id_v] = nuevo
+        desde_dia[id_v] = dia
+
+    dias = []
+    for i in range(cant_dias):
+        tocados = set()
+        for id_v, en_mant, delta in eventos.get(i, ()):
+            if id_v in vigentes:
+                vigentes[id_v][0 if en_mant else 1] += delta
+                tocados.add(id_v)
+
+        # El estado se decide después de aplicar todos los eventos del día
+        for id_v in tocados:
+            mant, alq = vigentes[id_v]
+            nuevo = "MANTENIMIENTO" if mant else "ALQUILADO" if alq else "DISPONIBLE"
+            if nuevo != estado[id_v]:
+                cambiar_estado(id_v, nuevo, i)
+
+        dias.append(
+            {
+                "fecha": (desde + timedelta(days=i)).isoformat(),
+                "disponibles": conteo["DISPONIBLE"],
+                "alquilados": conteo["ALQUILADO"],
+                "mantenimiento": conteo["MANTENIMIENTO"],
+            }
+        )
+
+    filas_veh = []
+    for v in vehiculos:
+        id_v = v.id_vehiculo
+        if estado[id_v] != "DISPONIBLE":
+            cambiar_estado(id_v, "DISPONIBLE", cant_dias)
+        d_alq = dias_en[id_v]["ALQUILADO"]
+        d_mant = dias_en[id_v]["MANTENIMIENTO"]
+        filas_veh.append(
+            {
+                "vehiculo": f"{v.patente} ({v.marca} {v.modelo})",
+                "dias_alquilado": d_alq,
+                "dias_mantenimiento": d_mant,
+                "pct_alquilado": round(100.0 * d_alq / cant_dias, 2),
+                "pct_mantenimiento": round(100.0 * d_mant / cant_dias, 2),
+                "pct_ocupado": round(100.0 * (d_alq + d_mant) / cant_dias, 2),
+            }
+        )
+
+    data = {
+        "dias": dias,
+        "vehiculos": filas_veh,
+    }
+    return True, data
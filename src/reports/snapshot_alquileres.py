@@ -0,0 +1,220 @@
+import copy
+import threading
+from datetime import date
+from operator import itemgetter
+
+import numpy as np
+
+from src.config.settings import SNAPSHOT_CAMBIOS_MAX
+from src.repositories.db_connection import get_connection, generacion_datos
+
+
+# Día 0 de las columnas de fecha (igual que datetime64[D])
+_EPOCA = date(1970, 1, 1).toordinal()
+# Fechas que SQLite no puede interpretar: quedan fuera de todo rango
+_SIN_FECHA = np.iinfo(np.int32).min
+
+# Columnas de ColumnasAlquileres, en su orden, sobre "alquileres a"
+_COLUMNAS_SQL = f"""
+    a.id_alquiler, a.id_vehiculo, a.id_cliente,
+    COALESCE(CAST(julianday(a.fecha_inicio) - 2440587.5 AS INTEGER), {_SIN_FECHA}),
+    COALESCE(CAST(julianday(a.fecha_fin) - 2440587.5 AS INTEGER), {_SIN_FECHA}),
+    COALESCE(a.total, 0), a.estado
+"""
+
+
+def dia(fecha_str):
+    """'AAAA-MM-DD' -> número de día usado en las columnas inicio/fin."""
+    return date.fromisoformat(fecha_str).toordinal() - _EPOCA
+
+
+class ColumnasAlquileres:
+    """
+    Tabla de alquileres en arrays de NumPy, de sólo lectura.
+
+    Columnas: id_alquiler, id_vehiculo, id_cliente, inicio y fin (int32, días
+    desde 1970-01-01), total (float64) y estado (int8, índice en `estados`).
+    Las filas están ordenadas por id_alquiler.
+    """
+    _NUMERICAS = ("id_alquiler", "id_vehiculo", "id_cliente", "inicio", "fin", "total")
+
+    def __init__(self, filas):
+        n = len(filas)
+
+        def columna(i, tipo):
+            return np.fromiter(map(itemgetter(i), filas), dtype=tipo, count=n)
+
+        self.id_alquiler = columna(0, np.int64)
+        self.id_vehiculo = columna(1, np.int64)
+        self.id_cliente = columna(2, np.int64)
+        self.inicio = columna(3, np.int32)
+        self.fin = columna(4, np.int32)
+        self.total = columna(5, np.float64)
+
+        codigos = {}
+        self.estado = np.fromiter(
+            (codigos.setdefault(e, len(codigos)) for e in map(itemgetter(6), filas)),
+            dtype=np.int8, count=n,
+        )
+        self.estados = tuple(codigos)
+
+    def __len__(self):
+        return len(self.id_alquiler)
+
+    def con_cambios(self, filas):
+        """
+        Copia con `filas` (como las del constructor, ordenadas por id)
+        reemplazando a las de igual id o agregadas al final. Devuelve None si
+        un id nuevo no es mayor que el último: no va al final y hay que recargar.
+        """
+        nuevas = ColumnasAlquileres(filas)
+        posiciones = np.searchsorted(self.id_alquiler, nuevas.id_alquiler)
+        existentes = posiciones < len(self)
+        existentes[existentes] = self.id_alquiler[posiciones[existentes]] == nuevas.id_alquiler[existentes]
+        agregadas = ~existentes
+        if agregadas.any() and len(self) and nuevas.id_alquiler[agregadas][0] <= self.id_alquiler[-1]:
+            return None
+
+        # Los códigos de estado de `nuevas` se traducen a los de esta tabla
+        estados = list(self.estados)
+        for estado in nuevas.estados:
+            if estado not in estados:
+                estados.append(estado)
+        codigos = np.array([estados.index(e) for e in nuevas.estados], dtype=np.int8)
+
+        copia = copy.copy(self)
+        copia.estados = tuple(estados)
+        destino = posiciones[existentes]
+        valores_por_columna = [(n, getattr(nuevas, n)) for n in self._NUMERICAS]
+        valores_por_columna.append(("estado", codigos[nuevas.estado]))
+        for nombre, valores in valores_por_columna:
+            columna = np.concatenate((getattr(self, nombre), valores[agregadas]))
+            columna[destino] = valores[existentes]
+            setattr(copia, nombre, columna)
+        return copia
+
+    def mascara(self, estado=None, fecha_desde=None, fecha_hasta=None):
+        """
+        Máscara booleana de los alquileres con ese estado cuya fecha de inicio
+        cae en [fecha_desde, fecha_hasta] (cadenas 'AAAA-MM-DD').
+        """
+        mascara = self.inicio != _SIN_FECHA
+        if estado is not None:
+            if estado not in self.estados:
+                return np.zeros_like(mascara)
+            mascara &= self.estado == self.estados.index(estado)
+        if fecha_desde is not None:
+            mascara &= self.inicio >= dia(fecha_desde)
+        if fecha_hasta is not None:
+            mascara &= self.inicio <= dia(fecha_hasta)
+        return mascara
+
+    def agrupar(self, claves, mascara, limite=None):
+        """
+        Agrupa por `claves` (una columna de ids) los alquileres de la máscara.
+        Devuelve [(clave, cantidad, total)] ordenado por cantidad descendente
+        y, a igual cantidad, por el primer alquiler de cada grupo.
+        """
+        # take() con los índices es varias veces más rápido que indexar con la
+        # máscara booleana en cada columna
+        indices = np.flatnonzero(mascara)
+        if len(indices) == 0:
+            return []
+        seleccion = claves.take(indices)
+
+        # Los ids son enteros chicos: se usan directamente como posición
+        cantidades = np.bincount(seleccion)
+        sumas = np.bincount(seleccion, weights=self.total.take(indices))
+        primero = np.full(len(cantidades), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(primero, seleccion, self.id_alquiler.take(indices))
+
+        presentes = np.flatnonzero(cantidades)
+        orden = presentes[np.lexsort((primero[presentes], -cantidades[presentes]))]
+        if limite and limite > 0:
+            orden = orden[:limite]
+        return [(int(k), int(cantidades[k]), float(sumas[k])) for k in orden]
+
+
+class SnapshotAlquileres:
+    """
+    Mantiene una ColumnasAlquileres de la BD (Singleton).
+
+    actual() sólo vuelve a SQLite si hubo commits (generacion_datos()), y
+    entonces lee las anotaciones nuevas de alquileres_cambios (migración 4):
+    si no hay, sigue con la misma copia; si hay, aplica sólo esas filas.
+    Recarga la tabla completa la primera vez, ante un borrado, un id
+    intercalado o más de SNAPSHOT_CAMBIOS_MAX anotaciones. Cada cambio crea
+    un objeto nuevo, así un reporte en curso nunca mezcla dos versiones.
+    """
+    _instance = None
+    _lock_instancia = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock_instancia:
+                if cls._instance is None:
+                    instancia = super(SnapshotAlquileres, cls).__new__(cls)
+                    instancia._lock = threading.Lock()
+                    instancia._columnas = None
+                    instancia._seq = 0           # última anotación aplicada
+                    instancia._generacion = None
+                    cls._instance = instancia
+        return cls._instance
+
+    @staticmethod
+    def _cargar(conn):
+        """Tabla completa y la última anotación que ya refleja."""
+        # Se lee antes que las filas: lo que se escriba entremedio se vuelve
+        # a aplicar en la próxima actualización, sin efecto.
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alquileres_cambios").fetchone()[0]
+        filas = conn.execute(f"SELECT {_COLUMNAS_SQL} FROM alquileres a ORDER BY a.id_alquiler").fetchall()
+        return ColumnasAlquileres(filas), seq
+
+    def _actualizar(self, conn):
+        if self._columnas is None:
+            return SnapshotAlquileres._cargar(conn)
+
+        # Anotaciones y filas actuales en una sola consulta (misma lectura)
+        cambios = conn.execute(
+            f"""
+            SELECT c.seq, {_COLUMNAS_SQL}
+            FROM alquileres_cambios c
+            LEFT JOIN alquileres a ON a.id_alquiler = c.id_alquiler
+            WHERE c.seq > ?
+            ORDER BY c.seq
+            LIMIT ?
+            """,
+            (self._seq, SNAPSHOT_CAMBIOS_MAX + 1),
+        ).fetchall()
+        if not cambios:
+            return self._columnas, self._seq
+        if (
+            len(cambios) > SNAPSHOT_CAMBIOS_MAX
+            or cambios[0][0] != self._seq + 1      # anotaciones ya podadas
+            or any(f[1] is None for f in cambios)  # alquiler borrado
+        ):
+            return SnapshotAlquileres._cargar(conn)
+
+        filas = sorted({f[1]: f[1:] for f in cambios}.values(), key=itemgetter(0))
+        columnas = self._columnas.con_cambios(filas)
+        if columnas is None:
+            return SnapshotAlquileres._cargar(conn)
+        return columnas, cambios[-1][0]
+
+    def actual(self):
+        with self._lock:
+            generacion = generacion_datos()
+            if self._columnas is not None and generacion == self._generacion:
+                return self._columnas
+
+            conn = get_connection()
+            columnas, seq = self._actualizar(conn)
+            if conn.in_transaction:
+                # Puede incluir filas que todavía se revierten: no se conserva
+                return columnas
+            self._columnas, self._seq, self._generacion = columnas, seq, generacion
+            return columnas
+
+    def invalidar(self):
+        with self._lock:
+            self._columnas = None
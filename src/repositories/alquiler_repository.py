@@ -1,8 +1,22 @@
-from src.repositories.db_connection import get_connection
+from sys import intern
+
+from src.repositories.db_connection import (
+    get_connection, confirmar, iterar_lotes, pagina_filas,
+    insertar_muchos, upsert_muchos, notificar_cambio, filas_por_ids,
+)
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.alquiler import Alquiler
 
 class AlquilerRepository:
 
+    # Columnas de las escrituras masivas (sin el id, que genera SQLite)
+    _COLUMNAS = (
+        "id_cliente", "id_vehiculo", "id_empleado", "fecha_inicio", "fecha_fin",
+        "precio_por_dia", "estado", "total", "km_inicial", "km_final",
+        "combustible_inicial", "combustible_final",
+    )
+    _CLAVES_UPSERT = ("id_alquiler",)
+
     @staticmethod
     def crear(alquiler: Alquiler):
         conn = get_connection()
@@ -20,72 +34,81 @@ class AlquilerRepository:
                 alquiler.estado, alquiler.total, alquiler.km_inicial, alquiler.combustible_inicial,
             ),
         )
-        conn.commit()
+        confirmar(conn)
         alquiler.id_alquiler = cursor.lastrowid
         return alquiler
 
+    # Fechas y estado se repiten en miles de filas: se internan para compartir
+    # un único str. BDs viejas pueden no tener las columnas de km/combustible.
+    _desde_fila = MapeadorFilas(
+        "alquileres", Alquiler,
+        conversiones={"fecha_inicio": intern, "fecha_fin": intern, "estado": intern},
+        por_defecto={"km_inicial": 0.0, "km_final": None, "combustible_inicial": 0.0, "combustible_final": None},
+    )
+
     @staticmethod
     def listar():
+        return list(AlquilerRepository.iterar())
+
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre todos los alquileres por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("alquileres", "id_alquiler", batch_size, after_id):
+            yield from AlquilerRepository._desde_fila.lote(filas)
+
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (alquileres, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("alquileres", "id_alquiler", limit, cursor)
+        return AlquilerRepository._desde_fila.lote(filas), siguiente
+
+    @staticmethod
+    def listar_con_etiquetas():
+        """
+        Todos los alquileres junto con los datos de cliente y vehículo que
+        muestran los combos y tablas, en una sola consulta con JOIN.
+        Devuelve dicts {"alquiler", "cliente_dni", "cliente_apellido",
+        "cliente_nombre", "patente", "marca", "modelo"}; si el cliente o el
+        vehículo no existe, sus campos vienen en None.
+        """
         conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM alquileres")
-        filas = cursor.fetchall()
-        alquileres = []
-        for f in filas:
-            # Mapeo defensivo
-            km_ini = f[9] if len(f)>9 else 0.0
-            km_fin = f[10] if len(f)>10 else None
-            comb_ini = f[11] if len(f)>11 else 0.0
-            comb_fin = f[12] if len(f)>12 else None
-
-            alquileres.append(Alquiler(
-                id_alquiler=f[0], id_cliente=f[1], id_vehiculo=f[2], id_empleado=f[3],
-                fecha_inicio=f[4], fecha_fin=f[5], precio_por_dia=f[6], estado=f[7], total=f[8],
-                km_inicial=km_ini, km_final=km_fin, combustible_inicial=comb_ini, combustible_final=comb_fin
-            ))
-        return alquileres
+        cursor.execute(
+            """
+            SELECT c.dni, c.apellido, c.nombre, v.patente, v.marca, v.modelo, a.*
+            FROM alquileres a
+            LEFT JOIN clientes c ON c.id_cliente = a.id_cliente
+            LEFT JOIN vehiculos v ON v.id_vehiculo = a.id_vehiculo
+            ORDER BY a.id_alquiler
+            """
+        )
+        mapear = AlquilerRepository._desde_fila.para_columnas(d[0] for d in cursor.description[6:])
+        return [
+            {
+                "alquiler": mapear(f[6:]),
+                "cliente_dni": f[0],
+                "cliente_apellido": f[1],
+                "cliente_nombre": f[2],
+                "patente": f[3],
+                "marca": f[4],
+                "modelo": f[5],
+            }
+            for f in cursor.fetchall()
+        ]
 
     @staticmethod
     def listar_por_cliente(id_cliente):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM alquileres WHERE id_cliente = ? ORDER BY fecha_inicio DESC", (id_cliente,))
-        filas = cursor.fetchall()
-        alquileres = []
-        for f in filas:
-            km_ini = f[9] if len(f)>9 else 0.0
-            km_fin = f[10] if len(f)>10 else None
-            comb_ini = f[11] if len(f)>11 else 0.0
-            comb_fin = f[12] if len(f)>12 else None
-            
-            alquileres.append(Alquiler(
-                id_alquiler=f[0], id_cliente=f[1], id_vehiculo=f[2], id_empleado=f[3],
-                fecha_inicio=f[4], fecha_fin=f[5], precio_por_dia=f[6], estado=f[7], total=f[8],
-                km_inicial=km_ini, km_final=km_fin, combustible_inicial=comb_ini, combustible_final=comb_fin
-            ))
-        return alquileres
-
-    # --- ESTE ES EL MÉTODO QUE FALTABA ---
+        return AlquilerRepository._desde_fila.todas(cursor)
+
     @staticmethod
     def listar_por_vehiculo(id_vehiculo):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM alquileres WHERE id_vehiculo = ? ORDER BY fecha_inicio DESC", (id_vehiculo,))
-        filas = cursor.fetchall()
-        alquileres = []
-        for f in filas:
-            km_ini = f[9] if len(f)>9 else 0.0
-            km_fin = f[10] if len(f)>10 else None
-            comb_ini = f[11] if len(f)>11 else 0.0
-            comb_fin = f[12] if len(f)>12 else None
-            
-            alquileres.append(Alquiler(
-                id_alquiler=f[0], id_cliente=f[1], id_vehiculo=f[2], id_empleado=f[3],
-                fecha_inicio=f[4], fecha_fin=f[5], precio_por_dia=f[6], estado=f[7], total=f[8],
-                km_inicial=km_ini, km_final=km_fin, combustible_inicial=comb_ini, combustible_final=comb_fin
-            ))
-        return alquileres
-    # -------------------------------------
+        return AlquilerRepository._desde_fila.todas(cursor)
 
     @staticmethod
     def obtener_por_id(id_alquiler):
@@ -94,17 +117,13 @@ class AlquilerRepository:
         cursor.execute("SELECT * FROM alquileres WHERE id_alquiler = ?", (id_alquiler,))
         f = cursor.fetchone()
         if not f: return None
-        
-        km_ini = f[9] if len(f)>9 else 0.0
-        km_fin = f[10] if len(f)>10 else None
-        comb_ini = f[11] if len(f)>11 else 0.0
-        comb_fin = f[12] if len(f)>12 else None
-
-        return Alquiler(
-            id_alquiler=f[0], id_cliente=f[1], id_vehiculo=f[2], id_empleado=f[3],
-            fecha_inicio=f[4], fecha_fin=f[5], precio_por_dia=f[6], estado=f[7], total=f[8],
-            km_inicial=km_ini, km_final=km_fin, combustible_inicial=comb_ini, combustible_final=comb_fin
-        )
+        return AlquilerRepository._desde_fila(f)
+
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_alquiler: Alquiler} para los ids pedidos, en pocas consultas IN."""
+        filas = filas_por_ids("alquileres", "id_alquiler", ids)
+        return {id_fila: AlquilerRepository._desde_fila(f) for id_fila, f in filas.items()}
 
     @staticmethod
     def actualizar_cierre(alquiler: Alquiler):
@@ -118,7 +137,7 @@ class AlquilerRepository:
             """,
             (alquiler.estado, alquiler.total, alquiler.km_final, alquiler.combustible_final, alquiler.id_alquiler)
         )
-        conn.commit()
+        confirmar(conn)
 
     @staticmethod
     def existe_alquiler_activo_en_rango(id_vehiculo, fecha_desde, fecha_hasta):
@@ -133,4 +152,58 @@ class AlquilerRepository:
             (id_vehiculo, fecha_desde, fecha_hasta)
         )
         cantidad = cursor.fetchone()[0]
-        return cantidad > 0
\ No newline at end of file
+        return cantidad > 0
+
+    # ------------------------------------------------------------------
+    # Escrituras masivas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _a_fila(a):
+        return (
+            a.id_cliente, a.id_vehiculo, a.id_empleado, a.fecha_inicio, a.fecha_fin,
+            a.precio_por_dia, a.estado, a.total, a.km_inicial, a.km_final,
+            a.combustible_inicial, a.combustible_final,
+        )
+
+    @staticmethod
+    def crear_muchos(alquileres, tamano_lote=5000):
+        """
+        Inserta todos los alquileres con executemany, en transacciones de
+        `tamano_lote` filas. Asigna y devuelve los ids generados.
+        No actualiza resumen_mensual: al terminar la carga, llamar a
+        ResumenMensualRepository.reconstruir().
+        """
+        alquileres = list(alquileres)
+        ids = insertar_muchos(
+            "alquileres", AlquilerRepository._COLUMNAS,
+            (AlquilerRepository._a_fila(a) for a in alquileres), tamano_lote,
+        )
+        for a, id_nuevo in zip(alquileres, ids):
+            a.id_alquiler = id_nuevo
+        notificar_cambio("alquileres")
+        return ids
+
+    @staticmethod
+    def upsert_muchos(alquileres, clave="id_alquiler", tamano_lote=5000):
+        """
+        Inserta o actualiza los alquileres según `clave` (id_alquiler).
+        Asigna y devuelve los ids de cada uno.
+        No actualiza resumen_mensual: al terminar la carga, llamar a
+        ResumenMensualRepository.reconstruir().
+        """
+        if clave not in AlquilerRepository._CLAVES_UPSERT:
+            raise ValueError(f"Clave de upsert inválida: '{clave}'.")
+
+        alquileres = list(alquileres)
+        if clave == "id_alquiler":
+            columnas = ("id_alquiler",) + AlquilerRepository._COLUMNAS
+            filas = ((a.id_alquiler,) + AlquilerRepository._a_fila(a) for a in alquileres)
+        else:
+            columnas = AlquilerRepository._COLUMNAS
+            filas = (AlquilerRepository._a_fila(a) for a in alquileres)
+
+        ids = upsert_muchos("alquileres", columnas, filas, clave, "id_alquiler", tamano_lote)
+        for a, id_fila in zip(alquileres, ids):
+            a.id_alquiler = id_fila
+        notificar_cambio("alquileres")
+        return ids
@@ -0,0 +1,153 @@
+import copy
+import threading
+from collections import OrderedDict
+
+from src.config.settings import CACHE_ENTIDADES_MAX
+from src.repositories.db_connection import (
+    get_connection, generacion_datos, suscribir_cambios, TODAS_LAS_TABLAS,
+)
+
+
+class CacheEntidades:
+    """
+    Caché LRU de entidades leídas por id (Singleton), delante de los
+    repositorios de clientes, vehículos y empleados.
+
+    La clave es (entidad, id), donde entidad es el nombre de la tabla. Se
+    guarda y se entrega una copia de cada objeto: los servicios modifican lo
+    que leen (p. ej. vehiculo.estado antes de actualizar) sin tocar la caché.
+
+    Se invalida:
+      - por entrada, desde crear/actualizar/inactivar de cada repositorio;
+      - por tabla, con notificar_cambio() (escrituras masivas);
+      - completa, si una transacción se revierte o cuando avanza
+        generacion_datos() (cualquier commit, propio o de otra terminal).
+
+    Lo último cubre lo que se leyó mientras otro hilo tenía una transacción
+    abierta: la fila vieja que un hilo de trabajo guarde antes del commit se
+    descarta con el cambio de generación. Lo leído dentro de una transacción
+    abierta no se guarda: la caché es de todo el proceso y esas filas todavía
+    pueden revertirse. Un acierto no consulta SQLite (ver generacion_datos()).
+    """
+    _instance = None
+    _lock_instancia = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock_instancia:
+                if cls._instance is None:
+                    instancia = super(CacheEntidades, cls).__new__(cls)
+                    instancia._lock = threading.RLock()
+                    instancia._entradas = OrderedDict()   # (entidad, id) -> objeto
+                    instancia._max = CACHE_ENTIDADES_MAX
+                    instancia._generacion = None
+                    instancia.aciertos = 0
+                    instancia.fallos = 0
+                    suscribir_cambios(instancia._on_cambio)
+                    cls._instance = instancia
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # Sincronización
+    # ------------------------------------------------------------------
+    def _sincronizar(self):
+        """Vacía la caché si hubo commits desde la última consulta. Devuelve la conexión del hilo."""
+        generacion = generacion_datos()
+        if generacion != self._generacion:
+            self._entradas.clear()
+            self._generacion = generacion
+        return get_connection()
+
+    def _on_cambio(self, tablas):
+        if TODAS_LAS_TABLAS in tablas:
+            self.limpiar()
+        else:
+            for tabla in tablas:
+                self.limpiar(tabla)
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def obtener(self, entidad, id_entidad, cargador):
+        """
+        Devuelve la entidad `id_entidad`; si no está en caché la lee con
+        cargador(id_entidad) y la guarda. Los None no se guardan.
+        """
+        clave = (entidad, id_entidad)
+        with self._lock:
+            conn = self._sincronizar()
+            objeto = self._entradas.get(clave)
+            if objeto is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return copy.copy(objeto)
+            self.fallos += 1
+
+            # Se lee con el lock tomado: una invalidación concurrente no puede
+            # quedar pisada por un valor leído antes de la escritura.
+            objeto = cargador(id_entidad)
+            if objeto is not None and not conn.in_transaction:
+                self.guardar(entidad, id_entidad, objeto)
+            return objeto
+
+    def obtener_muchos(self, entidad, ids, cargador_muchos):
+        """
+        Versión por lotes de obtener(): busca en caché cada id y lee los que
+        faltan con una sola llamada a cargador_muchos(ids) -> {id: objeto}.
+        """
+        encontrados = {}
+        faltantes = []
+        with self._lock:
+            conn = self._sincronizar()
+            for id_entidad in dict.fromkeys(i for i in ids if i is not None):
+                objeto = self._entradas.get((entidad, id_entidad))
+                if objeto is not None:
+                    self._entradas.move_to_end((entidad, id_entidad))
+                    self.aciertos += 1
+                    encontrados[id_entidad] = copy.copy(objeto)
+                else:
+                    self.fallos += 1
+                    faltantes.append(id_entidad)
+
+            if faltantes:
+                leidos = cargador_muchos(faltantes)
+                if not conn.in_transaction:
+                    for id_entidad, objeto in leidos.items():
+                        self.guardar(entidad, id_entidad, objeto)
+                encontrados.update(leidos)
+            return encontrados
+
+    # ------------------------------------------------------------------
+    # Escritura e invalidación
+    # ------------------------------------------------------------------
+    def guardar(self, entidad, id_entidad, objeto):
+        clave = (entidad, id_entidad)
+        with self._lock:
+            self._entradas[clave] = copy.copy(objeto)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._max:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, entidad, id_entidad):
+        with self._lock:
+            self._entradas.pop((entidad, id_entidad), None)
+
+    def limpiar(self, entidad=None):
+        """Vacía toda la caché, o sólo las entradas de `entidad`."""
+        with self._lock:
+            if entidad is None:
+                self._entradas.clear()
+                return
+            for clave in [c for c in self._entradas if c[0] == entidad]:
+                del self._entradas[clave]
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "max": self._max,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": (self.aciertos / consultas) if consultas else 0.0,
+            }
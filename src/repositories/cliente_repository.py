@@ -1,8 +1,17 @@
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import (
+    get_connection, confirmar, iterar_lotes, pagina_filas,
+    insertar_muchos, upsert_muchos, notificar_cambio, filas_por_ids,
+)
+from src.repositories.cache_entidades import CacheEntidades
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.cliente import Cliente
 
 class ClienteRepository:
 
+    # Columnas de las escrituras masivas (sin el id, que genera SQLite)
+    _COLUMNAS = ("nombre", "apellido", "dni", "email", "telefono", "activo")
+    _CLAVES_UPSERT = ("dni", "email", "id_cliente")
+
     @staticmethod
     def crear(cliente: Cliente):
         conn = get_connection()
@@ -11,23 +20,31 @@ class ClienteRepository:
             "INSERT INTO clientes (nombre, apellido, dni, email, telefono, activo) VALUES (?, ?, ?, ?, ?, ?)",
             (cliente.nombre, cliente.apellido, cliente.dni, cliente.email, cliente.telefono, 1)
         )
-        conn.commit()
+        confirmar(conn)
         cliente.id = cursor.lastrowid
+        CacheEntidades().invalidar("clientes", cliente.id)
         return cliente
 
+    _desde_fila = MapeadorFilas(
+        "clientes", Cliente,
+        renombres={"id": "id_cliente"}, conversiones={"activo": bool},
+    )
+
     @staticmethod
     def listar():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clientes WHERE activo = 1")
-        filas = cursor.fetchall()
-        clientes = []
-        for f in filas:
-            clientes.append(Cliente(
-                id=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-                email=f[4], telefono=f[5], activo=bool(f[6])
-            ))
-        return clientes
+        return list(ClienteRepository.iterar())
+
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre los clientes activos por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("clientes", "id_cliente", batch_size, after_id, where="activo = 1"):
+            yield from ClienteRepository._desde_fila.lote(filas)
+
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (clientes, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("clientes", "id_cliente", limit, cursor, where="activo = 1")
+        return ClienteRepository._desde_fila.lote(filas), siguiente
 
     @staticmethod
     def buscar_por_dni(dni):
@@ -36,22 +53,30 @@ class ClienteRepository:
         cursor.execute("SELECT * FROM clientes WHERE dni = ?", (dni,))
         f = cursor.fetchone()
         if not f: return None
-        return Cliente(
-            id=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-            email=f[4], telefono=f[5], activo=bool(f[6])
-        )
+        return ClienteRepository._desde_fila(f)
 
     @staticmethod
     def obtener_por_id(id_cliente):
+        return CacheEntidades().obtener("clientes", id_cliente, ClienteRepository._leer_por_id)
+
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_cliente: Cliente} para los ids pedidos, en pocas consultas IN."""
+        return CacheEntidades().obtener_muchos("clientes", ids, ClienteRepository._leer_por_ids)
+
+    @staticmethod
+    def _leer_por_id(id_cliente):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM clientes WHERE id_cliente = ?", (id_cliente,))
         f = cursor.fetchone()
         if not f: return None
-        return Cliente(
-            id=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-            email=f[4], telefono=f[5], activo=bool(f[6])
-        )
+        return ClienteRepository._desde_fila(f)
+
+    @staticmethod
+    def _leer_por_ids(ids):
+        filas = filas_por_ids("clientes", "id_cliente", ids)
+        return {id_fila: ClienteRepository._desde_fila(f) for id_fila, f in filas.items()}
 
     @staticmethod
     def actualizar(cliente: Cliente):
@@ -61,11 +86,59 @@ class ClienteRepository:
             "UPDATE clientes SET nombre=?, apellido=?, dni=?, email=?, telefono=? WHERE id_cliente=?",
             (cliente.nombre, cliente.apellido, cliente.dni, cliente.email, cliente.telefono, cliente.id)
         )
-        conn.commit()
+        confirmar(conn)
+        CacheEntidades().invalidar("clientes", cliente.id)
 
     @staticmethod
     def inactivar(id_cliente):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("UPDATE clientes SET activo = 0 WHERE id_cliente = ?", (id_cliente,))
-        conn.commit()
\ No newline at end of file
+        confirmar(conn)
+        CacheEntidades().invalidar("clientes", id_cliente)
+
+    # ------------------------------------------------------------------
+    # Escrituras masivas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _a_fila(c):
+        return (c.nombre, c.apellido, c.dni, c.email, c.telefono, 1 if c.activo else 0)
+
+    @staticmethod
+    def crear_muchos(clientes, tamano_lote=5000):
+        """
+        Inserta todos los clientes con executemany, en transacciones de
+        `tamano_lote` filas. Asigna y devuelve los ids generados.
+        """
+        clientes = list(clientes)
+        ids = insertar_muchos(
+            "clientes", ClienteRepository._COLUMNAS,
+            (ClienteRepository._a_fila(c) for c in clientes), tamano_lote,
+        )
+        for c, id_nuevo in zip(clientes, ids):
+            c.id = id_nuevo
+        notificar_cambio("clientes")
+        return ids
+
+    @staticmethod
+    def upsert_muchos(clientes, clave="dni", tamano_lote=5000):
+        """
+        Inserta o actualiza los clientes según `clave` (dni, email, id_cliente).
+        Asigna y devuelve los ids de cada uno.
+        """
+        if clave not in ClienteRepository._CLAVES_UPSERT:
+            raise ValueError(f"Clave de upsert inválida: '{clave}'.")
+
+        clientes = list(clientes)
+        if clave == "id_cliente":
+            columnas = ("id_cliente",) + ClienteRepository._COLUMNAS
+            filas = ((c.id,) + ClienteRepository._a_fila(c) for c in clientes)
+        else:
+            columnas = ClienteRepository._COLUMNAS
+            filas = (ClienteRepository._a_fila(c) for c in clientes)
+
+        ids = upsert_muchos("clientes", columnas, filas, clave, "id_cliente", tamano_lote)
+        for c, id_fila in zip(clientes, ids):
+            c.id = id_fila
+        notificar_cambio("clientes")
+        return ids
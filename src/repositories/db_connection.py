@@ -1,38 +1,179 @@
 import sqlite3
-from src.config.settings import DB_PATH
+import threading
+import time
+from contextlib import contextmanager
+from src.config.settings import (
+    DB_PATH, DB_POOL_MAX_CONEXIONES, DB_POOL_TIMEOUT, DB_PRAGMA_PERFILES, DB_PERFIL,
+    GENERACION_VERIFICAR_CADA_MS,
+)
+from src.repositories.migraciones import migrar
+
+
+class PoolAgotadoError(sqlite3.OperationalError):
+    """No se liberó ninguna conexión del pool dentro del tiempo de espera."""
+
+
+def aplicar_perfil(conn, perfil):
+    """
+    Aplica a la conexión los PRAGMA del perfil indicado ("safe" o "fast",
+    ver DB_PRAGMA_PERFILES en settings).
+    """
+    if perfil not in DB_PRAGMA_PERFILES:
+        raise ValueError(f"Perfil de BD desconocido: '{perfil}'.")
+
+    for nombre, valor in DB_PRAGMA_PERFILES[perfil].items():
+        # Los PRAGMA no aceptan parámetros; los valores vienen de settings, no del usuario.
+        conn.execute(f"PRAGMA {nombre} = {valor};").fetchall()
+
 
 class DatabaseConnection:
     """
     Implementación del Patrón Singleton.
-    Garantiza una única instancia de conexión a la BD para todo el sistema.
+    Garantiza una única instancia del administrador de conexiones para todo el sistema.
+    Internamente mantiene un pool: cada hilo trabaja con su propia conexión
+    (nunca se comparte un cursor entre hilos), hasta DB_POOL_MAX_CONEXIONES.
     """
     _instance = None
-    _connection = None
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    instancia = super(DatabaseConnection, cls).__new__(cls)
+                    instancia._inicializar_pool()
+                    cls._instance = instancia
         return cls._instance
 
+    def _inicializar_pool(self):
+        self._max_conexiones = DB_POOL_MAX_CONEXIONES
+        self._timeout = DB_POOL_TIMEOUT
+        self._libres = []        # conexiones devueltas, listas para reutilizar
+        self._asignadas = {}     # hilo -> conexión que tiene retirada
+        self._condicion = threading.Condition(threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Creación y chequeo de conexiones
+    # ------------------------------------------------------------------
+    def _abrir_conexion(self):
+        # check_same_thread=False: la conexión puede volver al pool y ser
+        # retirada luego por otro hilo (nunca por dos a la vez).
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        aplicar_perfil(conn, DB_PERFIL)
+        return conn
+
+    @staticmethod
+    def _esta_sana(conn):
+        """Health check: la conexión responde a una consulta trivial."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _cerrar_silencioso(conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _recuperar_de_hilos_muertos(self):
+        """Devuelve al pool las conexiones de hilos que terminaron sin liberarlas."""
+        for hilo in [h for h in self._asignadas if not h.is_alive()]:
+            conn = self._asignadas.pop(hilo)
+            if conn.in_transaction:
+                conn.rollback()
+            self._libres.append(conn)
+
+    # ------------------------------------------------------------------
+    # Checkout / devolución
+    # ------------------------------------------------------------------
     def get_connection(self):
         """
-        Retorna la conexión activa. Si no existe o se cerró, crea una nueva.
+        Retorna la conexión del hilo actual. La primera vez que un hilo la pide
+        se retira una del pool (o se abre una nueva si hay lugar).
         """
-        if self._connection is None:
-            try:
-                # check_same_thread=False permite usar la conexión en hilos de GUI si fuera necesario
-                self._connection = sqlite3.connect(DB_PATH, check_same_thread=False)
-                self._connection.execute("PRAGMA foreign_keys = ON;")
-            except sqlite3.Error as e:
-                print(f"Error crítico conectando a BD: {e}")
-                return None
-        return self._connection
+        hilo = threading.current_thread()
+        with self._condicion:
+            conn = self._asignadas.get(hilo)
+            if conn is not None:
+                return conn
+
+            limite = time.monotonic() + self._timeout
+            while True:
+                while self._libres:
+                    candidata = self._libres.pop()
+                    if self._esta_sana(candidata):
+                        self._asignadas[hilo] = candidata
+                        return candidata
+                    self._cerrar_silencioso(candidata)
+
+                if len(self._asignadas) < self._max_conexiones:
+                    try:
+                        conn = self._abrir_conexion()
+                    except sqlite3.Error as e:
+                        print(f"Error crítico conectando a BD: {e}")
+                        return None
+                    self._asignadas[hilo] = conn
+                    return conn
+
+                self._recuperar_de_hilos_muertos()
+                if self._libres:
+                    continue
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise PoolAgotadoError(
+                        f"No hay conexiones libres (máximo {self._max_conexiones})."
+                    )
+                self._condicion.wait(timeout=restante)
+
+    def release_connection(self):
+        """
+        Devuelve al pool la conexión del hilo actual. Pensado para hilos de
+        trabajo (reportes, exportaciones) al terminar su tarea.
+        """
+        hilo = threading.current_thread()
+        with self._condicion:
+            conn = self._asignadas.pop(hilo, None)
+            if conn is None:
+                return
+            if conn.in_transaction:
+                conn.rollback()
+            if self._esta_sana(conn):
+                self._libres.append(conn)
+            else:
+                self._cerrar_silencioso(conn)
+            self._condicion.notify()
 
     def close_connection(self):
-        """Cierra la conexión explícitamente si es necesario."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Cierra la conexión del hilo actual explícitamente si es necesario."""
+        hilo = threading.current_thread()
+        with self._condicion:
+            conn = self._asignadas.pop(hilo, None)
+            if conn is not None:
+                self._cerrar_silencioso(conn)
+                self._condicion.notify()
+
+    def close_all(self):
+        """Cierra todas las conexiones del pool (al salir de la aplicación)."""
+        with self._condicion:
+            for conn in list(self._asignadas.values()) + self._libres:
+                self._cerrar_silencioso(conn)
+            self._asignadas.clear()
+            self._libres.clear()
+            self._condicion.notify_all()
+        _cerrar_vigia()
+
+    def estadisticas(self):
+        with self._condicion:
+            return {
+                "en_uso": len(self._asignadas),
+                "libres": len(self._libres),
+                "maximo": self._max_conexiones,
+            }
 
 # -----------------------------------------------------------------------------
 # Función helper global
@@ -40,138 +181,330 @@ class DatabaseConnection:
 def get_connection():
     """
     Función envoltorio para mantener compatibilidad con el resto de los repositorios.
-    En lugar de crear una conexión nueva, pide la instancia al Singleton.
+    En lugar de crear una conexión nueva, pide al Singleton la conexión del hilo actual.
     """
     return DatabaseConnection().get_connection()
 
+
+def release_connection():
+    """Devuelve al pool la conexión del hilo actual (usar al final de un hilo de trabajo)."""
+    DatabaseConnection().release_connection()
+
 # -----------------------------------------------------------------------------
-# Inicialización de la Base de Datos (Tu lógica original intacta)
+# Transacciones (unidad de trabajo que abarca varios repositorios)
 # -----------------------------------------------------------------------------
-def init_db():
+_transacciones = threading.local()
+
+
+def en_transaccion():
+    """True si el hilo actual está dentro de un bloque transaccion()."""
+    return getattr(_transacciones, "profundidad", 0) > 0
+
+
+def confirmar(conn):
+    """
+    Reemplaza a conn.commit() en los repositorios: dentro de un bloque
+    transaccion() no confirma nada (lo hace el bloque más externo al terminar).
+    """
+    if not en_transaccion():
+        conn.commit()
+        _hubo_commit_propio()
+
+
+@contextmanager
+def transaccion(inmediata=False):
+    """
+    Agrupa varias operaciones de repositorio en una sola transacción:
+    se confirma una única vez al salir del bloque más externo y se revierte
+    todo si el bloque lanza una excepción.
+
+    Los bloques anidados usan SAVEPOINT: si uno interno falla, sólo se
+    deshacen sus cambios y la excepción sigue hacia el bloque externo.
+
+    Con inmediata=True el bloque externo abre con BEGIN IMMEDIATE y toma el
+    lock de escritura al empezar: una verificación y las escrituras que
+    dependen de ella no pueden intercalarse con las de otra terminal.
+    """
     conn = get_connection()
-    cursor = conn.cursor()
+    profundidad = getattr(_transacciones, "profundidad", 0)
 
-    # 1. Verificar integridad de la tabla empleados (migración si faltan columnas clave)
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='empleados';")
-    existe_empleados = cursor.fetchone() is not None
+    if profundidad > 0:
+        punto = f"sp_nivel_{profundidad}"
+        conn.execute(f"SAVEPOINT {punto};")
+        _transacciones.profundidad = profundidad + 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO SAVEPOINT {punto};")
+            conn.execute(f"RELEASE SAVEPOINT {punto};")
+            notificar_cambio(TODAS_LAS_TABLAS)
+            raise
+        else:
+            conn.execute(f"RELEASE SAVEPOINT {punto};")
+        finally:
+            _transacciones.profundidad = profundidad
+        return
 
-    if existe_empleados:
-        cursor.execute("PRAGMA table_info(empleados);")
-        cols = [fila[1] for fila in cursor.fetchall()]
-        columnas_necesarias = {"telefono", "usuario", "password", "rol"}
-        if not columnas_necesarias.issubset(set(cols)):
-            cursor.execute("DROP TABLE empleados;")
+    if conn.in_transaction:
+        # Cambios implícitos pendientes de un repositorio usado sin confirmar
+        conn.commit()
+        _hubo_commit_propio()
+    conn.execute("BEGIN IMMEDIATE;" if inmediata else "BEGIN;")
+    _transacciones.profundidad = 1
+    try:
+        yield conn
+    except BaseException:
+        _transacciones.profundidad = 0
+        conn.rollback()
+        notificar_cambio(TODAS_LAS_TABLAS)
+        raise
+    else:
+        _transacciones.profundidad = 0
+        try:
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            notificar_cambio(TODAS_LAS_TABLAS)
+            raise
+        _hubo_commit_propio()
 
-    # 2. Creación de Tablas
-    cursor.executescript(
-        """
-        CREATE TABLE IF NOT EXISTS clientes (
-            id_cliente     INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre         TEXT    NOT NULL,
-            apellido       TEXT    NOT NULL,
-            dni            TEXT    NOT NULL UNIQUE,
-            email          TEXT    NOT NULL UNIQUE,
-            telefono       TEXT,
-            activo         INTEGER NOT NULL DEFAULT 1
-        );
-
-        CREATE TABLE IF NOT EXISTS empleados (
-            id_empleado    INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre         TEXT    NOT NULL,
-            apellido       TEXT    NOT NULL,
-            dni            TEXT    NOT NULL UNIQUE,
-            email          TEXT    NOT NULL UNIQUE,
-            telefono       TEXT,
-            usuario        TEXT    NOT NULL UNIQUE,
-            password       TEXT    NOT NULL,
-            rol            TEXT    NOT NULL,
-            activo         INTEGER NOT NULL DEFAULT 1
-        );
-
-        CREATE TABLE IF NOT EXISTS vehiculos (
-            id_vehiculo     INTEGER PRIMARY KEY AUTOINCREMENT,
-            patente         TEXT    NOT NULL UNIQUE,
-            marca           TEXT    NOT NULL,
-            modelo          TEXT    NOT NULL,
-            anio            INTEGER NOT NULL,
-            tipo            TEXT    NOT NULL,
-            precio_por_dia  REAL    NOT NULL,
-            activo          INTEGER NOT NULL DEFAULT 1,
-            estado          TEXT    NOT NULL DEFAULT 'DISPONIBLE',
-            km_actual       REAL    NOT NULL DEFAULT 0,
-            combustible_actual REAL NOT NULL DEFAULT 0
-        );
-
-        CREATE TABLE IF NOT EXISTS alquileres (
-            id_alquiler    INTEGER PRIMARY KEY AUTOINCREMENT,
-            id_cliente     INTEGER NOT NULL,
-            id_vehiculo    INTEGER NOT NULL,
-            id_empleado    INTEGER NOT NULL,
-            fecha_inicio   TEXT    NOT NULL,
-            fecha_fin      TEXT    NOT NULL,
-            precio_por_dia REAL    NOT NULL,
-            estado         TEXT    NOT NULL,
-            total          REAL    NOT NULL DEFAULT 0,
-            km_inicial     REAL    NOT NULL DEFAULT 0,
-            km_final       REAL,
-            combustible_inicial REAL NOT NULL DEFAULT 0,
-            combustible_final   REAL,
-
-            FOREIGN KEY (id_cliente)  REFERENCES clientes(id_cliente),
-            FOREIGN KEY (id_vehiculo) REFERENCES vehiculos(id_vehiculo),
-            FOREIGN KEY (id_empleado) REFERENCES empleados(id_empleado)
-        );
-
-        CREATE TABLE IF NOT EXISTS mantenimientos (
-            id_mantenimiento INTEGER PRIMARY KEY AUTOINCREMENT,
-            id_vehiculo      INTEGER NOT NULL,
-            fecha_inicio     TEXT    NOT NULL,
-            fecha_fin        TEXT    NOT NULL,
-            descripcion      TEXT    NOT NULL,
-
-            FOREIGN KEY (id_vehiculo) REFERENCES vehiculos(id_vehiculo)
-        );
-
-        CREATE TABLE IF NOT EXISTS incidentes (
-            id_incidente  INTEGER PRIMARY KEY AUTOINCREMENT,
-            id_alquiler   INTEGER NOT NULL,
-            tipo          TEXT    NOT NULL,
-            descripcion   TEXT    NOT NULL,
-            monto         REAL    NOT NULL,
-            estado        TEXT    NOT NULL,
-
-            FOREIGN KEY (id_alquiler) REFERENCES alquileres(id_alquiler)
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_alquileres_fecha_inicio
-            ON alquileres (fecha_inicio);
-
-        CREATE INDEX IF NOT EXISTS idx_mantenimientos_fecha_inicio
-            ON mantenimientos (fecha_inicio);
-
-        CREATE INDEX IF NOT EXISTS idx_incidentes_id_alquiler
-            ON incidentes (id_alquiler);
-        """
+
+def transaccion_inmediata():
+    """Atajo para transaccion(inmediata=True), usado por los flujos de alquiler."""
+    return transaccion(inmediata=True)
+
+
+# -----------------------------------------------------------------------------
+# Generación de datos (para cachés que dependen de cualquier escritura)
+# -----------------------------------------------------------------------------
+# La generación sale de PRAGMA data_version de una conexión propia (el
+# "vigía", fuera del pool, que nunca escribe). Para el vigía todo commit es
+# ajeno, de este proceso o de otra terminal, así que cada commit avanza la
+# generación una sola vez sin importar cuántos hilos estén leyendo. Una sola
+# conexión compara siempre contra la misma línea base: no hay conexiones
+# "nuevas" sin valor con qué comparar.
+_generacion = 0
+_lock_generacion = threading.Lock()
+_vigia = None
+_version_vigia = None
+_proxima_verificacion = 0.0     # time.monotonic() desde el que se vuelve a mirar data_version
+
+
+def _hubo_commit_propio():
+    """Tras un commit de este proceso: la próxima consulta mira data_version sin esperar."""
+    global _proxima_verificacion
+    with _lock_generacion:
+        _proxima_verificacion = 0.0
+
+
+def _cerrar_vigia():
+    global _vigia, _version_vigia
+    with _lock_generacion:
+        if _vigia is not None:
+            DatabaseConnection._cerrar_silencioso(_vigia)
+        _vigia = None
+        _version_vigia = None
+
+
+def generacion_datos():
+    """
+    Número que aumenta cuando cambian los datos. Mientras no cambie, un
+    resultado calculado a partir de la BD sigue siendo válido.
+
+    Los commits de este proceso se ven en la consulta siguiente; los de otra
+    terminal, a más tardar GENERACION_VERIFICAR_CADA_MS después. Entre
+    verificaciones no se toca SQLite.
+    """
+    global _generacion, _vigia, _version_vigia, _proxima_verificacion
+    ahora = time.monotonic()
+    with _lock_generacion:
+        if ahora >= _proxima_verificacion:
+            if _vigia is None:
+                _vigia = sqlite3.connect(DB_PATH, check_same_thread=False)
+            version = _vigia.execute("PRAGMA data_version;").fetchone()[0]
+            if _version_vigia is not None and version != _version_vigia:
+                _generacion += 1
+            _version_vigia = version
+            _proxima_verificacion = ahora + GENERACION_VERIFICAR_CADA_MS / 1000
+        return _generacion
+
+
+# -----------------------------------------------------------------------------
+# Aviso de cambios (para cachés en memoria que dependen de una tabla)
+# -----------------------------------------------------------------------------
+_suscriptores_cambios = []
+
+# Se notifica en lugar de una tabla cuando no se sabe qué cambió (rollback)
+TODAS_LAS_TABLAS = "*"
+
+
+def suscribir_cambios(callback):
+    """Registra callback(tablas) a invocar cuando notificar_cambio() avisa escrituras."""
+    if callback not in _suscriptores_cambios:
+        _suscriptores_cambios.append(callback)
+
+
+def notificar_cambio(*tablas):
+    for callback in list(_suscriptores_cambios):
+        callback(set(tablas))
+
+
+# -----------------------------------------------------------------------------
+# Escrituras masivas (executemany por lotes)
+# -----------------------------------------------------------------------------
+# SQLite admite hasta 999 parámetros por consulta en versiones viejas
+_MAX_PARAMETROS = 900
+
+
+def _lotes(iterable, tamano):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def insertar_muchos(tabla, columnas, filas, tamano_lote=5000):
+    """
+    Inserta `filas` (tuplas en el orden de `columnas`) con executemany, una
+    transacción BEGIN IMMEDIATE por lote. Devuelve la lista de ids generados,
+    en el mismo orden que las filas.
+
+    Mientras dura el lote se tiene el lock de escritura, así los rowid que
+    asigna SQLite son consecutivos y terminan en last_insert_rowid().
+    """
+    sql = (
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+        f"VALUES ({', '.join('?' for _ in columnas)})"
     )
+    ids = []
+    for lote in _lotes(filas, tamano_lote):
+        with transaccion(inmediata=True) as conn:
+            conn.executemany(sql, lote)
+            ultimo = conn.execute("SELECT last_insert_rowid();").fetchone()[0]
+        ids.extend(range(ultimo - len(lote) + 1, ultimo + 1))
+    return ids
+
+
+def upsert_muchos(tabla, columnas, filas, clave, columna_id, tamano_lote=5000):
+    """
+    Inserta o actualiza `filas` según la columna única `clave`
+    (INSERT ... ON CONFLICT(clave) DO UPDATE), con executemany por lotes.
+    Devuelve los ids (columna_id) de cada fila, en el mismo orden.
+    """
+    if clave not in columnas:
+        raise ValueError(f"La clave '{clave}' debe estar entre las columnas.")
+
+    actualizables = [c for c in columnas if c != clave]
+    sql = (
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+        f"VALUES ({', '.join('?' for _ in columnas)}) "
+        f"ON CONFLICT({clave}) DO UPDATE SET "
+        + ", ".join(f"{c} = excluded.{c}" for c in actualizables)
+    )
+    posicion_clave = columnas.index(clave)
+
+    ids = []
+    for lote in _lotes(filas, tamano_lote):
+        claves = [fila[posicion_clave] for fila in lote]
+        if any(valor is None for valor in claves):
+            raise ValueError(f"Todas las filas deben tener valor en '{clave}'.")
+
+        with transaccion(inmediata=True) as conn:
+            conn.executemany(sql, lote)
+            id_por_clave = {}
+            for tramo in _lotes(set(claves), _MAX_PARAMETROS):
+                marcas = ", ".join("?" for _ in tramo)
+                for valor, id_fila in conn.execute(
+                    f"SELECT {clave}, {columna_id} FROM {tabla} WHERE {clave} IN ({marcas})", tramo
+                ):
+                    id_por_clave[valor] = id_fila
+        ids.extend(id_por_clave[valor] for valor in claves)
+    return ids
+
 
-    # 3. Migraciones (Agregar columnas nuevas a tablas viejas si hace falta)
-    cursor.execute("PRAGMA table_info(vehiculos);")
-    cols_v = [fila[1] for fila in cursor.fetchall()]
-    if "km_actual" not in cols_v:
-        cursor.execute("ALTER TABLE vehiculos ADD COLUMN km_actual REAL NOT NULL DEFAULT 0;")
-    if "combustible_actual" not in cols_v:
-        cursor.execute("ALTER TABLE vehiculos ADD COLUMN combustible_actual REAL NOT NULL DEFAULT 0;")
-
-    cursor.execute("PRAGMA table_info(alquileres);")
-    cols_a = [fila[1] for fila in cursor.fetchall()]
-    if "km_inicial" not in cols_a:
-        cursor.execute("ALTER TABLE alquileres ADD COLUMN km_inicial REAL NOT NULL DEFAULT 0;")
-    if "km_final" not in cols_a:
-        cursor.execute("ALTER TABLE alquileres ADD COLUMN km_final REAL;")
-    if "combustible_inicial" not in cols_a:
-        cursor.execute("ALTER TABLE alquileres ADD COLUMN combustible_inicial REAL NOT NULL DEFAULT 0;")
-    if "combustible_final" not in cols_a:
-        cursor.execute("ALTER TABLE alquileres ADD COLUMN combustible_final REAL;")
-
-    conn.commit()
-    # NOTA: No cerramos la conexión aquí porque al ser Singleton queremos que siga viva para la app.
\ No newline at end of file
+# -----------------------------------------------------------------------------
+# Inicialización de la Base de Datos
+# -----------------------------------------------------------------------------
+def init_db(progreso=None):
+    """
+    Aplica las migraciones pendientes (ver src/repositories/migraciones.py).
+    Si la BD ya está al día, cuesta una sola consulta a schema_version.
+    """
+    # NOTA: No cerramos la conexión aquí: queda asignada al hilo principal de la app.
+    conn = get_connection()
+    return migrar(conn, progreso)
+
+
+# -----------------------------------------------------------------------------
+# Paginación por clave (keyset) para los repositorios
+# -----------------------------------------------------------------------------
+def iterar_lotes(tabla, clave, batch_size=1000, after_id=None, where="", params=()):
+    """
+    Generador de listas de filas de `tabla` ordenadas por su clave primaria,
+    leídas de a `batch_size` con "WHERE clave > ultimo" (sin OFFSET), de modo
+    que la memoria usada es constante sin importar el tamaño de la tabla.
+    `where` es una condición extra opcional (p. ej. "activo = 1").
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size debe ser mayor que cero.")
+
+    condicion = f"{clave} > ?" + (f" AND ({where})" if where else "")
+    sql = f"SELECT * FROM {tabla} WHERE {condicion} ORDER BY {clave} LIMIT ?"
+
+    ultimo = after_id if after_id is not None else -1
+    conn = get_connection()
+    while True:
+        # Se lee el lote completo antes de entregarlo: no queda ningún cursor
+        # abierto mientras el llamador procesa (o escribe en la BD).
+        filas = conn.execute(sql, (ultimo, *params, batch_size)).fetchall()
+        if filas:
+            yield filas
+        if len(filas) < batch_size:
+            return
+        ultimo = filas[-1][0]
+
+
+def iterar_filas(tabla, clave, batch_size=1000, after_id=None, where="", params=()):
+    """Como iterar_lotes(), pero entrega las filas de a una."""
+    for filas in iterar_lotes(tabla, clave, batch_size, after_id, where, params):
+        yield from filas
+
+
+def pagina_filas(tabla, clave, limit=100, cursor=None, where="", params=()):
+    """
+    Devuelve (filas, siguiente_cursor). `cursor` es el último id de la página
+    anterior (None para la primera); siguiente_cursor es None al llegar al final.
+    """
+    if limit <= 0:
+        raise ValueError("limit debe ser mayor que cero.")
+
+    condicion = f"{clave} > ?" + (f" AND ({where})" if where else "")
+    sql = f"SELECT * FROM {tabla} WHERE {condicion} ORDER BY {clave} LIMIT ?"
+
+    desde = cursor if cursor is not None else -1
+    # Se pide una fila de más para saber si hay página siguiente.
+    filas = get_connection().execute(sql, (desde, *params, limit + 1)).fetchall()
+    if len(filas) > limit:
+        filas = filas[:limit]
+        return filas, filas[-1][0]
+    return filas, None
+
+
+def filas_por_ids(tabla, clave, ids, tamano_lote=_MAX_PARAMETROS):
+    """
+    Devuelve {id: fila} con las filas de `tabla` cuya clave está en `ids`,
+    usando consultas "WHERE clave IN (...)" de a `tamano_lote` ids (una por
+    tramo en lugar de una por id). Los ids inexistentes no aparecen.
+    """
+    unicos = list(dict.fromkeys(i for i in ids if i is not None))
+    conn = get_connection()
+    filas = {}
+    for tramo in _lotes(unicos, tamano_lote):
+        marcas = ", ".join("?" for _ in tramo)
+        for fila in conn.execute(f"SELECT * FROM {tabla} WHERE {clave} IN ({marcas})", tramo):
+            filas[fila[0]] = fila
+    return filas
@@ -1,4 +1,6 @@
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import get_connection, confirmar, iterar_lotes, pagina_filas, filas_por_ids
+from src.repositories.cache_entidades import CacheEntidades
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.empleado import Empleado
 
 class EmpleadoRepository:
@@ -17,24 +19,31 @@ class EmpleadoRepository:
                 empleado.telefono, empleado.usuario, empleado.password, empleado.rol, 1
             ),
         )
-        conn.commit()
+        confirmar(conn)
         empleado.id_empleado = cursor.lastrowid
+        CacheEntidades().invalidar("empleados", empleado.id_empleado)
         return empleado
 
+    _desde_fila = MapeadorFilas(
+        "empleados", Empleado,
+        conversiones={"activo": bool},
+    )
+
     @staticmethod
     def listar():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM empleados")
-        filas = cursor.fetchall()
-        empleados = []
-        for f in filas:
-            empleados.append(Empleado(
-                id_empleado=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-                email=f[4], telefono=f[5], usuario=f[6], password=f[7],
-                rol=f[8], activo=bool(f[9])
-            ))
-        return empleados
+        return list(EmpleadoRepository.iterar())
+
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre todos los empleados por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("empleados", "id_empleado", batch_size, after_id):
+            yield from EmpleadoRepository._desde_fila.lote(filas)
+
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (empleados, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("empleados", "id_empleado", limit, cursor)
+        return EmpleadoRepository._desde_fila.lote(filas), siguiente
 
     @staticmethod
     def buscar_por_dni(dni):
@@ -43,24 +52,30 @@ class EmpleadoRepository:
         cursor.execute("SELECT * FROM empleados WHERE dni = ?", (dni,))
         f = cursor.fetchone()
         if not f: return None
-        return Empleado(
-            id_empleado=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-            email=f[4], telefono=f[5], usuario=f[6], password=f[7],
-            rol=f[8], activo=bool(f[9])
-        )
+        return EmpleadoRepository._desde_fila(f)
 
     @staticmethod
     def obtener_por_id(id_empleado):
+        return CacheEntidades().obtener("empleados", id_empleado, EmpleadoRepository._leer_por_id)
+
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_empleado: Empleado} para los ids pedidos, en pocas consultas IN."""
+        return CacheEntidades().obtener_muchos("empleados", ids, EmpleadoRepository._leer_por_ids)
+
+    @staticmethod
+    def _leer_por_id(id_empleado):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM empleados WHERE id_empleado = ?", (id_empleado,))
         f = cursor.fetchone()
         if not f: return None
-        return Empleado(
-            id_empleado=f[0], nombre=f[1], apellido=f[2], dni=f[3],
-            email=f[4], telefono=f[5], usuario=f[6], password=f[7],
-            rol=f[8], activo=bool(f[9])
-        )
+        return EmpleadoRepository._desde_fila(f)
+
+    @staticmethod
+    def _leer_por_ids(ids):
+        filas = filas_por_ids("empleados", "id_empleado", ids)
+        return {id_fila: EmpleadoRepository._desde_fila(f) for id_fila, f in filas.items()}
 
     @staticmethod
     def actualizar(empleado: Empleado):
@@ -78,11 +93,13 @@ class EmpleadoRepository:
                 1 if empleado.activo else 0, empleado.id_empleado
             ),
         )
-        conn.commit()
+        confirmar(conn)
+        CacheEntidades().invalidar("empleados", empleado.id_empleado)
 
     @staticmethod
     def inactivar(id_empleado):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("UPDATE empleados SET activo = 0 WHERE id_empleado = ?", (id_empleado,))
-        conn.commit()
\ No newline at end of file
+        confirmar(conn)
+        CacheEntidades().invalidar("empleados", id_empleado)
\ No newline at end of file
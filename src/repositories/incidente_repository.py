@@ -1,8 +1,16 @@
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import (
+    get_connection, confirmar, iterar_lotes, pagina_filas,
+    insertar_muchos, upsert_muchos, notificar_cambio, filas_por_ids,
+)
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.incidente import Incidente
 
 class IncidenteRepository:
 
+    # Columnas de las escrituras masivas (sin el id, que genera SQLite)
+    _COLUMNAS = ("id_alquiler", "tipo", "descripcion", "monto", "estado")
+    _CLAVES_UPSERT = ("id_incidente",)
+
     @staticmethod
     def crear(incidente: Incidente):
         conn = get_connection()
@@ -11,23 +19,27 @@ class IncidenteRepository:
             "INSERT INTO incidentes (id_alquiler, tipo, descripcion, monto, estado) VALUES (?, ?, ?, ?, ?)",
             (incidente.id_alquiler, incidente.tipo, incidente.descripcion, incidente.monto, incidente.estado)
         )
-        conn.commit()
+        confirmar(conn)
         incidente.id_incidente = cursor.lastrowid
         return incidente
 
+    _desde_fila = MapeadorFilas("incidentes", Incidente)
+
     @staticmethod
     def listar():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM incidentes")
-        filas = cursor.fetchall()
-        incidentes = []
-        for f in filas:
-            incidentes.append(Incidente(
-                id_incidente=f[0], id_alquiler=f[1], tipo=f[2],
-                descripcion=f[3], monto=f[4], estado=f[5]
-            ))
-        return incidentes
+        return list(IncidenteRepository.iterar())
+
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre todos los incidentes por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("incidentes", "id_incidente", batch_size, after_id):
+            yield from IncidenteRepository._desde_fila.lote(filas)
+
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (incidentes, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("incidentes", "id_incidente", limit, cursor)
+        return IncidenteRepository._desde_fila.lote(filas), siguiente
 
     @staticmethod
     def obtener_por_id(id_incidente):
@@ -36,10 +48,13 @@ class IncidenteRepository:
         cursor.execute("SELECT * FROM incidentes WHERE id_incidente = ?", (id_incidente,))
         f = cursor.fetchone()
         if not f: return None
-        return Incidente(
-            id_incidente=f[0], id_alquiler=f[1], tipo=f[2],
-            descripcion=f[3], monto=f[4], estado=f[5]
-        )
+        return IncidenteRepository._desde_fila(f)
+
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_incidente: Incidente} para los ids pedidos, en pocas consultas IN."""
+        filas = filas_por_ids("incidentes", "id_incidente", ids)
+        return {id_fila: IncidenteRepository._desde_fila(f) for id_fila, f in filas.items()}
 
     @staticmethod
     def actualizar(incidente: Incidente):
@@ -49,18 +64,61 @@ class IncidenteRepository:
             "UPDATE incidentes SET estado = ? WHERE id_incidente = ?",
             (incidente.estado, incidente.id_incidente)
         )
-        conn.commit()
+        confirmar(conn)
     
     @staticmethod
     def listar_por_alquiler(id_alquiler):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM incidentes WHERE id_alquiler = ?", (id_alquiler,))
-        filas = cursor.fetchall()
-        incidentes = []
-        for f in filas:
-            incidentes.append(Incidente(
-                id_incidente=f[0], id_alquiler=f[1], tipo=f[2],
-                descripcion=f[3], monto=f[4], estado=f[5]
-            ))
-        return incidentes
\ No newline at end of file
+        return IncidenteRepository._desde_fila.todas(cursor)
+
+    # ------------------------------------------------------------------
+    # Escrituras masivas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _a_fila(i):
+        return (i.id_alquiler, i.tipo, i.descripcion, i.monto, i.estado)
+
+    @staticmethod
+    def crear_muchos(incidentes, tamano_lote=5000):
+        """
+        Inserta todos los incidentes con executemany, en transacciones de
+        `tamano_lote` filas. Asigna y devuelve los ids generados.
+        No actualiza resumen_mensual: al terminar la carga, llamar a
+        ResumenMensualRepository.reconstruir().
+        """
+        incidentes = list(incidentes)
+        ids = insertar_muchos(
+            "incidentes", IncidenteRepository._COLUMNAS,
+            (IncidenteRepository._a_fila(i) for i in incidentes), tamano_lote,
+        )
+        for i, id_nuevo in zip(incidentes, ids):
+            i.id_incidente = id_nuevo
+        notificar_cambio("incidentes")
+        return ids
+
+    @staticmethod
+    def upsert_muchos(incidentes, clave="id_incidente", tamano_lote=5000):
+        """
+        Inserta o actualiza los incidentes según `clave` (id_incidente).
+        Asigna y devuelve los ids de cada uno.
+        No actualiza resumen_mensual: al terminar la carga, llamar a
+        ResumenMensualRepository.reconstruir().
+        """
+        if clave not in IncidenteRepository._CLAVES_UPSERT:
+            raise ValueError(f"Clave de upsert inválida: '{clave}'.")
+
+        incidentes = list(incidentes)
+        if clave == "id_incidente":
+            columnas = ("id_incidente",) + IncidenteRepository._COLUMNAS
+            filas = ((i.id_incidente,) + IncidenteRepository._a_fila(i) for i in incidentes)
+        else:
+            columnas = IncidenteRepository._COLUMNAS
+            filas = (IncidenteRepository._a_fila(i) for i in incidentes)
+
+        ids = upsert_muchos("incidentes", columnas, filas, clave, "id_incidente", tamano_lote)
+        for i, id_fila in zip(incidentes, ids):
+            i.id_incidente = id_fila
+        notificar_cambio("incidentes")
+        return ids
@@ -0,0 +1,144 @@
+"""
+Conjunto de índices de la BD y verificación de planes de consulta.
+
+El conjunto se crea desde una migración versionada (ver migraciones.py);
+para agregar o cambiar un índice, sumarlo aquí y registrar una migración
+nueva que lo cree.
+"""
+
+# nombre -> definición. Los índices parciales (WHERE ...) sólo los usa SQLite
+# cuando la consulta repite literalmente la misma condición.
+INDICES = {
+    "idx_alquileres_fecha_inicio":
+        "CREATE INDEX IF NOT EXISTS idx_alquileres_fecha_inicio ON alquileres (fecha_inicio)",
+    # Reportes: estado = 'CERRADO' AND fecha_inicio BETWEEN ...
+    "idx_alquileres_estado_fecha":
+        "CREATE INDEX IF NOT EXISTS idx_alquileres_estado_fecha ON alquileres (estado, fecha_inicio)",
+    # existe_alquiler_activo_en_rango: sólo alquileres abiertos del vehículo
+    "idx_alquileres_abiertos_vehiculo":
+        "CREATE INDEX IF NOT EXISTS idx_alquileres_abiertos_vehiculo "
+        "ON alquileres (id_vehiculo, fecha_inicio, fecha_fin) WHERE estado = 'ABIERTO'",
+    # listar_por_vehiculo / listar_por_cliente (ORDER BY fecha_inicio DESC sin sort)
+    "idx_alquileres_vehiculo_fecha":
+        "CREATE INDEX IF NOT EXISTS idx_alquileres_vehiculo_fecha ON alquileres (id_vehiculo, fecha_inicio)",
+    "idx_alquileres_cliente_fecha":
+        "CREATE INDEX IF NOT EXISTS idx_alquileres_cliente_fecha ON alquileres (id_cliente, fecha_inicio)",
+    "idx_mantenimientos_fecha_inicio":
+        "CREATE INDEX IF NOT EXISTS idx_mantenimientos_fecha_inicio ON mantenimientos (fecha_inicio)",
+    "idx_mantenimientos_vehiculo_fechas":
+        "CREATE INDEX IF NOT EXISTS idx_mantenimientos_vehiculo_fechas "
+        "ON mantenimientos (id_vehiculo, fecha_inicio, fecha_fin)",
+    "idx_incidentes_id_alquiler":
+        "CREATE INDEX IF NOT EXISTS idx_incidentes_id_alquiler ON incidentes (id_alquiler)",
+    "idx_incidentes_estado":
+        "CREATE INDEX IF NOT EXISTS idx_incidentes_estado ON incidentes (estado, id_alquiler)",
+    # Flota activa por estado (dashboard, selección de vehículos disponibles)
+    "idx_vehiculos_activos_estado":
+        "CREATE INDEX IF NOT EXISTS idx_vehiculos_activos_estado ON vehiculos (estado) WHERE activo = 1",
+    "idx_clientes_activos":
+        "CREATE INDEX IF NOT EXISTS idx_clientes_activos ON clientes (apellido, nombre) WHERE activo = 1",
+}
+
+# Consultas de los repositorios que deben resolverse con búsqueda por índice.
+# (nombre, sql, parámetros de ejemplo)
+CONSULTAS_A_VERIFICAR = [
+    (
+        "AlquilerRepository.existe_alquiler_activo_en_rango",
+        "SELECT COUNT(*) FROM alquileres WHERE id_vehiculo = ? AND estado = 'ABIERTO' "
+        "AND NOT (fecha_fin < ? OR fecha_inicio > ?)",
+        (1, "2025-01-01", "2025-01-31"),
+    ),
+    (
+        "AlquilerRepository.listar_por_vehiculo",
+        "SELECT * FROM alquileres WHERE id_vehiculo = ? ORDER BY fecha_inicio DESC",
+        (1,),
+    ),
+    (
+        "AlquilerRepository.listar_por_cliente",
+        "SELECT * FROM alquileres WHERE id_cliente = ? ORDER BY fecha_inicio DESC",
+        (1,),
+    ),
+    (
+        "AlquilerRepository.obtener_por_id",
+        "SELECT * FROM alquileres WHERE id_alquiler = ?",
+        (1,),
+    ),
+    (
+        "ResumenMensualRepository.por_periodo",
+        "SELECT periodo, SUM(cantidad_alquileres), SUM(total_alquileres) FROM resumen_mensual "
+        "WHERE periodo BETWEEN ? AND ? GROUP BY periodo",
+        ("2025-01", "2025-12"),
+    ),
+    (
+        "MantenimientoRepository.existe_mantenimiento_en_rango",
+        "SELECT COUNT(*) FROM mantenimientos WHERE id_vehiculo = ? "
+        "AND NOT (fecha_fin < ? OR fecha_inicio > ?)",
+        (1, "2025-01-01", "2025-01-31"),
+    ),
+    (
+        "MantenimientoRepository.listar_por_vehiculo",
+        "SELECT * FROM mantenimientos WHERE id_vehiculo = ?",
+        (1,),
+    ),
+    # Los EXISTS por vehículo de VehiculoRepository.listar_con_ocupacion
+    (
+        "VehiculoRepository.listar_con_ocupacion (mantenimientos)",
+        "SELECT 1 FROM mantenimientos WHERE id_vehiculo = ? AND fecha_inicio <= ? AND fecha_fin >= ?",
+        (1, "2025-01-01", "2025-01-01"),
+    ),
+    (
+        "VehiculoRepository.listar_con_ocupacion (alquileres)",
+        "SELECT 1 FROM alquileres WHERE id_vehiculo = ? AND estado = 'ABIERTO' "
+        "AND fecha_inicio <= ? AND fecha_fin >= ?",
+        (1, "2025-01-01", "2025-01-01"),
+    ),
+    (
+        "IncidenteRepository.listar_por_alquiler",
+        "SELECT * FROM incidentes WHERE id_alquiler = ?",
+        (1,),
+    ),
+    (
+        "ClienteRepository.buscar_por_dni",
+        "SELECT * FROM clientes WHERE dni = ?",
+        ("1",),
+    ),
+    (
+        "VehiculoRepository.buscar_por_patente",
+        "SELECT * FROM vehiculos WHERE patente = ?",
+        ("AA000AA",),
+    ),
+    (
+        "EmpleadoRepository.buscar_por_dni",
+        "SELECT * FROM empleados WHERE dni = ?",
+        ("1",),
+    ),
+    (
+        "AuthService.login",
+        "SELECT id_empleado, nombre, apellido, rol, activo FROM empleados "
+        "WHERE usuario = ? AND password = ?",
+        ("admin", "admin"),
+    ),
+]
+
+
+def crear_indices(cursor):
+    for ddl in INDICES.values():
+        cursor.execute(ddl)
+
+
+def verificar_indices(conn):
+    """
+    Ejecuta EXPLAIN QUERY PLAN para cada consulta de CONSULTAS_A_VERIFICAR y
+    devuelve [(consulta, detalle_del_plan), ...] con las que recorren una
+    tabla completa en lugar de buscar por índice. Lista vacía = todo en orden.
+    """
+    cursor = conn.cursor()
+    faltantes = []
+    for nombre, sql, params in CONSULTAS_A_VERIFICAR:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        for fila in cursor.fetchall():
+            detalle = fila[-1]
+            # "SCAN tabla" sin índice = recorrido completo ("SEARCH" = búsqueda).
+            if detalle.startswith("SCAN") and "INDEX" not in detalle:
+                faltantes.append((nombre, detalle))
+    return faltantes
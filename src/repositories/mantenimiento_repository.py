@@ -1,8 +1,16 @@
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import (
+    get_connection, confirmar, iterar_lotes, pagina_filas,
+    insertar_muchos, upsert_muchos, notificar_cambio, filas_por_ids,
+)
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.mantenimiento import Mantenimiento
 
 class MantenimientoRepository:
 
+    # Columnas de las escrituras masivas (sin el id, que genera SQLite)
+    _COLUMNAS = ("id_vehiculo", "fecha_inicio", "fecha_fin", "descripcion")
+    _CLAVES_UPSERT = ("id_mantenimiento",)
+
     @staticmethod
     def crear(mantenimiento: Mantenimiento):
         conn = get_connection()
@@ -11,37 +19,34 @@ class MantenimientoRepository:
             "INSERT INTO mantenimientos (id_vehiculo, fecha_inicio, fecha_fin, descripcion) VALUES (?, ?, ?, ?)",
             (mantenimiento.id_vehiculo, mantenimiento.fecha_inicio, mantenimiento.fecha_fin, mantenimiento.descripcion)
         )
-        conn.commit()
+        confirmar(conn)
         mantenimiento.id_mantenimiento = cursor.lastrowid
         return mantenimiento
 
+    _desde_fila = MapeadorFilas("mantenimientos", Mantenimiento)
+
     @staticmethod
     def listar():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM mantenimientos")
-        filas = cursor.fetchall()
-        mantenimientos = []
-        for f in filas:
-            mantenimientos.append(Mantenimiento(
-                id_mantenimiento=f[0], id_vehiculo=f[1],
-                fecha_inicio=f[2], fecha_fin=f[3], descripcion=f[4]
-            ))
-        return mantenimientos
+        return list(MantenimientoRepository.iterar())
+
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre todos los mantenimientos por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("mantenimientos", "id_mantenimiento", batch_size, after_id):
+            yield from MantenimientoRepository._desde_fila.lote(filas)
+
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (mantenimientos, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("mantenimientos", "id_mantenimiento", limit, cursor)
+        return MantenimientoRepository._desde_fila.lote(filas), siguiente
 
     @staticmethod
     def listar_por_vehiculo(id_vehiculo):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM mantenimientos WHERE id_vehiculo = ?", (id_vehiculo,))
-        filas = cursor.fetchall()
-        mantenimientos = []
-        for f in filas:
-            mantenimientos.append(Mantenimiento(
-                id_mantenimiento=f[0], id_vehiculo=f[1],
-                fecha_inicio=f[2], fecha_fin=f[3], descripcion=f[4]
-            ))
-        return mantenimientos
+        return MantenimientoRepository._desde_fila.todas(cursor)
 
     @staticmethod
     def obtener_por_id(id_mantenimiento):
@@ -50,14 +55,78 @@ class MantenimientoRepository:
         cursor.execute("SELECT * FROM mantenimientos WHERE id_mantenimiento = ?", (id_mantenimiento,))
         f = cursor.fetchone()
         if not f: return None
-        return Mantenimiento(
-            id_mantenimiento=f[0], id_vehiculo=f[1],
-            fecha_inicio=f[2], fecha_fin=f[3], descripcion=f[4]
+        return MantenimientoRepository._desde_fila(f)
+
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_mantenimiento: Mantenimiento} para los ids pedidos, en pocas consultas IN."""
+        filas = filas_por_ids("mantenimientos", "id_mantenimiento", ids)
+        return {id_fila: MantenimientoRepository._desde_fila(f) for id_fila, f in filas.items()}
+
+    @staticmethod
+    def existe_mantenimiento_en_rango(id_vehiculo, fecha_desde, fecha_hasta):
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT COUNT(*) FROM mantenimientos
+            WHERE id_vehiculo = ?
+            AND NOT (fecha_fin < ? OR fecha_inicio > ?)
+            """,
+            (id_vehiculo, fecha_desde, fecha_hasta)
         )
+        cantidad = cursor.fetchone()[0]
+        return cantidad > 0
 
     @staticmethod
     def eliminar(id_mantenimiento):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM mantenimientos WHERE id_mantenimiento = ?", (id_mantenimiento,))
-        conn.commit()
\ No newline at end of file
+        confirmar(conn)
+
+    # ------------------------------------------------------------------
+    # Escrituras masivas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _a_fila(m):
+        return (m.id_vehiculo, m.fecha_inicio, m.fecha_fin, m.descripcion)
+
+    @staticmethod
+    def crear_muchos(mantenimientos, tamano_lote=5000):
+        """
+        Inserta todos los mantenimientos con executemany, en transacciones de
+        `tamano_lote` filas. Asigna y devuelve los ids generados.
+        """
+        mantenimientos = list(mantenimientos)
+        ids = insertar_muchos(
+            "mantenimientos", MantenimientoRepository._COLUMNAS,
+            (MantenimientoRepository._a_fila(m) for m in mantenimientos), tamano_lote,
+        )
+        for m, id_nuevo in zip(mantenimientos, ids):
+            m.id_mantenimiento = id_nuevo
+        notificar_cambio("mantenimientos")
+        return ids
+
+    @staticmethod
+    def upsert_muchos(mantenimientos, clave="id_mantenimiento", tamano_lote=5000):
+        """
+        Inserta o actualiza los mantenimientos según `clave` (id_mantenimiento).
+        Asigna y devuelve los ids de cada uno.
+        """
+        if clave not in MantenimientoRepository._CLAVES_UPSERT:
+            raise ValueError(f"Clave de upsert inválida: '{clave}'.")
+
+        mantenimientos = list(mantenimientos)
+        if clave == "id_mantenimiento":
+            columnas = ("id_mantenimiento",) + MantenimientoRepository._COLUMNAS
+            filas = ((m.id_mantenimiento,) + MantenimientoRepository._a_fila(m) for m in mantenimientos)
+        else:
+            columnas = MantenimientoRepository._COLUMNAS
+            filas = (MantenimientoRepository._a_fila(m) for m in mantenimientos)
+
+        ids = upsert_muchos("mantenimientos", columnas, filas, clave, "id_mantenimiento", tamano_lote)
+        for m, id_fila in zip(mantenimientos, ids):
+            m.id_mantenimiento = id_fila
+        notificar_cambio("mantenimientos")
+        return ids
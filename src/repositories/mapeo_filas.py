@@ -0,0 +1,96 @@
+import threading
+
+from src.repositories.db_connection import get_connection
+
+
+class MapeadorFilas:
+    """
+    Convierte filas de "SELECT * FROM tabla" en objetos de dominio.
+
+    Por cada orden de columnas (leído una sola vez del cursor.description)
+    genera y compila una función que asigna cada atributo por índice, sin
+    kwargs ni chequeos de len(f) por fila. Las columnas que falten en una BD
+    vieja toman el valor por defecto del atributo.
+
+    - renombres:   {atributo: columna} cuando no se llaman igual (Cliente.id).
+    - conversiones: {atributo: función} aplicada al valor (p. ej. bool).
+    - por_defecto: {atributo: valor} si la columna no existe.
+    """
+
+    def __init__(self, tabla, clase, renombres=None, conversiones=None, por_defecto=None):
+        self.tabla = tabla
+        self.clase = clase
+        self._renombres = renombres or {}
+        self._conversiones = conversiones or {}
+        self._por_defecto = por_defecto or {}
+        self._compilados = {}      # tupla de columnas -> (mapear, mapear_lote)
+        self._de_tabla = None      # las del orden de "SELECT * FROM tabla"
+        self._lock = threading.Lock()
+
+    def _compilar(self, columnas):
+        posiciones = {nombre: i for i, nombre in enumerate(columnas)}
+        entorno = {"_nuevo": object.__new__, "_clase": self.clase}
+        asignaciones = []
+
+        for atributo in self.clase.__slots__:
+            columna = self._renombres.get(atributo, atributo)
+            if columna in posiciones:
+                valor = f"f[{posiciones[columna]}]"
+                if atributo in self._conversiones:
+                    entorno[f"_conv_{atributo}"] = self._conversiones[atributo]
+                    valor = f"_conv_{atributo}({valor})"
+            elif atributo in self._por_defecto:
+                entorno[f"_def_{atributo}"] = self._por_defecto[atributo]
+                valor = f"_def_{atributo}"
+            else:
+                raise ValueError(f"La tabla {self.tabla} no tiene la columna '{columna}'.")
+            asignaciones.append(f"o.{atributo} = {valor}")
+
+        # Una función por fila y otra que recorre un lote entero sin una
+        # llamada por fila.
+        fuente = "\n".join(
+            ["def mapear(f):", "    o = _nuevo(_clase)"]
+            + [f"    {a}" for a in asignaciones]
+            + ["    return o", "",
+               "def mapear_lote(filas):", "    objetos = []", "    agregar = objetos.append",
+               "    for f in filas:", "        o = _nuevo(_clase)"]
+            + [f"        {a}" for a in asignaciones]
+            + ["        agregar(o)", "    return objetos"]
+        )
+        exec(compile(fuente, f"<mapeo {self.tabla}>", "exec"), entorno)
+        return entorno["mapear"], entorno["mapear_lote"]
+
+    def _funciones(self, columnas):
+        columnas = tuple(columnas)
+        funciones = self._compilados.get(columnas)
+        if funciones is None:
+            with self._lock:
+                funciones = self._compilados.get(columnas)
+                if funciones is None:
+                    funciones = self._compilar(columnas)
+                    self._compilados[columnas] = funciones
+        return funciones
+
+    def _funciones_de_tabla(self):
+        funciones = self._de_tabla
+        if funciones is None:
+            cursor = get_connection().execute(f"SELECT * FROM {self.tabla} LIMIT 0")
+            funciones = self._de_tabla = self._funciones(d[0] for d in cursor.description)
+        return funciones
+
+    def para_columnas(self, columnas):
+        """Función fila -> objeto para filas con esas columnas, en ese orden."""
+        return self._funciones(columnas)[0]
+
+    def todas(self, cursor):
+        """Mapea todas las filas pendientes de `cursor`."""
+        mapear_lote = self._funciones(d[0] for d in cursor.description)[1]
+        return mapear_lote(cursor.fetchall())
+
+    def lote(self, filas):
+        """Mapea una lista de filas de "SELECT * FROM tabla"."""
+        return self._funciones_de_tabla()[1](filas)
+
+    def __call__(self, fila):
+        """Mapea una fila con el orden de columnas de "SELECT * FROM tabla"."""
+        return self._funciones_de_tabla()[0](fila)
@@ -0,0 +1,411 @@
+"""
+Motor de migraciones versionadas del esquema.
+
+La tabla schema_version registra qué migraciones ya se aplicaron. Si la BD
+ya está en la última versión, migrar() resuelve todo con una sola consulta
+(no se inspecciona el catálogo). Cada migración corre en su propia
+transacción junto con el registro de su número de versión; las que
+recorren tablas grandes usan ejecutar_por_lotes(), que confirma por lotes y
+retoma desde el último si se interrumpen.
+
+Para agregar un cambio de esquema: escribir una función _mNNN_... y
+sumarla al final de MIGRACIONES. Nunca modificar una migración ya publicada.
+"""
+import sqlite3
+from datetime import datetime
+
+from src.repositories.indices import crear_indices
+
+
+# ---------------------------------------------------------------------
+# Helpers para migraciones
+# ---------------------------------------------------------------------
+def _columnas(cursor, tabla):
+    cursor.execute(f"PRAGMA table_info({tabla});")
+    return {fila[1] for fila in cursor.fetchall()}
+
+
+def _existe_tabla(cursor, tabla):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?;", (tabla,))
+    return cursor.fetchone() is not None
+
+
+def ejecutar_por_lotes(conn, paso, tabla, sentencia, tamano_lote=5000, progreso=None, etiqueta=""):
+    """
+    Ejecuta `sentencia` sobre `tabla` por rangos de rowid, para migraciones
+    largas (backfills de columnas, copias de datos) que no deben ser una
+    única transacción gigante. Debe llamarse desde una migración, dentro de
+    la transacción que abre migrar().
+
+    `sentencia` recibe dos parámetros: rowid desde (exclusivo) y hasta
+    (inclusivo), p. ej. "UPDATE t SET x = ... WHERE rowid > ? AND rowid <= ?".
+    Cada lote se confirma junto con su avance en migracion_avance (clave
+    `paso`, única para cada llamada): si la migración se interrumpe, la
+    próxima vez sigue desde el último lote confirmado, sin repetir ninguno.
+    Lo que la migración haga antes de llamar a esta función queda confirmado
+    con el primer lote, así que debe poder repetirse (CREATE ... IF NOT EXISTS).
+
+    `progreso(etiqueta, hasta, ultimo)` se invoca después de cada lote.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT ultimo_rowid FROM migracion_avance WHERE paso = ?;", (paso,))
+    fila = cursor.fetchone()
+    desde = fila[0] if fila else 0
+    cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {tabla};")
+    ultimo = cursor.fetchone()[0]
+
+    while desde < ultimo:
+        hasta = min(desde + tamano_lote, ultimo)
+        cursor.execute(sentencia, (desde, hasta))
+        cursor.execute(
+            "INSERT OR REPLACE INTO migracion_avance (paso, ultimo_rowid) VALUES (?, ?);",
+            (paso, hasta),
+        )
+        conn.commit()
+        conn.execute("BEGIN;")
+        if progreso:
+            progreso(etiqueta or tabla, hasta, ultimo)
+        desde = hasta
+
+    # Se borra en la transacción de la migración: si ésta se revierte, el
+    # avance queda y el paso no se repite.
+    cursor.execute("DELETE FROM migracion_avance WHERE paso = ?;", (paso,))
+
+
+# Suman a resumen_mensual los alquileres cerrados / incidentes pagados con
+# id en (desde, hasta]. Acumulan, así se pueden aplicar por tramos.
+_SUMAR_ALQUILERES_EN_RANGO = """
+    INSERT INTO resumen_mensual (
+        periodo, id_vehiculo, id_cliente,
+        cantidad_alquileres, total_alquileres, cantidad_incidentes, total_incidentes
+    )
+    SELECT substr(fecha_inicio, 1, 7), id_vehiculo, id_cliente, COUNT(*), SUM(total), 0, 0
+    FROM alquileres
+    WHERE estado = 'CERRADO' AND id_alquiler > ? AND id_alquiler <= ?
+    GROUP BY 1, 2, 3
+    ON CONFLICT (periodo, id_vehiculo, id_cliente) DO UPDATE SET
+        cantidad_alquileres = cantidad_alquileres + excluded.cantidad_alquileres,
+        total_alquileres = total_alquileres + excluded.total_alquileres;
+"""
+
+# Los incidentes se imputan al mes de inicio de su alquiler, sin importar
+# si éste ya está cerrado (igual que el resumen económico).
+_SUMAR_INCIDENTES_EN_RANGO = """
+    INSERT INTO resumen_mensual (
+        periodo, id_vehiculo, id_cliente,
+        cantidad_alquileres, total_alquileres, cantidad_incidentes, total_incidentes
+    )
+    SELECT substr(a.fecha_inicio, 1, 7), a.id_vehiculo, a.id_cliente, 0, 0, COUNT(*), SUM(i.monto)
+    FROM incidentes i
+    JOIN alquileres a ON a.id_alquiler = i.id_alquiler
+    WHERE i.estado = 'PAGADO' AND i.id_incidente > ? AND i.id_incidente <= ?
+    GROUP BY 1, 2, 3
+    ON CONFLICT (periodo, id_vehiculo, id_cliente) DO UPDATE SET
+        cantidad_incidentes = cantidad_incidentes + excluded.cantidad_incidentes,
+        total_incidentes = total_incidentes + excluded.total_incidentes;
+"""
+
+
+def reconstruir_resumen_mensual(cursor):
+    """
+    Recalcula resumen_mensual desde alquileres e incidentes (backfill).
+    Corre sobre la transacción abierta de quien llama: la tabla nunca queda
+    a medio llenar para los reportes ni para los cierres concurrentes.
+    """
+    cursor.execute("DELETE FROM resumen_mensual;")
+    pasos = ((_SUMAR_ALQUILERES_EN_RANGO, "alquileres"), (_SUMAR_INCIDENTES_EN_RANGO, "incidentes"))
+    for sentencia, tabla in pasos:
+        cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {tabla};")
+        cursor.execute(sentencia, (0, cursor.fetchone()[0]))
+
+
+# ---------------------------------------------------------------------
+# Migraciones
+# ---------------------------------------------------------------------
+def _m001_esquema_inicial(conn, progreso):
+    cursor = conn.cursor()
+
+    # Versiones viejas de empleados no tenían credenciales: se recrea la tabla.
+    if _existe_tabla(cursor, "empleados"):
+        columnas_necesarias = {"telefono", "usuario", "password", "rol"}
+        if not columnas_necesarias.issubset(_columnas(cursor, "empleados")):
+            cursor.execute("DROP TABLE empleados;")
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS clientes (
+            id_cliente     INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre         TEXT    NOT NULL,
+            apellido       TEXT    NOT NULL,
+            dni            TEXT    NOT NULL UNIQUE,
+            email          TEXT    NOT NULL UNIQUE,
+            telefono       TEXT,
+            activo         INTEGER NOT NULL DEFAULT 1
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS empleados (
+            id_empleado    INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre         TEXT    NOT NULL,
+            apellido       TEXT    NOT NULL,
+            dni            TEXT    NOT NULL UNIQUE,
+            email          TEXT    NOT NULL UNIQUE,
+            telefono       TEXT,
+            usuario        TEXT    NOT NULL UNIQUE,
+            password       TEXT    NOT NULL,
+            rol            TEXT    NOT NULL,
+            activo         INTEGER NOT NULL DEFAULT 1
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vehiculos (
+            id_vehiculo     INTEGER PRIMARY KEY AUTOINCREMENT,
+            patente         TEXT    NOT NULL UNIQUE,
+            marca           TEXT    NOT NULL,
+            modelo          TEXT    NOT NULL,
+            anio            INTEGER NOT NULL,
+            tipo            TEXT    NOT NULL,
+            precio_por_dia  REAL    NOT NULL,
+            activo          INTEGER NOT NULL DEFAULT 1,
+            estado          TEXT    NOT NULL DEFAULT 'DISPONIBLE',
+            km_actual       REAL    NOT NULL DEFAULT 0,
+            combustible_actual REAL NOT NULL DEFAULT 0
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS alquileres (
+            id_alquiler    INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_cliente     INTEGER NOT NULL,
+            id_vehiculo    INTEGER NOT NULL,
+            id_empleado    INTEGER NOT NULL,
+            fecha_inicio   TEXT    NOT NULL,
+            fecha_fin      TEXT    NOT NULL,
+            precio_por_dia REAL    NOT NULL,
+            estado         TEXT    NOT NULL,
+            total          REAL    NOT NULL DEFAULT 0,
+            km_inicial     REAL    NOT NULL DEFAULT 0,
+            km_final       REAL,
+            combustible_inicial REAL NOT NULL DEFAULT 0,
+            combustible_final   REAL,
+
+            FOREIGN KEY (id_cliente)  REFERENCES clientes(id_cliente),
+            FOREIGN KEY (id_vehiculo) REFERENCES vehiculos(id_vehiculo),
+            FOREIGN KEY (id_empleado) REFERENCES empleados(id_empleado)
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mantenimientos (
+            id_mantenimiento INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_vehiculo      INTEGER NOT NULL,
+            fecha_inicio     TEXT    NOT NULL,
+            fecha_fin        TEXT    NOT NULL,
+            descripcion      TEXT    NOT NULL,
+
+            FOREIGN KEY (id_vehiculo) REFERENCES vehiculos(id_vehiculo)
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS incidentes (
+            id_incidente  INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_alquiler   INTEGER NOT NULL,
+            tipo          TEXT    NOT NULL,
+            descripcion   TEXT    NOT NULL,
+            monto         REAL    NOT NULL,
+            estado        TEXT    NOT NULL,
+
+            FOREIGN KEY (id_alquiler) REFERENCES alquileres(id_alquiler)
+        );
+        """
+    )
+
+    # BDs anteriores a km/combustible: agregar las columnas que falten.
+    cols_v = _columnas(cursor, "vehiculos")
+    if "km_actual" not in cols_v:
+        cursor.execute("ALTER TABLE vehiculos ADD COLUMN km_actual REAL NOT NULL DEFAULT 0;")
+    if "combustible_actual" not in cols_v:
+        cursor.execute("ALTER TABLE vehiculos ADD COLUMN combustible_actual REAL NOT NULL DEFAULT 0;")
+
+    cols_a = _columnas(cursor, "alquileres")
+    if "km_inicial" not in cols_a:
+        cursor.execute("ALTER TABLE alquileres ADD COLUMN km_inicial REAL NOT NULL DEFAULT 0;")
+    if "km_final" not in cols_a:
+        cursor.execute("ALTER TABLE alquileres ADD COLUMN km_final REAL;")
+    if "combustible_inicial" not in cols_a:
+        cursor.execute("ALTER TABLE alquileres ADD COLUMN combustible_inicial REAL NOT NULL DEFAULT 0;")
+    if "combustible_final" not in cols_a:
+        cursor.execute("ALTER TABLE alquileres ADD COLUMN combustible_final REAL;")
+
+
+def _m002_indices_compuestos(conn, progreso):
+    cursor = conn.cursor()
+    crear_indices(cursor)
+
+
+def _m003_resumen_mensual(conn, progreso):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS resumen_mensual (
+            periodo             TEXT    NOT NULL,
+            id_vehiculo         INTEGER NOT NULL,
+            id_cliente          INTEGER NOT NULL,
+            cantidad_alquileres INTEGER NOT NULL DEFAULT 0,
+            total_alquileres    REAL    NOT NULL DEFAULT 0,
+            cantidad_incidentes INTEGER NOT NULL DEFAULT 0,
+            total_incidentes    REAL    NOT NULL DEFAULT 0,
+
+            PRIMARY KEY (periodo, id_vehiculo, id_cliente)
+        ) WITHOUT ROWID;
+        """
+    )
+    # Backfill por lotes: la tabla es nueva, así que no hay nada que vaciar
+    ejecutar_por_lotes(
+        conn, "003_resumen_alquileres", "alquileres", _SUMAR_ALQUILERES_EN_RANGO,
+        progreso=progreso, etiqueta="Resumen mensual: alquileres",
+    )
+    ejecutar_por_lotes(
+        conn, "003_resumen_incidentes", "incidentes", _SUMAR_INCIDENTES_EN_RANGO,
+        progreso=progreso, etiqueta="Resumen mensual: incidentes",
+    )
+
+
+def _m004_registro_cambios_alquileres(conn, progreso):
+    """
+    alquileres_cambios anota, con triggers, el id de cada alquiler insertado,
+    modificado (sólo en las columnas que usan los reportes) o borrado, por
+    cualquier terminal. SnapshotAlquileres lo lee para actualizar sólo esas
+    filas. Se conservan las últimas 10000 anotaciones.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS alquileres_cambios (
+            seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_alquiler  INTEGER NOT NULL
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_alquileres_cambios_insert
+        AFTER INSERT ON alquileres
+        BEGIN
+            INSERT INTO alquileres_cambios (id_alquiler) VALUES (NEW.id_alquiler);
+        END;
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_alquileres_cambios_update
+        AFTER UPDATE OF id_alquiler, id_cliente, id_vehiculo, fecha_inicio, fecha_fin, total, estado
+        ON alquileres
+        BEGIN
+            INSERT INTO alquileres_cambios (id_alquiler) VALUES (OLD.id_alquiler);
+            INSERT INTO alquileres_cambios (id_alquiler)
+            SELECT NEW.id_alquiler WHERE NEW.id_alquiler <> OLD.id_alquiler;
+        END;
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_alquileres_cambios_delete
+        AFTER DELETE ON alquileres
+        BEGIN
+            INSERT INTO alquileres_cambios (id_alquiler) VALUES (OLD.id_alquiler);
+        END;
+        """
+    )
+    # Poda: cada anotación borra la que quedó 10000 lugares atrás
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_alquileres_cambios_poda
+        AFTER INSERT ON alquileres_cambios
+        BEGIN
+            DELETE FROM alquileres_cambios WHERE seq <= NEW.seq - 10000;
+        END;
+        """
+    )
+
+
+# (número, descripción, función). Orden estrictamente creciente.
+MIGRACIONES = [
+    (1, "Esquema inicial", _m001_esquema_inicial),
+    (2, "Índices compuestos y parciales", _m002_indices_compuestos),
+    (3, "Resumen mensual de facturación", _m003_resumen_mensual),
+    (4, "Registro de cambios de alquileres", _m004_registro_cambios_alquileres),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+
+# ---------------------------------------------------------------------
+# Ejecución
+# ---------------------------------------------------------------------
+def version_actual(conn):
+    try:
+        fila = conn.execute("SELECT MAX(version) FROM schema_version;").fetchone()
+    except sqlite3.OperationalError:
+        # BD nueva o anterior al motor de migraciones
+        return 0
+    return fila[0] or 0
+
+
+def migrar(conn, progreso=None):
+    """
+    Lleva la BD a VERSION_ACTUAL aplicando en orden las migraciones pendientes.
+    `progreso(etiqueta, hechos, total)` es opcional y se invoca al terminar
+    cada migración y en cada lote de ejecutar_por_lotes().
+    Devuelve la lista de números de migración aplicados.
+    """
+    version = version_actual(conn)
+    if version >= VERSION_ACTUAL:
+        return []
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version      INTEGER PRIMARY KEY,
+            descripcion  TEXT    NOT NULL,
+            aplicada_en  TEXT    NOT NULL
+        );
+        """
+    )
+    # Último lote confirmado de cada paso de ejecutar_por_lotes() sin terminar
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS migracion_avance (
+            paso          TEXT    PRIMARY KEY,
+            ultimo_rowid  INTEGER NOT NULL
+        );
+        """
+    )
+
+    pendientes = [m for m in MIGRACIONES if m[0] > version]
+    aplicadas = []
+    for posicion, (numero, descripcion, funcion) in enumerate(pendientes, start=1):
+        etiqueta = f"Migración {numero}: {descripcion}"
+        conn.execute("BEGIN;")
+        try:
+            funcion(conn, progreso)
+            conn.execute(
+                "INSERT INTO schema_version (version, descripcion, aplicada_en) VALUES (?, ?, ?)",
+                (numero, descripcion, datetime.now().isoformat(timespec="seconds")),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        aplicadas.append(numero)
+        if progreso:
+            progreso(etiqueta, posicion, len(pendientes))
+    return aplicadas
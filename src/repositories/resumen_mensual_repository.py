@@ -0,0 +1,145 @@
+import calendar
+from datetime import date, timedelta
+
+from src.repositories.db_connection import get_connection, confirmar, transaccion_inmediata
+from src.repositories.migraciones import reconstruir_resumen_mensual
+
+
+class ResumenMensualRepository:
+    """
+    Tabla resumen_mensual: por (período 'AAAA-MM', vehículo, cliente), la
+    cantidad y el total de alquileres CERRADOS y de incidentes PAGADOS,
+    imputados al mes de inicio del alquiler.
+
+    La mantienen los servicios dentro de la misma transacción que el cierre
+    de un alquiler o el pago de un incidente. Las cargas que escriben en
+    alquileres/incidentes por fuera de esos flujos (crear_muchos,
+    upsert_muchos, scripts) deben llamar a reconstruir() al terminar.
+    """
+
+    _SUMAR = """
+        INSERT INTO resumen_mensual (
+            periodo, id_vehiculo, id_cliente,
+            cantidad_alquileres, total_alquileres, cantidad_incidentes, total_incidentes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (periodo, id_vehiculo, id_cliente) DO UPDATE SET
+            cantidad_alquileres = cantidad_alquileres + excluded.cantidad_alquileres,
+            total_alquileres = total_alquileres + excluded.total_alquileres,
+            cantidad_incidentes = cantidad_incidentes + excluded.cantidad_incidentes,
+            total_incidentes = total_incidentes + excluded.total_incidentes
+    """
+
+    @staticmethod
+    def sumar_alquiler(alquiler):
+        """Suma un alquiler recién cerrado a su período."""
+        conn = get_connection()
+        conn.execute(
+            ResumenMensualRepository._SUMAR,
+            (alquiler.fecha_inicio[:7], alquiler.id_vehiculo, alquiler.id_cliente,
+             1, alquiler.total or 0.0, 0, 0.0),
+        )
+        confirmar(conn)
+
+    @staticmethod
+    def sumar_incidente(incidente, alquiler):
+        """Suma un incidente recién pagado al período de su alquiler."""
+        conn = get_connection()
+        conn.execute(
+            ResumenMensualRepository._SUMAR,
+            (alquiler.fecha_inicio[:7], alquiler.id_vehiculo, alquiler.id_cliente,
+             0, 0.0, 1, incidente.monto or 0.0),
+        )
+        confirmar(conn)
+
+    @staticmethod
+    def reconstruir():
+        """Vuelve a calcular toda la tabla desde alquileres e incidentes."""
+        with transaccion_inmediata() as conn:
+            reconstruir_resumen_mensual(conn.cursor())
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _dividir_rango(fecha_desde, fecha_hasta):
+        """
+        Separa [fecha_desde, fecha_hasta] en los meses completos que cubre
+        (primer y último período, o None) y los tramos de días sueltos de
+        los bordes, que no se pueden leer del resumen.
+        """
+        try:
+            desde = date.fromisoformat(fecha_desde)
+            hasta = date.fromisoformat(fecha_hasta)
+        except (TypeError, ValueError):
+            return None, [(fecha_desde, fecha_hasta)]
+
+        primer_mes = desde if desde.day == 1 else (desde.replace(day=28) + timedelta(days=4)).replace(day=1)
+        ultimo_dia = calendar.monthrange(hasta.year, hasta.month)[1]
+        fin_meses = hasta if hasta.day == ultimo_dia else hasta.replace(day=1) - timedelta(days=1)
+
+        if primer_mes > fin_meses:
+            return None, [(fecha_desde, fecha_hasta)]
+
+        tramos = []
+        if primer_mes > desde:
+            tramos.append((fecha_desde, (primer_mes - timedelta(days=1)).isoformat()))
+        if fin_meses < hasta:
+            tramos.append(((fin_meses + timedelta(days=1)).isoformat(), fecha_hasta))
+        return (primer_mes.isoformat()[:7], fin_meses.isoformat()[:7]), tramos
+
+    @staticmethod
+    def por_periodo(fecha_desde, fecha_hasta):
+        """
+        [(periodo, cantidad_alquileres, total_alquileres, cantidad_incidentes,
+        total_incidentes)] por mes, ordenado, para los alquileres con fecha de
+        inicio en [fecha_desde, fecha_hasta]. Los meses completos salen del
+        resumen; los días sueltos de los bordes, de las tablas (por índice).
+        """
+        periodos, tramos = ResumenMensualRepository._dividir_rango(fecha_desde, fecha_hasta)
+        cursor = get_connection().cursor()
+        acumulado = {}
+
+        def sumar(filas, desplazamiento):
+            for periodo, cantidad, total in filas:
+                fila = acumulado.setdefault(periodo, [0, 0.0, 0, 0.0])
+                fila[desplazamiento] += cantidad
+                fila[desplazamiento + 1] += total or 0.0
+
+        if periodos is not None:
+            cursor.execute(
+                """
+                SELECT periodo, SUM(cantidad_alquileres), SUM(total_alquileres),
+                       SUM(cantidad_incidentes), SUM(total_incidentes)
+                FROM resumen_mensual
+                WHERE periodo BETWEEN ? AND ?
+                GROUP BY periodo
+                """,
+                periodos,
+            )
+            for periodo, c_alq, t_alq, c_inc, t_inc in cursor.fetchall():
+                acumulado[periodo] = [c_alq, t_alq, c_inc, t_inc]
+
+        for desde, hasta in tramos:
+            cursor.execute(
+                """
+                SELECT substr(fecha_inicio, 1, 7), COUNT(*), SUM(total)
+                FROM alquileres
+                WHERE estado = 'CERRADO' AND fecha_inicio BETWEEN ? AND ?
+                GROUP BY 1
+                """,
+                (desde, hasta),
+            )
+            sumar(cursor.fetchall(), 0)
+            cursor.execute(
+                """
+                SELECT substr(a.fecha_inicio, 1, 7), COUNT(*), SUM(i.monto)
+                FROM incidentes i
+                JOIN alquileres a ON a.id_alquiler = i.id_alquiler
+                WHERE i.estado = 'PAGADO' AND a.fecha_inicio BETWEEN ? AND ?
+                GROUP BY 1
+                """,
+                (desde, hasta),
+            )
+            sumar(cursor.fetchall(), 2)
+
+        return [(periodo, *acumulado[periodo]) for periodo in sorted(acumulado)]
@@ -1,8 +1,20 @@
-from src.repositories.db_connection import get_connection
+from src.repositories.db_connection import (
+    get_connection, confirmar, iterar_lotes, pagina_filas,
+    insertar_muchos, upsert_muchos, notificar_cambio, filas_por_ids,
+)
+from src.repositories.cache_entidades import CacheEntidades
+from src.repositories.mapeo_filas import MapeadorFilas
 from src.domain.vehiculo import Vehiculo
 
 class VehiculoRepository:
 
+    # Columnas de las escrituras masivas (sin el id, que genera SQLite)
+    _COLUMNAS = (
+        "patente", "marca", "modelo", "anio", "tipo", "precio_por_dia",
+        "activo", "estado", "km_actual", "combustible_actual",
+    )
+    _CLAVES_UPSERT = ("patente", "id_vehiculo")
+
     @staticmethod
     def crear(vehiculo: Vehiculo):
         conn = get_connection()
@@ -20,30 +32,32 @@ class VehiculoRepository:
                 vehiculo.estado or "DISPONIBLE", vehiculo.km_actual, vehiculo.combustible_actual,
             ),
         )
-        conn.commit()
+        confirmar(conn)
         vehiculo.id_vehiculo = cursor.lastrowid
+        CacheEntidades().invalidar("vehiculos", vehiculo.id_vehiculo)
         return vehiculo
 
+    _desde_fila = MapeadorFilas(
+        "vehiculos", Vehiculo,
+        conversiones={"activo": bool},
+        por_defecto={"estado": "DISPONIBLE", "km_actual": 0, "combustible_actual": 0.0},
+    )
+
     @staticmethod
     def listar():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM vehiculos WHERE activo = 1")
-        filas = cursor.fetchall()
+        return list(VehiculoRepository.iterar())
 
-        vehiculos = []
-        for f in filas:
-            # Mapeo seguro de índices
-            estado = f[8] if len(f) > 8 else "DISPONIBLE"
-            km_actual = f[9] if len(f) > 9 else 0
-            comb_actual = f[10] if len(f) > 10 else 0.0
+    @staticmethod
+    def iterar(batch_size=1000, after_id=None):
+        """Recorre los vehículos activos por id, en lotes y con memoria constante."""
+        for filas in iterar_lotes("vehiculos", "id_vehiculo", batch_size, after_id, where="activo = 1"):
+            yield from VehiculoRepository._desde_fila.lote(filas)
 
-            vehiculos.append(Vehiculo(
-                id_vehiculo=f[0], patente=f[1], marca=f[2], modelo=f[3], anio=f[4],
-                tipo=f[5], precio_por_dia=f[6], activo=bool(f[7]),
-                estado=estado, km_actual=km_actual, combustible_actual=comb_actual
-            ))
-        return vehiculos
+    @staticmethod
+    def pagina(limit=100, cursor=None):
+        """Devuelve (vehiculos, siguiente_cursor); siguiente_cursor es None en la última página."""
+        filas, siguiente = pagina_filas("vehiculos", "id_vehiculo", limit, cursor, where="activo = 1")
+        return VehiculoRepository._desde_fila.lote(filas), siguiente
 
     @staticmethod
     def buscar_por_patente(patente):
@@ -53,35 +67,31 @@ class VehiculoRepository:
         f = cursor.fetchone()
 
         if not f: return None
+        return VehiculoRepository._desde_fila(f)
 
-        estado = f[8] if len(f) > 8 else "DISPONIBLE"
-        km_actual = f[9] if len(f) > 9 else 0
-        comb_actual = f[10] if len(f) > 10 else 0.0
+    @staticmethod
+    def obtener_por_id(id_vehiculo):
+        return CacheEntidades().obtener("vehiculos", id_vehiculo, VehiculoRepository._leer_por_id)
 
-        return Vehiculo(
-            id_vehiculo=f[0], patente=f[1], marca=f[2], modelo=f[3], anio=f[4],
-            tipo=f[5], precio_por_dia=f[6], activo=bool(f[7]),
-            estado=estado, km_actual=km_actual, combustible_actual=comb_actual
-        )
+    @staticmethod
+    def obtener_por_ids(ids):
+        """Devuelve {id_vehiculo: Vehiculo} para los ids pedidos, en pocas consultas IN."""
+        return CacheEntidades().obtener_muchos("vehiculos", ids, VehiculoRepository._leer_por_ids)
 
     @staticmethod
-    def obtener_por_id(id_vehiculo):
+    def _leer_por_id(id_vehiculo):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM vehiculos WHERE id_vehiculo = ?", (id_vehiculo,))
         f = cursor.fetchone()
 
         if not f: return None
+        return VehiculoRepository._desde_fila(f)
 
-        estado = f[8] if len(f) > 8 else "DISPONIBLE"
-        km_actual = f[9] if len(f) > 9 else 0
-        comb_actual = f[10] if len(f) > 10 else 0.0
-
-        return Vehiculo(
-            id_vehiculo=f[0], patente=f[1], marca=f[2], modelo=f[3], anio=f[4],
-            tipo=f[5], precio_por_dia=f[6], activo=bool(f[7]),
-            estado=estado, km_actual=km_actual, combustible_actual=comb_actual
-        )
+    @staticmethod
+    def _leer_por_ids(ids):
+        filas = filas_por_ids("vehiculos", "id_vehiculo", ids)
+        return {id_fila: VehiculoRepository._desde_fila(f) for id_fila, f in filas.items()}
 
     @staticmethod
     def actualizar(vehiculo: Vehiculo):
@@ -100,11 +110,159 @@ class VehiculoRepository:
                 vehiculo.km_actual, vehiculo.combustible_actual, vehiculo.id_vehiculo
             ),
         )
-        conn.commit()
+        confirmar(conn)
+        CacheEntidades().invalidar("vehiculos", vehiculo.id_vehiculo)
 
     @staticmethod
     def inactivar(id_vehiculo):
         conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("UPDATE vehiculos SET activo = 0 WHERE id_vehiculo = ?", (id_vehiculo,))
-        conn.commit()
\ No newline at end of file
+        confirmar(conn)
+        CacheEntidades().invalidar("vehiculos", id_vehiculo)
+
+    @staticmethod
+    def listar_disponibles_en_rango(fecha_desde, fecha_hasta, tipo=None, precio_min=None, precio_max=None):
+        """
+        Vehículos activos sin alquiler ABIERTO ni mantenimiento que se solapen
+        con [fecha_desde, fecha_hasta], ordenados por precio por día.
+        Una sola consulta (anti-join con NOT EXISTS) sin importar el tamaño de la flota.
+        """
+        condiciones = ["v.activo = 1"]
+        params = []
+        if tipo:
+            condiciones.append("v.tipo = ?")
+            params.append(tipo)
+        if precio_min is not None:
+            condiciones.append("v.precio_por_dia >= ?")
+            params.append(precio_min)
+        if precio_max is not None:
+            condiciones.append("v.precio_por_dia <= ?")
+            params.append(precio_max)
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT v.* FROM vehiculos v
+            WHERE {" AND ".join(condiciones)}
+              AND NOT EXISTS (
+                  SELECT 1 FROM alquileres a
+                  WHERE a.id_vehiculo = v.id_vehiculo AND a.estado = 'ABIERTO'
+                    AND NOT (a.fecha_fin < ? OR a.fecha_inicio > ?)
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM mantenimientos m
+                  WHERE m.id_vehiculo = v.id_vehiculo
+                    AND NOT (m.fecha_fin < ? OR m.fecha_inicio > ?)
+              )
+            ORDER BY v.precio_por_dia, v.id_vehiculo
+            """,
+            (*params, fecha_desde, fecha_hasta, fecha_desde, fecha_hasta)
+        )
+        return VehiculoRepository._desde_fila.todas(cursor)
+
+    @staticmethod
+    def listar_con_ocupacion(fecha_ref):
+        """
+        [(Vehiculo, en_mantenimiento, alquilado)] de los vehículos activos
+        por id: si `fecha_ref` cae dentro de un mantenimiento o de un alquiler
+        ABIERTO. Una sola consulta; los EXISTS van por índice.
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT v.*,
+                   EXISTS (
+                       SELECT 1 FROM mantenimientos m
+                       WHERE m.id_vehiculo = v.id_vehiculo
+                         AND m.fecha_inicio <= ?1 AND m.fecha_fin >= ?1
+                   ),
+                   EXISTS (
+                       SELECT 1 FROM alquileres a
+                       WHERE a.id_vehiculo = v.id_vehiculo AND a.estado = 'ABIERTO'
+                         AND a.fecha_inicio <= ?1 AND a.fecha_fin >= ?1
+                   )
+            FROM vehiculos v
+            WHERE v.activo = 1
+            ORDER BY v.id_vehiculo
+            """,
+            (fecha_ref,)
+        )
+        mapear = VehiculoRepository._desde_fila.para_columnas(d[0] for d in cursor.description)
+        return [(mapear(f), bool(f[-2]), bool(f[-1])) for f in cursor.fetchall()]
+
+    @staticmethod
+    def listar_ocupaciones_en_rango(fecha_desde, fecha_hasta):
+        """
+        [(id_vehiculo, en_mantenimiento, fecha_inicio, fecha_fin)] de los
+        mantenimientos y alquileres ABIERTOS de vehículos activos que se
+        solapan con [fecha_desde, fecha_hasta]. Sólo las columnas necesarias,
+        sin armar objetos: es la entrada del barrido de obtener_timeline_flota.
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT m.id_vehiculo, 1, m.fecha_inicio, m.fecha_fin
+            FROM mantenimientos m JOIN vehiculos v ON v.id_vehiculo = m.id_vehiculo
+            WHERE v.activo = 1 AND m.fecha_inicio <= ?2 AND m.fecha_fin >= ?1
+            UNION ALL
+            SELECT a.id_vehiculo, 0, a.fecha_inicio, a.fecha_fin
+            FROM alquileres a JOIN vehiculos v ON v.id_vehiculo = a.id_vehiculo
+            WHERE v.activo = 1 AND a.estado = 'ABIERTO'
+              AND a.fecha_inicio <= ?2 AND a.fecha_fin >= ?1
+            """,
+            (fecha_desde, fecha_hasta)
+        )
+        return [(id_v, bool(mant), ini, fin) for id_v, mant, ini, fin in cursor.fetchall()]
+
+    # ------------------------------------------------------------------
+    # Escrituras masivas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _a_fila(v):
+        return (
+            v.patente, v.marca, v.modelo, v.anio, v.tipo, v.precio_por_dia,
+            1 if v.activo else 0, v.estado or "DISPONIBLE", v.km_actual, v.combustible_actual,
+        )
+
+    @staticmethod
+    def crear_muchos(vehiculos, tamano_lote=5000):
+        """
+        Inserta todos los vehículos con executemany, en transacciones de
+        `tamano_lote` filas. Asigna y devuelve los ids generados.
+        """
+        vehiculos = list(vehiculos)
+        ids = insertar_muchos(
+            "vehiculos", VehiculoRepository._COLUMNAS,
+            (VehiculoRepository._a_fila(v) for v in vehiculos), tamano_lote,
+        )
+        for v, id_nuevo in zip(vehiculos, ids):
+            v.id_vehiculo = id_nuevo
+        notificar_cambio("vehiculos")
+        return ids
+
+    @staticmethod
+    def upsert_muchos(vehiculos, clave="patente", tamano_lote=5000):
+        """
+        Inserta o actualiza los vehículos según `clave` (patente, id_vehiculo).
+        Asigna y devuelve los ids de cada uno.
+        """
+        if clave not in VehiculoRepository._CLAVES_UPSERT:
+            raise ValueError(f"Clave de upsert inválida: '{clave}'.")
+
+        vehiculos = list(vehiculos)
+        if clave == "id_vehiculo":
+            columnas = ("id_vehiculo",) + VehiculoRepository._COLUMNAS
+            filas = ((v.id_vehiculo,) + VehiculoRepository._a_fila(v) for v in vehiculos)
+        else:
+            columnas = VehiculoRepository._COLUMNAS
+            filas = (VehiculoRepository._a_fila(v) for v in vehiculos)
+
+        ids = upsert_muchos("vehiculos", columnas, filas, clave, "id_vehiculo", tamano_lote)
+        for v, id_fila in zip(vehiculos, ids):
+            v.id_vehiculo = id_fila
+        notificar_cambio("vehiculos")
+        return ids
@@ -1,38 +1,16 @@
-from datetime import datetime
-
 from src.domain.alquiler import Alquiler
 from src.repositories.alquiler_repository import AlquilerRepository
 from src.repositories.cliente_repository import ClienteRepository
 from src.repositories.vehiculo_repository import VehiculoRepository
 from src.repositories.empleado_repository import EmpleadoRepository
 from src.repositories.mantenimiento_repository import MantenimientoRepository
+from src.repositories.resumen_mensual_repository import ResumenMensualRepository
+from src.repositories.db_connection import transaccion_inmediata
+from src.services.fechas import parsear_fecha
 
 
 class AlquilerService:
 
-    @staticmethod
-    def _parsear_fecha(fecha_str):
-        """
-        Intenta convertir una cadena 'AAAA-MM-DD' a date.
-        Devuelve (True, date) o (False, mensaje_error).
-        """
-        fecha_str = (fecha_str or "").strip()
-        if not fecha_str:
-            return False, "La fecha no puede estar vacía."
-
-        try:
-            fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            return True, fecha
-        except ValueError:
-            return False, "La fecha debe tener formato AAAA-MM-DD."
-
-    @staticmethod
-    def _rango_se_solapa(desde1, hasta1, desde2, hasta2):
-        """
-        Recibe 4 date y devuelve True si los rangos [desde1, hasta1] y [desde2, hasta2] se solapan.
-        """
-        return not (hasta1 < desde2 or hasta2 < desde1)
-
     @staticmethod
     def crear_alquiler(id_cliente, id_vehiculo, id_empleado, fecha_inicio_str, fecha_fin_str):
         # Validar IDs (que sean enteros positivos)
@@ -47,11 +25,11 @@ class AlquilerService:
             return False, "Los IDs de cliente, vehículo y empleado deben ser mayores que cero."
 
         # Validar fechas
-        ok_ini, fecha_inicio_o_msg = AlquilerService._parsear_fecha(fecha_inicio_str)
+        ok_ini, fecha_inicio_o_msg = parsear_fecha(fecha_inicio_str)
         if not ok_ini:
             return False, fecha_inicio_o_msg
 
-        ok_fin, fecha_fin_o_msg = AlquilerService._parsear_fecha(fecha_fin_str)
+        ok_fin, fecha_fin_o_msg = parsear_fecha(fecha_fin_str)
         if not ok_fin:
             return False, fecha_fin_o_msg
 
@@ -61,6 +39,17 @@ class AlquilerService:
         if fecha_fin < fecha_inicio:
             return False, "La fecha de fin no puede ser anterior a la fecha de inicio."
 
+        # Verificaciones y escrituras en una sola transacción BEGIN IMMEDIATE:
+        # dos terminales no pueden reservar el mismo vehículo a la vez.
+        with transaccion_inmediata():
+            ok, alquiler_o_msg = AlquilerService._registrar_alquiler(
+                id_cliente, id_vehiculo, id_empleado, fecha_inicio, fecha_fin
+            )
+        return ok, alquiler_o_msg
+
+    @staticmethod
+    def _registrar_alquiler(id_cliente, id_vehiculo, id_empleado, fecha_inicio, fecha_fin):
+        """Debe llamarse dentro de transaccion_inmediata()."""
         # Verificar existencia y estado de cliente
         cliente = ClienteRepository.obtener_por_id(id_cliente)
         if cliente is None:
@@ -91,23 +80,16 @@ class AlquilerService:
         if not empleado.activo:
             return False, "El empleado está inactivo y no puede gestionar alquileres."
 
-        # Chequear alquileres activos para el vehículo en el rango dado
+        # Chequear alquileres activos y mantenimientos del vehículo en el rango dado.
+        # Con el lock de escritura tomado, nadie puede reservarlo entretanto.
         fecha_inicio_iso = fecha_inicio.isoformat()
         fecha_fin_iso = fecha_fin.isoformat()
 
-        if AlquilerRepository.existe_alquiler_activo_en_rango(
-            id_vehiculo, fecha_inicio_iso, fecha_fin_iso
-        ):
+        if AlquilerRepository.existe_alquiler_activo_en_rango(id_vehiculo, fecha_inicio_iso, fecha_fin_iso):
             return False, "El vehículo ya tiene un alquiler activo en ese rango de fechas."
 
-        # Chequear mantenimientos para el vehículo
-        mantenimientos = MantenimientoRepository.listar_por_vehiculo(id_vehiculo)
-        for m in mantenimientos:
-            ok_m_ini, f_m_ini = AlquilerService._parsear_fecha(m.fecha_inicio)
-            ok_m_fin, f_m_fin = AlquilerService._parsear_fecha(m.fecha_fin)
-            if ok_m_ini and ok_m_fin:
-                if AlquilerService._rango_se_solapa(fecha_inicio, fecha_fin, f_m_ini, f_m_fin):
-                    return False, "El vehículo tiene un mantenimiento programado en ese rango de fechas."
+        if MantenimientoRepository.existe_mantenimiento_en_rango(id_vehiculo, fecha_inicio_iso, fecha_fin_iso):
+            return False, "El vehículo tiene un mantenimiento programado en ese rango de fechas."
 
         # Calcular días y precio estimado
         dias = (fecha_fin - fecha_inicio).days
@@ -151,6 +133,12 @@ class AlquilerService:
         alquileres = AlquilerRepository.listar()
         return True, alquileres
 
+    @staticmethod
+    def listar_alquileres_por_ids(ids):
+        """Los alquileres de `ids` que existan (para refrescar sólo esas filas)."""
+        alquileres = AlquilerRepository.obtener_por_ids(ids)
+        return True, list(alquileres.values())
+
     @staticmethod
     def obtener_alquiler_por_id(id_alquiler):
         try:
@@ -165,6 +153,15 @@ class AlquilerService:
 
     @staticmethod
     def cerrar_alquiler(id_alquiler, fecha_devolucion_str, km_final, combustible_final, monto_extra=0.0):
+        # Lectura, validaciones y ambos UPDATE en una sola transacción (un commit).
+        with transaccion_inmediata():
+            ok, alquiler_o_msg = AlquilerService._cerrar_alquiler(
+                id_alquiler, fecha_devolucion_str, km_final, combustible_final, monto_extra
+            )
+        return ok, alquiler_o_msg
+
+    @staticmethod
+    def _cerrar_alquiler(id_alquiler, fecha_devolucion_str, km_final, combustible_final, monto_extra=0.0):
         # Buscar alquiler existente
         ok, alquiler_o_msg = AlquilerService.obtener_alquiler_por_id(id_alquiler)
         if not ok:
@@ -176,14 +173,14 @@ class AlquilerService:
             return False, "El alquiler ya está cerrado."
 
         # Validar fecha de devolución
-        ok_dev, fecha_dev_o_msg = AlquilerService._parsear_fecha(fecha_devolucion_str)
+        ok_dev, fecha_dev_o_msg = parsear_fecha(fecha_devolucion_str)
         if not ok_dev:
             return False, fecha_dev_o_msg
 
         fecha_devolucion = fecha_dev_o_msg
 
         # Fecha de inicio en date
-        ok_ini, fecha_ini_o_msg = AlquilerService._parsear_fecha(alquiler.fecha_inicio)
+        ok_ini, fecha_ini_o_msg = parsear_fecha(alquiler.fecha_inicio)
         if not ok_ini:
             return False, "La fecha de inicio almacenada del alquiler es inválida."
 
@@ -244,6 +241,7 @@ class AlquilerService:
         alquiler.estado = "CERRADO"
 
         AlquilerRepository.actualizar_cierre(alquiler)
+        ResumenMensualRepository.sumar_alquiler(alquiler)
 
         # Actualizar vehículo
         vehiculo.km_actual = km_final
@@ -26,6 +26,10 @@ class ClienteService:
     def listar_clientes(self) -> List[Cliente]:
         return self._repo.listar()
 
+    def listar_clientes_por_ids(self, ids) -> List[Cliente]:
+        """Como listar_clientes() pero sólo para `ids`: omite los inactivos."""
+        return [c for c in self._repo.obtener_por_ids(ids).values() if c.activo]
+
     def crear_cliente(self, nombre: str, dni: str, email: str, telefono: str) -> Cliente:
         # Normalizo nombre
         nombre = nombre.strip()
@@ -122,5 +126,11 @@ class ClienteService:
         except Exception as e:
             raise Exception(f"Ocurrió un error al modificar el cliente: {e}")
 
-    def desactivar_cliente(self, cliente_id: int):
+    def desactivar_cliente(self, cliente_id: int) -> Cliente:
+        cliente = self._repo.obtener_por_id(cliente_id)
+        if cliente is None:
+            raise ValueError(f"Cliente con id {cliente_id} no encontrado")
+
         self._repo.inactivar(cliente_id)
+        cliente.activo = False
+        return cliente
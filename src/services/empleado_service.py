@@ -137,6 +137,14 @@ class EmpleadoService:
         except Exception as e:
             return False, f"No se pudieron listar los empleados: {e}"
 
+    @staticmethod
+    def listar_empleados_por_ids(ids):
+        try:
+            empleados = EmpleadoRepository.obtener_por_ids(ids)
+            return True, list(empleados.values())
+        except Exception as e:
+            return False, f"No se pudieron listar los empleados: {e}"
+
     @staticmethod
     def obtener_empleado_por_id(id_empleado):
         empleado = EmpleadoRepository.obtener_por_id(id_empleado)
@@ -254,4 +262,5 @@ class EmpleadoService:
             return False, "El empleado ya está inactivo."
 
         EmpleadoRepository.inactivar(id_empleado)
-        return True, "Empleado inactivado correctamente."
+        empleado.activo = False
+        return True, empleado
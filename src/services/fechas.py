@@ -0,0 +1,17 @@
+from datetime import datetime
+
+
+def parsear_fecha(fecha_str):
+    """
+    Intenta convertir una cadena 'AAAA-MM-DD' a date.
+    Devuelve (True, date) o (False, mensaje_error).
+    """
+    fecha_str = (fecha_str or "").strip()
+    if not fecha_str:
+        return False, "La fecha no puede estar vacía."
+
+    try:
+        fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
+        return True, fecha
+    except ValueError:
+        return False, "La fecha debe tener formato AAAA-MM-DD."
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from src.repositories.db_connection import get_connection, generacion_datos
+from src.repositories.vehiculo_repository import VehiculoRepository
+
+
+class EstadoFlota:
+    """
+    Estado de la flota en una fecha (lo devuelve FlotaStatusService).
+
+    - detalle: ((Vehiculo, estado), ...) de los vehículos activos, por id;
+      estado es DISPONIBLE, ALQUILADO o MANTENIMIENTO (el mantenimiento
+      tiene prioridad sobre el alquiler).
+    - resumen: {"disponibles", "alquilados", "mantenimiento"}.
+
+    Es compartido por todos los que piden la misma fecha: no modificarlo.
+    """
+    __slots__ = ("fecha", "detalle", "resumen")
+
+    def __init__(self, fecha, filas):
+        detalle = []
+        resumen = {"disponibles": 0, "alquilados": 0, "mantenimiento": 0}
+        for vehiculo, en_mantenimiento, alquilado in filas:
+            if en_mantenimiento:
+                estado = "MANTENIMIENTO"
+                resumen["mantenimiento"] += 1
+            elif alquilado:
+                estado = "ALQUILADO"
+                resumen["alquilados"] += 1
+            else:
+                estado = "DISPONIBLE"
+                resumen["disponibles"] += 1
+            detalle.append((vehiculo, estado))
+
+        self.fecha = fecha
+        self.detalle = tuple(detalle)
+        self.resumen = resumen
+
+    def disponibles(self):
+        return [v for v, estado in self.detalle if estado == "DISPONIBLE"]
+
+
+class FlotaStatusService:
+    """
+    Estado de cada vehículo en una fecha (Singleton), para el dashboard, la
+    portada y el reporte de flota.
+
+    Se resuelve con una sola consulta (VehiculoRepository.listar_con_ocupacion)
+    y se guarda por (fecha, generación de datos): mientras nadie escriba en
+    la BD, volver al dashboard o a la portada no consulta nada.
+    """
+    _instance = None
+    _lock_instancia = threading.Lock()
+
+    # Fechas distintas que se recuerdan (hoy y las últimas consultadas en reportes)
+    _MAX_FECHAS = 8
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._lock_instancia:
+                if cls._instance is None:
+                    instancia = super(FlotaStatusService, cls).__new__(cls)
+                    instancia._lock = threading.Lock()
+                    instancia._estados = OrderedDict()   # (fecha, generación) -> EstadoFlota
+                    cls._instance = instancia
+        return cls._instance
+
+    def estado_en(self, fecha_ref=None):
+        """EstadoFlota en `fecha_ref` ('AAAA-MM-DD'; por defecto, hoy)."""
+        fecha_ref = fecha_ref or date.today().isoformat()
+        clave = (fecha_ref, generacion_datos())
+        with self._lock:
+            estado = self._estados.get(clave)
+            if estado is not None:
+                self._estados.move_to_end(clave)
+                return estado
+
+        estado = EstadoFlota(fecha_ref, VehiculoRepository.listar_con_ocupacion(fecha_ref))
+        # Lo leído dentro de una transacción abierta todavía puede revertirse
+        if get_connection().in_transaction:
+            return estado
+
+        with self._lock:
+            # Las entradas de generaciones anteriores ya no se van a pedir
+            for vieja in [c for c in self._estados if c[1] != clave[1]]:
+                del self._estados[vieja]
+            self._estados[clave] = estado
+            while len(self._estados) > self._MAX_FECHAS:
+                self._estados.popitem(last=False)
+        return estado
+
+    def limpiar(self):
+        with self._lock:
+            self._estados.clear()
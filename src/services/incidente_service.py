@@ -1,6 +1,8 @@
 from src.domain.incidente import Incidente
 from src.repositories.incidente_repository import IncidenteRepository
 from src.repositories.alquiler_repository import AlquilerRepository
+from src.repositories.resumen_mensual_repository import ResumenMensualRepository
+from src.repositories.db_connection import transaccion_inmediata
 
 
 class IncidenteService:
@@ -34,20 +36,22 @@ class IncidenteService:
         if monto < 0:
             return False, "El monto no puede ser negativo."
 
-        ok_alq, alq_o_msg = IncidenteService._obtener_alquiler_valido(id_alquiler)
-        if not ok_alq:
-            return False, alq_o_msg
-
-        incidente = Incidente(
-            id_incidente=None,
-            id_alquiler=id_alquiler,
-            tipo=tipo,
-            descripcion=descripcion,
-            monto=monto,
-            estado="PENDIENTE"
-        )
-
-        incidente_creado = IncidenteRepository.crear(incidente)
+        # Verificación del alquiler e INSERT en la misma transacción
+        with transaccion_inmediata():
+            ok_alq, alq_o_msg = IncidenteService._obtener_alquiler_valido(id_alquiler)
+            if not ok_alq:
+                return False, alq_o_msg
+
+            incidente = Incidente(
+                id_incidente=None,
+                id_alquiler=id_alquiler,
+                tipo=tipo,
+                descripcion=descripcion,
+                monto=monto,
+                estado="PENDIENTE"
+            )
+
+            incidente_creado = IncidenteRepository.crear(incidente)
         return True, incidente_creado
 
     @staticmethod
@@ -62,6 +66,12 @@ class IncidenteService:
         incidentes = IncidenteRepository.listar()
         return True, incidentes
 
+    @staticmethod
+    def listar_incidentes_por_ids(ids):
+        """Los incidentes de `ids` que existan (para refrescar sólo esas filas)."""
+        incidentes = IncidenteRepository.obtener_por_ids(ids)
+        return True, list(incidentes.values())
+
     @staticmethod
     def listar_incidentes_por_alquiler(id_alquiler):
         try:
@@ -79,13 +89,20 @@ class IncidenteService:
         except (TypeError, ValueError):
             return False, "El ID de incidente debe ser numérico."
 
-        incidente = IncidenteRepository.obtener_por_id(id_incidente)
-        if incidente is None:
-            return False, "No se encontró un incidente con ese ID."
+        # Lectura y actualización atómicas: un incidente no se cobra dos veces
+        with transaccion_inmediata():
+            incidente = IncidenteRepository.obtener_por_id(id_incidente)
+            if incidente is None:
+                return False, "No se encontró un incidente con ese ID."
+
+            if incidente.estado == "PAGADO":
+                return False, "El incidente ya está marcado como pagado."
 
-        if incidente.estado == "PAGADO":
-            return False, "El incidente ya está marcado como pagado."
+            incidente.estado = "PAGADO"
+            IncidenteRepository.actualizar(incidente)
 
-        incidente.estado = "PAGADO"
-        IncidenteRepository.actualizar(incidente)
-        return True, "Incidente marcado como pagado correctamente."
+            # Sin alquiler asociado el incidente tampoco entra en los reportes
+            alquiler = AlquilerRepository.obtener_por_id(incidente.id_alquiler)
+            if alquiler is not None:
+                ResumenMensualRepository.sumar_incidente(incidente, alquiler)
+        return True, incidente
@@ -1,23 +1,11 @@
-from datetime import datetime
-
 from src.repositories.alquiler_repository import AlquilerRepository
 from src.repositories.cliente_repository import ClienteRepository
 from src.repositories.vehiculo_repository import VehiculoRepository
+from src.services.fechas import parsear_fecha
 
 
 class ReporteService:
 
-    @staticmethod
-    def _parsear_fecha(fecha_str):
-        fecha_str = (fecha_str or "").strip()
-        if not fecha_str:
-            return False, "La fecha no puede estar vacía."
-        try:
-            fecha = datetime.strptime(fecha_str, "%Y-%m-%d").date()
-            return True, fecha
-        except ValueError:
-            return False, "La fecha debe tener formato AAAA-MM-DD."
-
     @staticmethod
     def alquileres_por_cliente(id_cliente):
         try:
@@ -48,11 +36,11 @@ class ReporteService:
 
     @staticmethod
     def alquileres_en_rango(fecha_desde_str, fecha_hasta_str):
-        ok_desde, f_desde_o_msg = ReporteService._parsear_fecha(fecha_desde_str)
+        ok_desde, f_desde_o_msg = parsear_fecha(fecha_desde_str)
         if not ok_desde:
             return False, f_desde_o_msg
 
-        ok_hasta, f_hasta_o_msg = ReporteService._parsear_fecha(fecha_hasta_str)
+        ok_hasta, f_hasta_o_msg = parsear_fecha(fecha_hasta_str)
         if not ok_hasta:
             return False, f_hasta_o_msg
 
@@ -66,7 +54,7 @@ class ReporteService:
         resultado = []
 
         for a in alquileres:
-            ok_ai, f_ai = ReporteService._parsear_fecha(a.fecha_inicio)
+            ok_ai, f_ai = parsear_fecha(a.fecha_inicio)
             if not ok_ai:
                 continue
             if fecha_desde <= f_ai <= fecha_hasta:
@@ -5,6 +5,7 @@ from src.domain.vehiculo import Vehiculo
 from src.repositories.vehiculo_repository import VehiculoRepository
 # --- IMPORTAMOS LA NUEVA FÁBRICA ---
 from src.domain.vehiculo_factory import VehiculoFactory
+from src.services.fechas import parsear_fecha
 
 
 class VehiculoService:
@@ -121,6 +122,42 @@ class VehiculoService:
         vehiculos = VehiculoRepository.listar()
         return True, vehiculos
 
+    # ---------------------------------------------------------------
+    # Disponibles en un rango de fechas
+    # ---------------------------------------------------------------
+    @staticmethod
+    def buscar_disponibles(fecha_desde_str, fecha_hasta_str, tipo=None, precio_min=None, precio_max=None):
+        """
+        Devuelve (ok, vehiculos_o_msg): vehículos activos sin alquileres abiertos
+        ni mantenimientos en el rango, ordenados por precio por día.
+        """
+        ok_desde, f_desde_o_msg = parsear_fecha(fecha_desde_str)
+        if not ok_desde:
+            return False, f_desde_o_msg
+
+        ok_hasta, f_hasta_o_msg = parsear_fecha(fecha_hasta_str)
+        if not ok_hasta:
+            return False, f_hasta_o_msg
+
+        if f_hasta_o_msg < f_desde_o_msg:
+            return False, "La fecha de fin no puede ser anterior a la fecha de inicio."
+
+        tipo = (tipo or "").strip().lower() or None
+        if tipo is not None and tipo not in VehiculoService.TIPOS_VALIDOS:
+            return False, "Tipo de vehículo inválido."
+
+        try:
+            precio_min = float(precio_min) if precio_min not in (None, "") else None
+            precio_max = float(precio_max) if precio_max not in (None, "") else None
+        except (TypeError, ValueError):
+            return False, "Los precios deben ser numéricos."
+
+        vehiculos = VehiculoRepository.listar_disponibles_en_rango(
+            f_desde_o_msg.isoformat(), f_hasta_o_msg.isoformat(),
+            tipo=tipo, precio_min=precio_min, precio_max=precio_max,
+        )
+        return True, vehiculos
+
     # ---------------------------------------------------------------
     # Obtener por ID
     # ---------------------------------------------------------------
@@ -7,10 +7,14 @@ import customtkinter as ctk
 from tkcalendar import DateEntry
 
 from src.services.alquiler_service import AlquilerService
-from src.repositories.vehiculo_repository import VehiculoRepository
+from src.services.vehiculo_service import VehiculoService
 from src.repositories.cliente_repository import ClienteRepository
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
+from src.ui.gui.tabla_virtual import TablaVirtual
+from src.ui.gui.enlace_tabla import EnlaceTabla
 
-class AlquileresScreen(ctk.CTkFrame):
+class AlquileresScreen(RecargaAlVolver, ctk.CTkFrame):
 
     def __init__(self, parent, usuario_actual, on_back=None):
         super().__init__(parent)
@@ -18,14 +22,19 @@ class AlquileresScreen(ctk.CTkFrame):
         self.usuario_actual = usuario_actual
         self.on_back = on_back
         self._alquiler_actual_id = None
+        self._tareas = EjecutorTareas(self)
+        self._enlace = EnlaceTabla(self._tareas, self._leer_alquileres)
+
+        # Las consultas arrancan antes de armar la UI; combos y tabla se
+        # completan cuando llegan los datos
+        self._cargar_clientes()
+        self._cargar_alquileres()
 
         # Configurar colores del Treeview para que no desentone
         self._configurar_estilos_treeview()
         
         self._construir_ui()
-        self._cargar_clientes()
         self._cargar_vehiculos_disponibles()
-        self._cargar_alquileres()
 
     def _configurar_estilos_treeview(self):
         """
@@ -116,6 +125,8 @@ class AlquileresScreen(ctk.CTkFrame):
         self.date_fin.grid(row=1, column=1, padx=5, pady=5)
         self.date_inicio.set_date(date.today())
         self.date_fin.set_date(date.today())
+        self.date_inicio.bind("<<DateEntrySelected>>", self._cargar_vehiculos_disponibles)
+        self.date_fin.bind("<<DateEntrySelected>>", self._cargar_vehiculos_disponibles)
 
         # Botón Registrar (Verde o Azul fuerte)
         ctk.CTkButton(form_frame, text="Registrar Alquiler", height=40,
@@ -129,9 +140,9 @@ class AlquileresScreen(ctk.CTkFrame):
         tabla_container.grid_rowconfigure(0, weight=1)
         tabla_container.grid_columnconfigure(0, weight=1)
 
-        # Estructura del Treeview (se mantiene ttk pero con estilo modificado)
+        # Tabla virtual: sólo crea los ítems visibles (ttk con estilo modificado)
         columnas = ("id", "cliente", "vehiculo", "inicio", "fin", "estado", "total")
-        self.tree = ttk.Treeview(tabla_container, columns=columnas, show="headings", selectmode="browse")
+        self.tree = TablaVirtual(tabla_container, columns=columnas)
 
         headers = ["ID", "Cliente", "Vehículo", "Inicio", "Fin", "Estado", "Total $"]
         for col, texto in zip(columnas, headers):
@@ -147,11 +158,7 @@ class AlquileresScreen(ctk.CTkFrame):
         self.tree.column("total", width=80, anchor="e")
 
         self.tree.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-        # Scrollbar vertical moderna
-        scroll_y = ctk.CTkScrollbar(tabla_container, orientation="vertical", command=self.tree.yview)
-        scroll_y.grid(row=0, column=1, sticky="ns", pady=10, padx=(0,5))
-        self.tree.configure(yscrollcommand=scroll_y.set)
+        self._enlace.enlazar(self.tree)
         
         # Botón Cerrar Alquiler (Abajo de la tabla)
         ctk.CTkButton(tabla_container, text="Cerrar Alquiler Seleccionado", 
@@ -160,13 +167,20 @@ class AlquileresScreen(ctk.CTkFrame):
 
         self.tree.bind("<<TreeviewSelect>>", self._on_select)
 
-    def _cargar_clientes(self):
-        try:
-            clientes = ClienteRepository.listar()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudieron cargar los clientes.\n{e}")
-            clientes = []
+    def recargar(self):
+        self._cargar_clientes()
+        self._cargar_vehiculos_disponibles()
+        self._cargar_alquileres()
 
+    def _cargar_clientes(self):
+        self._tareas.ejecutar(
+            lambda tarea: ClienteRepository.listar(),
+            al_terminar=self._mostrar_clientes,
+            al_error=lambda e: messagebox.showerror("Error", f"No se pudieron cargar los clientes.\n{e}"),
+            clave="clientes",
+        )
+
+    def _mostrar_clientes(self, clientes):
         items = []
         for c in clientes:
             if not getattr(c, "activo", True):
@@ -182,30 +196,47 @@ class AlquileresScreen(ctk.CTkFrame):
         self.combo_cliente.configure(values=items)
         if items: self.combo_cliente.set("") # Limpiar selección inicial
 
-    def _cargar_vehiculos_disponibles(self):
-        vehiculos = VehiculoRepository.listar()
+    def _cargar_vehiculos_disponibles(self, event=None):
+        # Vehículos libres para el rango elegido (sin alquileres ni mantenimientos solapados)
+        f_inicio = self.date_inicio.get_date().isoformat()
+        f_fin = self.date_fin.get_date().isoformat()
+        self._tareas.ejecutar(
+            lambda tarea: VehiculoService.buscar_disponibles(f_inicio, f_fin),
+            al_terminar=self._mostrar_vehiculos_disponibles,
+            clave="vehiculos",
+        )
+
+    def _mostrar_vehiculos_disponibles(self, resultado):
+        ok, vehiculos = resultado
+        if not ok:
+            vehiculos = []
+
         disponibles = []
         for v in vehiculos:
             estado = getattr(v, "estado", "DISPONIBLE")
-            if estado == "DISPONIBLE" and v.activo:
-                disponibles.append(f"{v.id_vehiculo} - {v.patente} ({v.marca} {v.modelo})")
+            if estado == "DISPONIBLE":
+                disponibles.append(f"{v.id_vehiculo} - {v.patente} ({v.marca} {v.modelo}) ${v.precio_por_dia:.0f}/día")
 
         self.combo_vehiculo.configure(values=disponibles)
         self.combo_vehiculo.set("")
 
     def _cargar_alquileres(self):
-        # Limpiar tabla vieja
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        ok, alquileres = AlquilerService.listar_alquileres()
+        self._enlace.recargar()
+
+    def _leer_alquileres(self, ids=None):
+        """Corre en un hilo de trabajo: devuelve [(iid, valores)] para la tabla."""
+        if ids is None:
+            ok, alquileres = AlquilerService.listar_alquileres()
+        else:
+            ok, alquileres = AlquilerService.listar_alquileres_por_ids(ids)
         if not ok:
-            return
+            return []
 
-        for a in alquileres:
-            self.tree.insert("", "end", iid=str(a.id_alquiler),
-                values=(a.id_alquiler, a.id_cliente, a.id_vehiculo,
-                        a.fecha_inicio, a.fecha_fin, a.estado, a.total))
+        return [
+            (str(a.id_alquiler), (a.id_alquiler, a.id_cliente, a.id_vehiculo,
+                                  a.fecha_inicio, a.fecha_fin, a.estado, a.total))
+            for a in alquileres
+        ]
 
     def _registrar_alquiler(self):
         cliente_sel = self.combo_cliente.get().strip()
@@ -236,7 +267,7 @@ class AlquileresScreen(ctk.CTkFrame):
 
         messagebox.showinfo("OK", "Alquiler registrado correctamente.")
         self._cargar_vehiculos_disponibles()
-        self._cargar_alquileres()
+        self._enlace.refrescar([r.id_alquiler])
 
     def _on_select(self, event):
         sel = self.tree.selection()
@@ -271,5 +302,5 @@ class AlquileresScreen(ctk.CTkFrame):
         except: pass
 
         messagebox.showinfo("OK", "Alquiler cerrado correctamente.")
-        self._cargar_alquileres()
+        self._enlace.refrescar([r.id_alquiler])
         self._cargar_vehiculos_disponibles()
\ No newline at end of file
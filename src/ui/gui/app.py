@@ -1,18 +1,15 @@
+import importlib
+from collections import OrderedDict
+
 import customtkinter as ctk
 from tkinter import ttk
 
-# Importamos las pantallas (asegúrate de que los nombres de archivo coincidan)
+from src.config.settings import PANTALLAS_EN_CACHE_MAX
+
+# Home y Login se importan de entrada; el resto de las pantallas (y lo que
+# arrastran: tkcalendar, numpy, matplotlib) recién al abrirlas, ver _PANTALLAS.
 from src.ui.gui.home_screen import HomeScreen
 from src.ui.gui.login_screen import LoginScreen
-from src.ui.gui.dashboard_screen import DashboardScreen
-
-from src.ui.gui.clientes_screen import ClientesScreen
-from src.ui.gui.empleados_screen import EmpleadosScreen
-from src.ui.gui.vehiculos_screen import VehiculosScreen
-from src.ui.gui.alquileres_screen import AlquileresScreen
-from src.ui.gui.incidentes_screen import IncidentesScreen
-from src.ui.gui.mantenimientos_screen import MantenimientosScreen
-from src.ui.gui.reportes_screen import ReportesScreen
 
 # Importamos los servicios
 from src.services.cliente_service import ClienteService
@@ -23,6 +20,24 @@ from src.services.empleado_service import EmpleadoService
 ctk.set_appearance_mode("System")  # Opciones: "System" (default), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Opciones: "blue" (default), "green", "dark-blue"
 
+# nombre -> (módulo, clase) de las pantallas que se cargan a demanda
+_PANTALLAS = {
+    "dashboard": ("src.ui.gui.dashboard_screen", "DashboardScreen"),
+    "clientes": ("src.ui.gui.clientes_screen", "ClientesScreen"),
+    "empleados": ("src.ui.gui.empleados_screen", "EmpleadosScreen"),
+    "vehiculos": ("src.ui.gui.vehiculos_screen", "VehiculosScreen"),
+    "alquileres": ("src.ui.gui.alquileres_screen", "AlquileresScreen"),
+    "incidentes": ("src.ui.gui.incidentes_screen", "IncidentesScreen"),
+    "mantenimientos": ("src.ui.gui.mantenimientos_screen", "MantenimientosScreen"),
+    "reportes": ("src.ui.gui.reportes_screen", "ReportesScreen"),
+}
+
+
+def _clase_pantalla(nombre):
+    modulo, clase = _PANTALLAS[nombre]
+    return getattr(importlib.import_module(modulo), clase)
+
+
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -45,17 +60,63 @@ class App(ctk.CTk):
         self.container.pack(fill="both", expand=True)
 
         self._frame_actual = None
+        # Pantallas ya construidas, de la menos a la más recientemente usada
+        self._pantallas = OrderedDict()
         
         # Iniciar en la pantalla Home
         self.mostrar_home()
 
     def _cambiar_frame(self, nuevo_frame):
-        """Destruye el frame actual y muestra el nuevo."""
-        if self._frame_actual is not None:
-            self._frame_actual.destroy()
+        """Oculta (o destruye, si no está en caché) el frame actual y muestra el nuevo."""
+        self._ocultar_actual()
         self._frame_actual = nuevo_frame
         self._frame_actual.pack(fill="both", expand=True)
 
+    def _mostrar_pantalla(self, nombre, crear):
+        """
+        Muestra la pantalla `nombre`, reutilizándola si sigue en la caché.
+        La primera vez importa su módulo y la arma con crear(Clase). Se
+        conservan hasta PANTALLAS_EN_CACHE_MAX; la usada hace más tiempo se
+        destruye.
+        """
+        pantalla = self._pantallas.get(nombre)
+        if pantalla is not None and pantalla is self._frame_actual:
+            return
+
+        self._ocultar_actual()
+        if pantalla is None:
+            pantalla = crear(_clase_pantalla(nombre))
+            self._pantallas[nombre] = pantalla
+            while len(self._pantallas) > PANTALLAS_EN_CACHE_MAX:
+                _, vieja = self._pantallas.popitem(last=False)
+                vieja.destroy()
+        else:
+            self._pantallas.move_to_end(nombre)
+            if hasattr(pantalla, "on_show"):
+                pantalla.on_show()
+
+        self._frame_actual = pantalla
+        pantalla.pack(fill="both", expand=True)
+
+    def _ocultar_actual(self):
+        actual = self._frame_actual
+        self._frame_actual = None
+        if actual is None:
+            return
+        if actual in self._pantallas.values():
+            actual.pack_forget()
+            if hasattr(actual, "on_hide"):
+                actual.on_hide()
+        else:
+            actual.destroy()
+
+    def _vaciar_pantallas(self):
+        """Destruye todas las pantallas guardadas (p. ej. al cerrar sesión)."""
+        self._ocultar_actual()
+        for pantalla in self._pantallas.values():
+            pantalla.destroy()
+        self._pantallas.clear()
+
     # ------------------------------------------------------------------
     # MÉTODOS DE NAVEGACIÓN (Lógica intacta)
     # ------------------------------------------------------------------
@@ -80,7 +141,7 @@ class App(ctk.CTk):
         self.mostrar_dashboard()
 
     def mostrar_dashboard(self):
-        dashboard = DashboardScreen(
+        self._mostrar_pantalla("dashboard", lambda Pantalla: Pantalla(
             parent=self.container,
             usuario=self._usuario_logueado,
             on_logout=self._on_logout,
@@ -91,67 +152,60 @@ class App(ctk.CTk):
             on_open_vehiculos=self.mostrar_vehiculos,
             on_open_empleados=self.mostrar_empleados,
             on_open_reportes=self.mostrar_reportes,
-        )
-        self._cambiar_frame(dashboard)
+        ))
 
     def _on_logout(self):
         self._usuario_logueado = None
+        self._vaciar_pantallas()
         self.mostrar_home()
 
     # --- Pantallas Específicas ---
 
     def mostrar_clientes(self):
-        pantalla = ClientesScreen(
+        self._mostrar_pantalla("clientes", lambda Pantalla: Pantalla(
             parent=self.container,
             cliente_service=self._cliente_service,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_empleados(self):
-        pantalla = EmpleadosScreen(
+        self._mostrar_pantalla("empleados", lambda Pantalla: Pantalla(
             parent=self.container,
             empleado_service=self._empleado_service,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_vehiculos(self):
-        pantalla = VehiculosScreen(
+        self._mostrar_pantalla("vehiculos", lambda Pantalla: Pantalla(
             parent=self.container,
             usuario_actual=self._usuario_logueado,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_alquileres(self):
-        pantalla = AlquileresScreen(
+        self._mostrar_pantalla("alquileres", lambda Pantalla: Pantalla(
             parent=self.container,
             usuario_actual=self._usuario_logueado,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_incidentes(self):
-        pantalla = IncidentesScreen(
+        self._mostrar_pantalla("incidentes", lambda Pantalla: Pantalla(
             parent=self.container,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_mantenimientos(self):
-        pantalla = MantenimientosScreen(
+        self._mostrar_pantalla("mantenimientos", lambda Pantalla: Pantalla(
             parent=self.container,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
     def mostrar_reportes(self):
-        pantalla = ReportesScreen(
+        self._mostrar_pantalla("reportes", lambda Pantalla: Pantalla(
             parent=self.container,
             on_back=self.mostrar_dashboard
-        )
-        self._cambiar_frame(pantalla)
+        ))
 
 if __name__ == "__main__":
     app = App()
@@ -2,7 +2,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import customtkinter as ctk
 
-class ClientesScreen(ctk.CTkFrame):
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
+from src.ui.gui.tabla_virtual import TablaVirtual
+from src.ui.gui.enlace_tabla import EnlaceTabla
+
+class ClientesScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de gestión de clientes (Versión Modernizada).
     """
@@ -16,10 +21,16 @@ class ClientesScreen(ctk.CTkFrame):
         # Datos demo por si no hay servicio
         self._clientes_demo = []
         self._next_demo_id = 1
+        self._tareas = EjecutorTareas(self)
+        self._enlace = EnlaceTabla(
+            self._tareas, self._leer_clientes,
+            al_error=lambda e: messagebox.showerror("Error", f"No se pudieron cargar los clientes.\n{e}"),
+        )
 
+        # La consulta arranca antes de armar la UI; la tabla se llena al llegar
+        self._cargar_clientes_en_tabla()
         self._configurar_estilos_treeview()
         self._construir_ui()
-        self._cargar_clientes_en_tabla()
 
     def _configurar_estilos_treeview(self):
         """Aplica estilo oscuro a la tabla estándar de Tkinter."""
@@ -125,7 +136,7 @@ class ClientesScreen(ctk.CTkFrame):
         tabla_container.grid_rowconfigure(0, weight=1)
 
         columnas = ("id", "nombre", "apellido", "dni", "email", "telefono", "activo")
-        self.tree = ttk.Treeview(tabla_container, columns=columnas, show="headings", selectmode="browse")
+        self.tree = TablaVirtual(tabla_container, columns=columnas)
 
         self.tree.heading("id", text="ID")
         self.tree.heading("nombre", text="Nombre")
@@ -145,11 +156,7 @@ class ClientesScreen(ctk.CTkFrame):
         self.tree.column("activo", width=60, anchor="center")
 
         self.tree.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-        # Scrollbar
-        scroll_y = ctk.CTkScrollbar(tabla_container, command=self.tree.yview)
-        scroll_y.grid(row=0, column=1, sticky="ns", pady=10, padx=(0, 5))
-        self.tree.configure(yscrollcommand=scroll_y.set)
+        self._enlace.enlazar(self.tree)
 
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
 
@@ -176,19 +183,22 @@ class ClientesScreen(ctk.CTkFrame):
         
         self.entry_nombre.focus_set()
 
+    def recargar(self):
+        self._cargar_clientes_en_tabla()
+
     def _cargar_clientes_en_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if self.cliente_service is not None:
-            try:
-                clientes = self.cliente_service.listar_clientes()
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudieron cargar los clientes.\n{e}")
-                return
-        else:
+        self._enlace.recargar()
+
+    def _leer_clientes(self, ids=None):
+        """Corre en un hilo de trabajo: devuelve [(iid, valores)] para la tabla."""
+        if self.cliente_service is None:
             clientes = self._clientes_demo
+        elif ids is None:
+            clientes = self.cliente_service.listar_clientes()
+        else:
+            clientes = self.cliente_service.listar_clientes_por_ids(ids)
 
+        filas = []
         for c in clientes:
             # Manejo híbrido objeto/diccionario por si usas modo demo
             if isinstance(c, dict):
@@ -203,9 +213,10 @@ class ClientesScreen(ctk.CTkFrame):
                 tel = getattr(c, "telefono", "")
                 activo = getattr(c, "activo", True)
 
-            self.tree.insert("", "end", iid=str(cid), values=(
+            filas.append((str(cid), (
                 cid, nombre, apellido, dni, email, tel, "Sí" if activo else "No"
-            ))
+            )))
+        return filas
 
     def _on_tree_select(self, event):
         selec = self.tree.selection()
@@ -251,22 +262,22 @@ class ClientesScreen(ctk.CTkFrame):
         try:
             if self.cliente_service:
                 if self._cliente_actual_id is None:
-                    self.cliente_service.crear_cliente(
+                    cliente = self.cliente_service.crear_cliente(
                         nombre=f"{datos['nombre']} {datos['apellido']}", # Tu lógica unía nombres
                         dni=datos["dni"], email=datos["email"], telefono=datos["telefono"]
                     )
                 else:
-                    self.cliente_service.modificar_cliente(
+                    cliente = self.cliente_service.modificar_cliente(
                         cliente_id=self._cliente_actual_id,
                         nombre=f"{datos['nombre']} {datos['apellido']}",
                         dni=datos["dni"], email=datos["email"], telefono=datos["telefono"],
                         activo=datos["activo"]
                     )
+                self._enlace.refrescar([cliente.id])
             else:
                 # Modo demo...
                 pass
 
-            self._cargar_clientes_en_tabla()
             self._limpiar_formulario()
             messagebox.showinfo("OK", "Cliente guardado correctamente.")
         except Exception as e:
@@ -281,8 +292,8 @@ class ClientesScreen(ctk.CTkFrame):
 
         try:
             if self.cliente_service:
-                self.cliente_service.desactivar_cliente(self._cliente_actual_id)
-            self._cargar_clientes_en_tabla()
+                cliente = self.cliente_service.desactivar_cliente(self._cliente_actual_id)
+                self._enlace.refrescar([cliente.id])
             self._limpiar_formulario()
             messagebox.showinfo("OK", "Cliente desactivado.")
         except Exception as e:
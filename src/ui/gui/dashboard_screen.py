@@ -1,13 +1,13 @@
 import customtkinter as ctk
 from tkinter import ttk
-from datetime import datetime, date
+from datetime import date
 
-from src.repositories.vehiculo_repository import VehiculoRepository
-from src.repositories.alquiler_repository import AlquilerRepository
-from src.repositories.mantenimiento_repository import MantenimientoRepository
+from src.repositories.db_connection import generacion_datos
+from src.services.flota_status_service import FlotaStatusService
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
 
 
-class DashboardScreen(ctk.CTkFrame):
+class DashboardScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Dashboard moderno con indicadores y tarjetas de menú.
     """
@@ -38,9 +38,19 @@ class DashboardScreen(ctk.CTkFrame):
             "Empleados": on_open_empleados,
             "Reportes": on_open_reportes,
         }
+        self._valores_kpi = {}      # clave del indicador -> CTkLabel con el valor
 
         self._construir_ui()
 
+    def version_datos(self):
+        # Los indicadores son "de hoy": también cambian al pasar la medianoche
+        return generacion_datos(), date.today()
+
+    def recargar(self):
+        data = self._obtener_indicadores()
+        for clave, label in self._valores_kpi.items():
+            label.configure(text=str(data[clave]))
+
     def _construir_ui(self):
         # Usamos grid principal
         self.grid_rowconfigure(1, weight=1) # El cuerpo se expande
@@ -115,12 +125,15 @@ class DashboardScreen(ctk.CTkFrame):
         for i in range(4): container.grid_columnconfigure(i, weight=1)
 
         # Crear las 4 tarjetas
-        self._crear_tarjeta_kpi(container, 0, "Disponibles", data["veh_disp"], "#2cc985") # Verde
-        self._crear_tarjeta_kpi(container, 1, "Alquilados", data["alq_abiertos"], "#f39c12") # Naranja
-        self._crear_tarjeta_kpi(container, 2, "Mantenimiento", data["veh_mant"], "#e74c3c") # Rojo
-        self._crear_tarjeta_kpi(container, 3, "Total Flota", data["veh_total"], "#3498db") # Azul
+        self._valores_kpi = {
+            "veh_disp": self._crear_tarjeta_kpi(container, 0, "Disponibles", data["veh_disp"], "#2cc985"), # Verde
+            "veh_alq": self._crear_tarjeta_kpi(container, 1, "Alquilados", data["veh_alq"], "#f39c12"), # Naranja
+            "veh_mant": self._crear_tarjeta_kpi(container, 2, "Mantenimiento", data["veh_mant"], "#e74c3c"), # Rojo
+            "veh_total": self._crear_tarjeta_kpi(container, 3, "Total Flota", data["veh_total"], "#3498db"), # Azul
+        }
 
     def _crear_tarjeta_kpi(self, parent, col, titulo, valor, color_texto):
+        """Crea la tarjeta y devuelve el label del valor (para actualizarlo)."""
         card = ctk.CTkFrame(parent, corner_radius=15)
         card.grid(row=0, column=col, padx=10, pady=5, sticky="ew")
         
@@ -128,59 +141,27 @@ class DashboardScreen(ctk.CTkFrame):
         ctk.CTkLabel(card, text=titulo, font=ctk.CTkFont(size=14)).pack(pady=(15, 0))
         
         # Valor grande en color
-        ctk.CTkLabel(
+        label_valor = ctk.CTkLabel(
             card, 
             text=str(valor), 
             font=ctk.CTkFont(size=36, weight="bold"),
             text_color=color_texto
-        ).pack(pady=(0, 15))
+        )
+        label_valor.pack(pady=(0, 15))
+        return label_valor
 
     # ----------------------------------------------------------------------
-    # LÓGICA DE DATOS (Sin cambios, solo adaptada al contexto)
+    # LÓGICA DE DATOS
     # ----------------------------------------------------------------------
-    def _parsear_fecha(self, s):
-        try:
-            return datetime.strptime(s, "%Y-%m-%d").date()
-        except Exception:
-            return None
-
     def _obtener_indicadores(self):
-        hoy = date.today()
-
-        vehiculos = VehiculoRepository.listar()
-        alquileres = AlquilerRepository.listar()
-        mantenimientos = MantenimientoRepository.listar()
-
-        # --- vehículos bloqueados por alquiler ABIERTO hoy ---
-        vehiculos_ocupados = set()
-        for a in alquileres:
-            if a.estado != "ABIERTO":
-                continue
-            fi = self._parsear_fecha(a.fecha_inicio)
-            ff = self._parsear_fecha(a.fecha_fin)
-            if fi and ff and fi <= hoy <= ff:
-                vehiculos_ocupados.add(a.id_vehiculo)
-
-        # --- vehículos bloqueados por mantenimiento hoy ---
-        vehiculos_en_mant = set()
-        for m in mantenimientos:
-            fi = self._parsear_fecha(m.fecha_inicio)
-            ff = self._parsear_fecha(m.fecha_fin)
-            if fi and ff and fi <= hoy <= ff:
-                vehiculos_en_mant.add(m.id_vehiculo)
-
-        bloqueados = vehiculos_ocupados | vehiculos_en_mant
-
-        veh_disp = len([v for v in vehiculos if v.activo and v.id_vehiculo not in bloqueados])
-        alq_abiertos = len([a for a in alquileres if a.estado == "ABIERTO"])
-        veh_mant = len(vehiculos_en_mant)
-        veh_total = len(vehiculos)
+        estado = FlotaStatusService().estado_en(date.today().isoformat())
+        resumen = estado.resumen
 
         return {
-            "veh_disp": veh_disp,
-            "alq_abiertos": alq_abiertos,
-            "veh_mant": veh_mant,
-            "veh_total": veh_total,
+            "veh_disp": resumen["disponibles"],
+            "veh_alq": resumen["alquilados"],
+            "veh_mant": resumen["mantenimiento"],
+            "veh_total": len(estado.detalle),
         }
 
     # ----------------------------------------------------------------------
@@ -2,7 +2,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import customtkinter as ctk
 
-class EmpleadosScreen(ctk.CTkFrame):
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
+from src.ui.gui.tabla_virtual import TablaVirtual
+from src.ui.gui.enlace_tabla import EnlaceTabla
+
+class EmpleadosScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de gestión de empleados (Versión Modernizada).
     """
@@ -13,10 +18,16 @@ class EmpleadosScreen(ctk.CTkFrame):
         self.on_back = on_back
 
         self._empleado_actual_id = None
+        self._tareas = EjecutorTareas(self)
+        self._enlace = EnlaceTabla(
+            self._tareas, self._leer_empleados,
+            al_error=lambda e: messagebox.showerror("Error", str(e)),
+        )
 
+        # La consulta arranca antes de armar la UI; la tabla se llena al llegar
+        self._cargar_empleados_en_tabla()
         self._configurar_estilos_treeview()
         self._construir_ui()
-        self._cargar_empleados_en_tabla()
 
     def _configurar_estilos_treeview(self):
         style = ttk.Style()
@@ -129,7 +140,7 @@ class EmpleadosScreen(ctk.CTkFrame):
         tabla_container.grid_rowconfigure(0, weight=1)
 
         columnas = ("id", "nombre", "apellido", "usuario", "rol", "email", "activo")
-        self.tree = ttk.Treeview(tabla_container, columns=columnas, show="headings", selectmode="browse")
+        self.tree = TablaVirtual(tabla_container, columns=columnas)
 
         self.tree.heading("id", text="ID")
         self.tree.heading("nombre", text="Nombre")
@@ -149,11 +160,7 @@ class EmpleadosScreen(ctk.CTkFrame):
         self.tree.column("activo", width=60, anchor="center")
 
         self.tree.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-        # Scrollbar
-        scroll_y = ctk.CTkScrollbar(tabla_container, command=self.tree.yview)
-        scroll_y.grid(row=0, column=1, sticky="ns", pady=10, padx=(0, 5))
-        self.tree.configure(yscrollcommand=scroll_y.set)
+        self._enlace.enlazar(self.tree)
 
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
 
@@ -180,21 +187,29 @@ class EmpleadosScreen(ctk.CTkFrame):
         
         self.entry_nombre.focus_set()
 
+    def recargar(self):
+        self._cargar_empleados_en_tabla()
+
     def _cargar_empleados_en_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._enlace.recargar()
 
-        ok, res = self.empleado_service.listar_empleados()
+    def _leer_empleados(self, ids=None):
+        """Corre en un hilo de trabajo: devuelve [(iid, valores)] para la tabla."""
+        if ids is None:
+            ok, res = self.empleado_service.listar_empleados()
+        else:
+            ok, res = self.empleado_service.listar_empleados_por_ids(ids)
         if not ok:
-            messagebox.showerror("Error", res)
-            return
+            raise Exception(res)
 
-        for emp in res:
-            self.tree.insert("", "end", iid=str(emp.id_empleado), values=(
-                emp.id_empleado, emp.nombre, emp.apellido, 
-                emp.usuario, emp.rol, emp.email, 
+        return [
+            (str(emp.id_empleado), (
+                emp.id_empleado, emp.nombre, emp.apellido,
+                emp.usuario, emp.rol, emp.email,
                 "Sí" if emp.activo else "No"
             ))
+            for emp in res
+        ]
 
     def _on_tree_select(self, event):
         selec = self.tree.selection()
@@ -261,7 +276,7 @@ class EmpleadosScreen(ctk.CTkFrame):
             messagebox.showerror("Error", res)
             return
 
-        self._cargar_empleados_en_tabla()
+        self._enlace.refrescar([res.id_empleado])
         self._limpiar_formulario()
         messagebox.showinfo("OK", "Empleado guardado correctamente.")
 
@@ -277,6 +292,6 @@ class EmpleadosScreen(ctk.CTkFrame):
             messagebox.showerror("Error", res)
             return
 
-        self._cargar_empleados_en_tabla()
+        self._enlace.refrescar([res.id_empleado])
         self._limpiar_formulario()
         messagebox.showinfo("OK", "Empleado desactivado.")
\ No newline at end of file
@@ -0,0 +1,70 @@
+class EnlaceTabla:
+    """
+    Une una TablaVirtual con la función que lee sus filas.
+
+    `leer(ids)` corre en un hilo del EjecutorTareas y devuelve
+    [(iid, valores)]: con ids=None, todas las filas de la tabla; con una
+    lista de ids, sólo las de esas entidades que deban mostrarse (las que
+    falten se quitan de la tabla).
+
+    recargar() reemplaza todo el contenido; refrescar(ids), pensado para
+    después de guardar, vuelve a leer sólo las entidades que devolvió el
+    servicio y actualiza, agrega o quita esos iids conservando el
+    desplazamiento y la selección.
+    """
+
+    def __init__(self, tareas, leer, al_error=None, clave="tabla"):
+        self.tabla = None
+        self._tareas = tareas
+        self._leer = leer
+        self._al_error = al_error
+        self._clave = clave
+        self._recargando = False
+        self._ids_pendientes = set()
+
+    def enlazar(self, tabla):
+        """Asigna la tabla (se puede llamar después de pedir la primera carga)."""
+        self.tabla = tabla
+
+    def recargar(self):
+        self._recargando = True
+        self._ids_pendientes.clear()
+        self._tareas.ejecutar(
+            lambda tarea: self._leer(None),
+            al_terminar=self._cargar,
+            al_error=self._error,
+            clave=self._clave,
+        )
+
+    def refrescar(self, ids):
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return
+        if self._recargando:
+            # La carga completa en curso pudo leer antes del cambio
+            self.recargar()
+            return
+
+        # Una lectura nueva cancela la anterior, así que incluye sus ids
+        self._ids_pendientes.update(ids)
+        pedidos = tuple(self._ids_pendientes)
+        self._tareas.ejecutar(
+            lambda tarea: self._leer(list(pedidos)),
+            al_terminar=lambda filas: self._aplicar(filas, pedidos),
+            al_error=self._error,
+            clave=(self._clave, "filas"),
+        )
+
+    def _cargar(self, filas):
+        self._recargando = False
+        self.tabla.cargar(filas)
+
+    def _aplicar(self, filas, ids):
+        self._ids_pendientes.difference_update(ids)
+        self.tabla.aplicar_cambios(filas, ids)
+
+    def _error(self, error):
+        self._recargando = False
+        self._ids_pendientes.clear()
+        if self._al_error is not None:
+            self._al_error(error)
@@ -193,10 +193,7 @@ class HomeScreen(ctk.CTkFrame):
         self.hero.unbind_all("<MouseWheel>")
 
     def _draw_vehiculos(self):
-        from src.repositories.vehiculo_repository import VehiculoRepository
-        from src.repositories.mantenimiento_repository import MantenimientoRepository
-        from src.repositories.alquiler_repository import AlquilerRepository
-        from datetime import date, datetime
+        from src.services.flota_status_service import FlotaStatusService
 
         self.current_section = "vehiculos"
         width, height = self._draw_background("vehiculos")
@@ -205,29 +202,7 @@ class HomeScreen(ctk.CTkFrame):
         # Capa oscura para resaltar tarjetas
         self.hero.create_rectangle(0, 0, width, height, fill="black", stipple="gray12", tags=("bg_dim",))
 
-        hoy = date.today()
-        vehiculos = VehiculoRepository.listar()
-        alquileres = AlquilerRepository.listar()
-        mantenimientos = MantenimientoRepository.listar()
-
-        def parse_f(s):
-            try: return datetime.strptime(s, "%Y-%m-%d").date()
-            except: return None
-
-        ocupados = set()
-        for a in alquileres:
-            if a.estado == "ABIERTO":
-                fi, ff = parse_f(a.fecha_inicio), parse_f(a.fecha_fin)
-                if fi and ff and fi <= hoy <= ff:
-                    ocupados.add(a.id_vehiculo)
-
-        en_mantenimiento = set()
-        for m in mantenimientos:
-            fi, ff = parse_f(m.fecha_inicio), parse_f(m.fecha_fin)
-            if fi and ff and fi <= hoy <= ff:
-                en_mantenimiento.add(m.id_vehiculo)
-
-        disponibles = [v for v in vehiculos if v.activo and v.id_vehiculo not in (ocupados | en_mantenimiento)]
+        disponibles = FlotaStatusService().estado_en().disponibles()
 
         self.hero.create_text(
             width // 2 + 2, 72,
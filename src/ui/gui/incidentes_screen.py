@@ -4,11 +4,13 @@ import customtkinter as ctk
 
 from src.services.incidente_service import IncidenteService
 from src.repositories.alquiler_repository import AlquilerRepository
-from src.repositories.cliente_repository import ClienteRepository
-from src.repositories.vehiculo_repository import VehiculoRepository
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
+from src.ui.gui.tabla_virtual import TablaVirtual
+from src.ui.gui.enlace_tabla import EnlaceTabla
 
 
-class IncidentesScreen(ctk.CTkFrame):
+class IncidentesScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de gestión de incidentes (Versión Moderna).
     """
@@ -20,11 +22,15 @@ class IncidentesScreen(ctk.CTkFrame):
         self.on_back = on_back
 
         self._incidente_actual_id = None
+        self._tareas = EjecutorTareas(self)
+        self._enlace = EnlaceTabla(self._tareas, self._leer_incidentes)
 
-        self._configurar_estilos_treeview()
-        self._construir_ui()
+        # Las consultas arrancan antes de armar la UI; combo y tabla se
+        # completan cuando llegan los datos
         self._cargar_alquileres_para_combo()
         self._cargar_incidentes_en_tabla()
+        self._configurar_estilos_treeview()
+        self._construir_ui()
 
     def _configurar_estilos_treeview(self):
         style = ttk.Style()
@@ -131,7 +137,7 @@ class IncidentesScreen(ctk.CTkFrame):
         tabla_container.grid_rowconfigure(0, weight=1)
 
         columnas = ("id", "alquiler", "tipo", "descripcion", "monto", "estado")
-        self.tree = ttk.Treeview(tabla_container, columns=columnas, show="headings", selectmode="browse")
+        self.tree = TablaVirtual(tabla_container, columns=columnas)
 
         headers = {"id": "ID", "alquiler": "Alquiler ID", "tipo": "Tipo", 
                    "descripcion": "Descripción", "monto": "Monto $", "estado": "Estado"}
@@ -148,10 +154,7 @@ class IncidentesScreen(ctk.CTkFrame):
         self.tree.column("estado", width=80, anchor="center")
 
         self.tree.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-        scroll_y = ctk.CTkScrollbar(tabla_container, command=self.tree.yview)
-        scroll_y.grid(row=0, column=1, sticky="ns", pady=10, padx=(0, 5))
-        self.tree.configure(yscrollcommand=scroll_y.set)
+        self._enlace.enlazar(self.tree)
 
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
 
@@ -179,39 +182,51 @@ class IncidentesScreen(ctk.CTkFrame):
         for sel in self.tree.selection():
             self.tree.selection_remove(sel)
 
+    def recargar(self):
+        self._cargar_alquileres_para_combo()
+        self._cargar_incidentes_en_tabla()
+
     def _cargar_alquileres_para_combo(self):
-        try:
-            alquileres = AlquilerRepository.listar()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudieron cargar alquileres.\n{e}")
-            alquileres = []
+        self._tareas.ejecutar(
+            self._leer_alquileres_para_combo,
+            al_terminar=lambda items: self.combo_alquiler.configure(values=items),
+            al_error=lambda e: messagebox.showerror("Error", f"No se pudieron cargar alquileres.\n{e}"),
+            clave="combo",
+        )
+
+    def _leer_alquileres_para_combo(self, tarea):
+        # Una sola consulta con JOIN en lugar de buscar cliente y vehículo por alquiler
+        filas = AlquilerRepository.listar_con_etiquetas()
 
         items = []
-        for a in alquileres:
-            cliente = ClienteRepository.obtener_por_id(a.id_cliente)
-            txt_cli = f"{getattr(cliente, 'dni', '')} {getattr(cliente, 'apellido', '')}" if cliente else "?"
-            
-            vehiculo = VehiculoRepository.obtener_por_id(a.id_vehiculo)
-            txt_veh = f"{getattr(vehiculo, 'patente', '')}" if vehiculo else "?"
+        for fila in filas:
+            a = fila["alquiler"]
+            txt_cli = f"{fila['cliente_dni'] or ''} {fila['cliente_apellido'] or ''}" if fila["cliente_dni"] is not None else "?"
+            txt_veh = f"{fila['patente'] or ''}" if fila["patente"] is not None else "?"
 
             # Formato para combo
             etiqueta = f"{a.id_alquiler} - {txt_cli} - {txt_veh}"
             items.append(etiqueta)
-
-        self.combo_alquiler.configure(values=items)
+        return items
 
     def _cargar_incidentes_en_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        ok, incidentes = IncidenteService.listar_incidentes()
-        if not ok: return
-
-        for inc in incidentes:
-            self.tree.insert("", "end", iid=str(inc.id_incidente), values=(
-                inc.id_incidente, inc.id_alquiler, inc.tipo, 
+        self._enlace.recargar()
+
+    def _leer_incidentes(self, ids=None):
+        """Corre en un hilo de trabajo: devuelve [(iid, valores)] para la tabla."""
+        if ids is None:
+            ok, incidentes = IncidenteService.listar_incidentes()
+        else:
+            ok, incidentes = IncidenteService.listar_incidentes_por_ids(ids)
+        if not ok: return []
+
+        return [
+            (str(inc.id_incidente), (
+                inc.id_incidente, inc.id_alquiler, inc.tipo,
                 inc.descripcion, f"{inc.monto:.2f}", inc.estado
             ))
+            for inc in incidentes
+        ]
 
     def _on_tree_select(self, event):
         sel = self.tree.selection()
@@ -285,7 +300,7 @@ class IncidentesScreen(ctk.CTkFrame):
 
         messagebox.showinfo("OK", "Incidente registrado.")
         self._limpiar_formulario()
-        self._cargar_incidentes_en_tabla()
+        self._enlace.refrescar([r.id_incidente])
 
     def _marcar_pagado(self):
         if self._incidente_actual_id is None:
@@ -301,4 +316,4 @@ class IncidentesScreen(ctk.CTkFrame):
 
         messagebox.showinfo("OK", "Incidente pagado.")
         self._limpiar_formulario()
-        self._cargar_incidentes_en_tabla()
\ No newline at end of file
+        self._enlace.refrescar([r.id_incidente])
\ No newline at end of file
@@ -8,9 +8,11 @@ from tkcalendar import DateEntry
 
 from src.services.mantenimiento_service import MantenimientoService
 from src.repositories.vehiculo_repository import VehiculoRepository
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
 
 
-class MantenimientosScreen(ctk.CTkFrame):
+class MantenimientosScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de gestión de mantenimientos (Versión Moderna).
     """
@@ -20,11 +22,14 @@ class MantenimientosScreen(ctk.CTkFrame):
         self.on_back = on_back
 
         self._mantenimiento_actual_id = None
+        self._tareas = EjecutorTareas(self)
 
-        self._configurar_estilos_treeview()
-        self._construir_ui()
+        # Las consultas arrancan antes de armar la UI; combo y tabla se
+        # completan cuando llegan los datos
         self._cargar_vehiculos_para_combo()
         self._cargar_mantenimientos_en_tabla()
+        self._configurar_estilos_treeview()
+        self._construir_ui()
 
     def _configurar_estilos_treeview(self):
         style = ttk.Style()
@@ -170,13 +175,19 @@ class MantenimientosScreen(ctk.CTkFrame):
         for sel in self.tree.selection():
             self.tree.selection_remove(sel)
 
-    def _cargar_vehiculos_para_combo(self):
-        try:
-            vehiculos = VehiculoRepository.listar()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudieron cargar vehículos.\n{e}")
-            vehiculos = []
+    def recargar(self):
+        self._cargar_vehiculos_para_combo()
+        self._cargar_mantenimientos_en_tabla()
 
+    def _cargar_vehiculos_para_combo(self):
+        self._tareas.ejecutar(
+            lambda tarea: VehiculoRepository.listar(),
+            al_terminar=self._mostrar_vehiculos_en_combo,
+            al_error=lambda e: messagebox.showerror("Error", f"No se pudieron cargar vehículos.\n{e}"),
+            clave="combo",
+        )
+
+    def _mostrar_vehiculos_en_combo(self, vehiculos):
         items = []
         for v in vehiculos:
             if not v.activo: continue
@@ -187,21 +198,35 @@ class MantenimientosScreen(ctk.CTkFrame):
         self.combo_vehiculo.configure(values=items)
 
     def _cargar_mantenimientos_en_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
+        self._tareas.ejecutar(
+            self._leer_mantenimientos,
+            al_terminar=self._mostrar_mantenimientos,
+            clave="tabla",
+        )
+
+    def _leer_mantenimientos(self, tarea):
+        """Corre en un hilo de trabajo: devuelve (ok, [(iid, valores)] o mensaje)."""
         ok, mantenimientos = MantenimientoService.listar_mantenimientos()
         if not ok:
-            messagebox.showerror("Error", mantenimientos)
-            return
+            return False, mantenimientos
 
+        vehiculos = VehiculoRepository.obtener_por_ids(m.id_vehiculo for m in mantenimientos)
+        filas = []
         for m in mantenimientos:
-            vehiculo = VehiculoRepository.obtener_por_id(m.id_vehiculo)
+            vehiculo = vehiculos.get(m.id_vehiculo)
             txt_veh = f"{vehiculo.patente} ({vehiculo.marca})" if vehiculo else f"ID {m.id_vehiculo}"
 
-            self.tree.insert("", "end", iid=str(m.id_mantenimiento), values=(
+            filas.append((str(m.id_mantenimiento), (
                 m.id_mantenimiento, txt_veh, m.fecha_inicio, m.fecha_fin, m.descripcion
-            ))
+            )))
+        return True, filas
+
+    def _mostrar_mantenimientos(self, resultado):
+        ok, filas = resultado
+        if not ok:
+            messagebox.showerror("Error", filas)
+            return
+        self._tareas.llenar_tabla(self.tree, filas)
 
     def _on_tree_select(self, event):
         sel = self.tree.selection()
@@ -0,0 +1,34 @@
+from src.repositories.db_connection import generacion_datos
+
+
+class RecargaAlVolver:
+    """
+    Mixin para las pantallas que App conserva entre navegaciones.
+
+    App llama a on_hide() al salir de la pantalla y a on_show() al volver.
+    on_show() invoca recargar() sólo si la versión de los datos cambió
+    mientras estaba oculta; si nada cambió, se muestra tal como quedó sin
+    repetir ninguna consulta. Las escrituras hechas desde la propia pantalla
+    ya se reflejaron al guardar, por eso la versión se toma al ocultarla.
+    """
+
+    _version_al_ocultar = None
+
+    def version_datos(self):
+        """Lo que debe cambiar para que valga la pena recargar."""
+        return generacion_datos()
+
+    def recargar(self):
+        """
+        Vuelve a leer los datos que muestra la pantalla. Por defecto no hace
+        nada (pantallas sin datos propios); las que muestran datos lo redefinen.
+        """
+
+    def on_hide(self):
+        self._version_al_ocultar = self.version_datos()
+
+    def on_show(self):
+        if self._version_al_ocultar is None:
+            return
+        if self.version_datos() != self._version_al_ocultar:
+            self.recargar()
@@ -5,23 +5,38 @@ from datetime import date
 # pip install customtkinter tkcalendar matplotlib
 import customtkinter as ctk
 from tkcalendar import DateEntry
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from src.reports import reportes_tablas as rpt
-from src.reports import reportes_graficos as rpt_g
-from src.reports import reportes_export as rpt_x
 from src.services.reporte_service import ReporteService
 from src.repositories.cliente_repository import ClienteRepository
 from src.repositories.vehiculo_repository import VehiculoRepository
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
+from src.ui.gui.tabla_virtual import TablaVirtual
 
 
-class ReportesScreen(ctk.CTkFrame):
+# matplotlib y reportlab se importan recién con el primer gráfico o PDF, y
+# desde el hilo de trabajo: abrir la pantalla no los carga.
+def _graficos():
+    from src.reports import reportes_graficos
+    return reportes_graficos
+
+
+def _pdf():
+    from src.reports import reportes_export
+    return reportes_export
+
+
+class ReportesScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de Reportes (Versión Modernizada).
     """
     def __init__(self, parent, on_back=None):
         super().__init__(parent)
         self.on_back = on_back
+        self._tareas = EjecutorTareas(self)
+        self._tarea_actual = None
+        self._spinner_activo = False
 
         self._configurar_estilos_treeview()
         self._construir_ui()
@@ -131,6 +146,7 @@ class ReportesScreen(ctk.CTkFrame):
         ctk.CTkButton(filtros_frame, text="🏆 Top Vehículos", command=self._grafico_top_vehiculos, **gf_style).pack(fill="x", padx=5, pady=2)
         ctk.CTkButton(filtros_frame, text="👥 Top Clientes", command=self._grafico_top_clientes, **gf_style).pack(fill="x", padx=5, pady=2)
         ctk.CTkButton(filtros_frame, text="🚗 Estado Flota", command=self._grafico_estado_flota, **gf_style).pack(fill="x", padx=5, pady=2)
+        ctk.CTkButton(filtros_frame, text="📈 Ocupación Flota", command=self._grafico_timeline_flota, **gf_style).pack(fill="x", padx=5, pady=2)
 
         # --- Sección PDF ---
         ctk.CTkLabel(filtros_frame, text="Exportar PDF", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=5, pady=(20,5))
@@ -162,23 +178,39 @@ class ReportesScreen(ctk.CTkFrame):
         self.lbl_resumen_3.pack(side="left")
 
         # Tabla
-        self.tree = ttk.Treeview(resultados_frame, columns=("col1"), show="headings", selectmode="browse")
-        self.tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
-        
-        scroll_y = ctk.CTkScrollbar(resultados_frame, command=self.tree.yview)
-        scroll_y.grid(row=1, column=1, sticky="ns", pady=(0, 10), padx=(0,5))
-        self.tree.configure(yscrollcommand=scroll_y.set)
+        self.tree = TablaVirtual(resultados_frame, columns=("col1",))
+        self.tree.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=(0, 10))
+
+        # Progreso del reporte en curso (oculto mientras no haya ninguno)
+        self.progreso_frame = ctk.CTkFrame(resultados_frame, fg_color="transparent")
+        self.progreso_frame.grid(row=2, column=0, columnspan=2, sticky="ew", padx=15, pady=(0, 10))
+
+        self.lbl_spinner = ctk.CTkLabel(self.progreso_frame, text="", width=20)
+        self.lbl_spinner.pack(side="left")
+        self.lbl_progreso = ctk.CTkLabel(self.progreso_frame, text="")
+        self.lbl_progreso.pack(side="left", padx=(5, 15))
+        self.barra_progreso = ctk.CTkProgressBar(self.progreso_frame, mode="indeterminate")
+        self.barra_progreso.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(self.progreso_frame, text="Cancelar", width=80, height=28,
+                      fg_color="#444", hover_color="#333",
+                      command=self._cancelar_tarea).pack(side="left", padx=(15, 0))
+        self.progreso_frame.grid_remove()
 
     # --------------------------------------------------------------
     # Helpers
     # --------------------------------------------------------------
-    def _cargar_clientes_combo(self):
-        try:
-            clientes = ClienteRepository.listar()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error cargando clientes: {e}")
-            clientes = []
+    def recargar(self):
+        self._cargar_clientes_combo()
 
+    def _cargar_clientes_combo(self):
+        self._tareas.ejecutar(
+            lambda tarea: ClienteRepository.listar(),
+            al_terminar=self._mostrar_clientes_combo,
+            al_error=lambda e: messagebox.showerror("Error", f"Error cargando clientes: {e}"),
+            clave="clientes",
+        )
+
+    def _mostrar_clientes_combo(self, clientes):
         items = []
         for c in clientes:
             if getattr(c, "activo", True):
@@ -194,18 +226,16 @@ class ReportesScreen(ctk.CTkFrame):
         self.lbl_resumen_3.configure(text="")
 
     def _configurar_tabla(self, columnas):
-        ids = [c["id"] for c in columnas]
-        self.tree["columns"] = ids
-        for col_id in ids:
-            self.tree.heading(col_id, text="")
-            self.tree.column(col_id, width=80, anchor="center")
+        self.tree.cargar([])
+        self.tree.configurar_columnas([c["id"] for c in columnas])
 
         for c in columnas:
             self.tree.heading(c["id"], text=c.get("text", ""))
             self.tree.column(c["id"], width=c.get("width", 80), anchor=c.get("anchor", "center"))
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _llenar_tabla(self, valores):
+        """Carga las filas del reporte (secuencia de tuplas de valores)."""
+        self.tree.cargar([(str(i), v) for i, v in enumerate(valores)])
 
     def _obtener_rango_fechas(self):
         f_desde = self.date_desde.get_date().isoformat()
@@ -225,11 +255,72 @@ class ReportesScreen(ctk.CTkFrame):
         # Hacerla modal (opcional)
         # win.grab_set()
 
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         canvas = FigureCanvasTkAgg(fig, master=win)
         canvas.draw()
         widget = canvas.get_tk_widget()
         widget.pack(fill="both", expand=True)
 
+    # --------------------------------------------------------------
+    # Ejecución en segundo plano
+    # --------------------------------------------------------------
+    _SPINNER = "◐◓◑◒"
+
+    def _ejecutar(self, trabajo, al_terminar, mensaje="Calculando reporte..."):
+        """
+        Corre trabajo(tarea) en un hilo y luego al_terminar(resultado) en el
+        hilo de Tk. Un pedido nuevo cancela el anterior: su resultado ya no
+        se mostraría.
+        """
+        if self._tarea_actual is not None:
+            self._tarea_actual.cancelar()
+
+        def terminar(resultado):
+            self._ocultar_progreso()
+            al_terminar(resultado)
+
+        def fallar(error):
+            self._ocultar_progreso()
+            messagebox.showerror("Error", f"No se pudo generar el reporte: {error}")
+
+        self._tarea_actual = self._tareas.ejecutar(
+            trabajo, al_terminar=terminar, al_error=fallar, al_progreso=self._mostrar_progreso,
+        )
+        self._mostrar_progreso(mensaje)
+
+    def _mostrar_progreso(self, mensaje, hechos=None, total=None):
+        self.lbl_progreso.configure(text=mensaje)
+        if hechos is not None and total:
+            self.barra_progreso.stop()
+            self.barra_progreso.configure(mode="determinate")
+            self.barra_progreso.set(hechos / total)
+        elif self.barra_progreso.cget("mode") != "indeterminate" or not self._spinner_activo:
+            self.barra_progreso.configure(mode="indeterminate")
+            self.barra_progreso.start()
+
+        self.progreso_frame.grid()
+        if not self._spinner_activo:
+            self._spinner_activo = True
+            self._girar_spinner(0)
+
+    def _girar_spinner(self, paso):
+        if self._tarea_actual is None:
+            self._spinner_activo = False
+            return
+        self.lbl_spinner.configure(text=self._SPINNER[paso % len(self._SPINNER)])
+        self.after(120, self._girar_spinner, paso + 1)
+
+    def _ocultar_progreso(self):
+        self._tarea_actual = None
+        self.barra_progreso.stop()
+        self.progreso_frame.grid_remove()
+
+    def _cancelar_tarea(self):
+        if self._tarea_actual is not None:
+            self._tarea_actual.cancelar()
+            self._ocultar_progreso()
+
     # --------------------------------------------------------------
     # Reportes TABULARES (Lógica Original)
     # --------------------------------------------------------------
@@ -237,7 +328,13 @@ class ReportesScreen(ctk.CTkFrame):
         f_desde, f_hasta = self._obtener_rango_fechas()
         if not f_desde: return
 
-        ok, data = rpt.obtener_resumen_economico(f_desde, f_hasta)
+        self._ejecutar(
+            lambda tarea: rpt.obtener_resumen_economico(f_desde, f_hasta),
+            lambda resultado: self._pintar_resumen_economico(resultado, f_desde, f_hasta),
+        )
+
+    def _pintar_resumen_economico(self, resultado, f_desde, f_hasta):
+        ok, data = resultado
         if not ok: messagebox.showerror("Error", data); return
 
         self._configurar_tabla([
@@ -252,14 +349,19 @@ class ReportesScreen(ctk.CTkFrame):
             ("Incidentes", data["total_incidentes"]),
             ("TOTAL", data["total_general"]),
         ]
-        for concepto, monto in filas:
-            self.tree.insert("", "end", values=(concepto, f"{monto:.2f}"))
+        self._llenar_tabla((concepto, f"{monto:.2f}") for concepto, monto in filas)
 
     def _mostrar_top_vehiculos(self):
         f_desde, f_hasta = self._obtener_rango_fechas()
         if not f_desde: return
 
-        ok, filas = rpt.obtener_top_vehiculos(f_desde, f_hasta, limite=20)
+        self._ejecutar(
+            lambda tarea: rpt.obtener_top_vehiculos(f_desde, f_hasta, limite=20),
+            lambda resultado: self._pintar_top_vehiculos(resultado, f_desde, f_hasta),
+        )
+
+    def _pintar_top_vehiculos(self, resultado, f_desde, f_hasta):
+        ok, filas = resultado
         if not ok: messagebox.showerror("Error", filas); return
 
         self._configurar_tabla([
@@ -270,14 +372,19 @@ class ReportesScreen(ctk.CTkFrame):
         self._limpiar_resumen_labels()
         self.lbl_resumen_1.configure(text=f"Top Vehículos ({f_desde} a {f_hasta})")
 
-        for row in filas:
-            self.tree.insert("", "end", values=(row["vehiculo"], row["cantidad"], f"{row['total']:.2f}"))
+        self._llenar_tabla((row["vehiculo"], row["cantidad"], f"{row['total']:.2f}") for row in filas)
 
     def _mostrar_top_clientes(self):
         f_desde, f_hasta = self._obtener_rango_fechas()
         if not f_desde: return
 
-        ok, filas = rpt.obtener_top_clientes(f_desde, f_hasta, limite=20)
+        self._ejecutar(
+            lambda tarea: rpt.obtener_top_clientes(f_desde, f_hasta, limite=20),
+            self._pintar_top_clientes,
+        )
+
+    def _pintar_top_clientes(self, resultado):
+        ok, filas = resultado
         if not ok: messagebox.showerror("Error", filas); return
 
         self._configurar_tabla([
@@ -289,12 +396,16 @@ class ReportesScreen(ctk.CTkFrame):
         self._limpiar_resumen_labels()
         self.lbl_resumen_1.configure(text="Top Clientes")
 
-        for row in filas:
-            self.tree.insert("", "end", values=(row["cliente"], row["dni"], row["cantidad"], f"{row['total']:.2f}"))
+        self._llenar_tabla(
+            (row["cliente"], row["dni"], row["cantidad"], f"{row['total']:.2f}") for row in filas
+        )
 
     def _mostrar_estado_flota(self):
         hoy = date.today().isoformat()
-        ok, data = rpt.obtener_estado_flota(hoy)
+        self._ejecutar(lambda tarea: rpt.obtener_estado_flota(hoy), self._pintar_estado_flota)
+
+    def _pintar_estado_flota(self, resultado):
+        ok, data = resultado
         if not ok: messagebox.showerror("Error", data); return
 
         self._configurar_tabla([
@@ -307,8 +418,7 @@ class ReportesScreen(ctk.CTkFrame):
         self.lbl_resumen_2.configure(text=f"Alq: {res['alquilados']}")
         self.lbl_resumen_3.configure(text=f"Mant: {res['mantenimiento']}")
 
-        for row in data["detalle"]:
-            self.tree.insert("", "end", values=(row["vehiculo"], row["estado"]))
+        self._llenar_tabla((row["vehiculo"], row["estado"]) for row in data["detalle"])
 
     def _mostrar_alquileres_por_cliente(self):
         sel = self.combo_cliente.get()
@@ -316,7 +426,13 @@ class ReportesScreen(ctk.CTkFrame):
         try: id_cli = int(sel.split(" - ")[0])
         except: return
 
-        ok, alquileres = ReporteService.alquileres_por_cliente(id_cli)
+        self._ejecutar(
+            lambda tarea: ReporteService.alquileres_por_cliente(id_cli),
+            lambda resultado: self._pintar_alquileres_por_cliente(resultado, sel),
+        )
+
+    def _pintar_alquileres_por_cliente(self, resultado, sel):
+        ok, alquileres = resultado
         if not ok: messagebox.showerror("Error", alquileres); return
 
         self._configurar_tabla([
@@ -329,13 +445,15 @@ class ReportesScreen(ctk.CTkFrame):
         self._limpiar_resumen_labels()
         self.lbl_resumen_1.configure(text=f"Historial de {sel.split(' - ')[1]}")
 
-        for a in alquileres:
-            self.tree.insert("", "end", values=(a.id_alquiler, a.fecha_inicio, a.fecha_fin, a.estado, f"{a.total}"))
+        self._llenar_tabla((a.id_alquiler, a.fecha_inicio, a.fecha_fin, a.estado, f"{a.total}") for a in alquileres)
 
     def _mostrar_alquileres_por_mes(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, filas = rpt.obtener_alquileres_por_mes(f_d, f_h)
+        self._ejecutar(lambda tarea: rpt.obtener_alquileres_por_mes(f_d, f_h), self._pintar_alquileres_por_mes)
+
+    def _pintar_alquileres_por_mes(self, resultado):
+        ok, filas = resultado
         if not ok: return
         
         self._configurar_tabla([
@@ -344,13 +462,15 @@ class ReportesScreen(ctk.CTkFrame):
             {"id": "t", "text": "Total", "width": 120, "anchor": "e"},
         ])
         self._limpiar_resumen_labels()
-        for r in filas:
-            self.tree.insert("", "end", values=(r["periodo"], r["cantidad"], f"{r['total']:.2f}"))
+        self._llenar_tabla((r["periodo"], r["cantidad"], f"{r['total']:.2f}") for r in filas)
 
     def _mostrar_alquileres_por_trimestre(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, filas = rpt.obtener_alquileres_por_trimestre(f_d, f_h)
+        self._ejecutar(lambda tarea: rpt.obtener_alquileres_por_trimestre(f_d, f_h), self._pintar_alquileres_por_trimestre)
+
+    def _pintar_alquileres_por_trimestre(self, resultado):
+        ok, filas = resultado
         if not ok: return
 
         self._configurar_tabla([
@@ -360,39 +480,47 @@ class ReportesScreen(ctk.CTkFrame):
             {"id": "t", "text": "Total", "width": 120, "anchor": "e"},
         ])
         self._limpiar_resumen_labels()
-        for r in filas:
-            self.tree.insert("", "end", values=(r["anio"], r["trimestre"], r["cantidad"], f"{r['total']:.2f}"))
+        self._llenar_tabla((r["anio"], r["trimestre"], r["cantidad"], f"{r['total']:.2f}") for r in filas)
 
     # --------------------------------------------------------------
     # GRÁFICOS
     # --------------------------------------------------------------
+    # La figura (matplotlib.figure.Figure, sin pyplot) se arma en el hilo de
+    # trabajo; sólo el canvas de Tk se crea en el hilo de la interfaz.
+    def _grafico(self, generar, titulo):
+        def mostrar(resultado):
+            ok, fig = resultado
+            if ok: self._mostrar_figura(fig, titulo)
+
+        self._ejecutar(lambda tarea: generar(), mostrar, "Generando gráfico...")
+
     def _grafico_resumen_economico(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, fig = rpt_g.grafico_resumen_economico(f_d, f_h)
-        if ok: self._mostrar_figura(fig, "Resumen Económico")
+        self._grafico(lambda: _graficos().grafico_resumen_economico(f_d, f_h), "Resumen Económico")
 
     def _grafico_top_vehiculos(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, fig = rpt_g.grafico_top_vehiculos(f_d, f_h)
-        if ok: self._mostrar_figura(fig, "Top Vehículos")
+        self._grafico(lambda: _graficos().grafico_top_vehiculos(f_d, f_h), "Top Vehículos")
 
     def _grafico_top_clientes(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, fig = rpt_g.grafico_top_clientes(f_d, f_h)
-        if ok: self._mostrar_figura(fig, "Top Clientes")
+        self._grafico(lambda: _graficos().grafico_top_clientes(f_d, f_h), "Top Clientes")
 
     def _grafico_estado_flota(self):
-        ok, fig = rpt_g.grafico_estado_flota()
-        if ok: self._mostrar_figura(fig, "Estado de Flota")
+        self._grafico(lambda: _graficos().grafico_estado_flota(), "Estado de Flota")
+
+    def _grafico_timeline_flota(self):
+        f_d, f_h = self._obtener_rango_fechas()
+        if not f_d: return
+        self._grafico(lambda: _graficos().grafico_timeline_flota(f_d, f_h), "Ocupación de Flota")
 
     def _grafico_facturacion_mensual(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
-        ok, fig = rpt_g.grafico_facturacion_mensual(f_d, f_h)
-        if ok: self._mostrar_figura(fig, "Facturación Mensual")
+        self._grafico(lambda: _graficos().grafico_facturacion_mensual(f_d, f_h), "Facturación Mensual")
 
     # --------------------------------------------------------------
     # PDF
@@ -400,32 +528,57 @@ class ReportesScreen(ctk.CTkFrame):
     def _elegir_ruta(self, default):
         return filedialog.asksaveasfilename(title="Guardar PDF", defaultextension=".pdf", initialfile=default, filetypes=[("PDF", "*.pdf")])
 
+    def _exportar(self, calcular, exportar):
+        """
+        Exporta en dos etapas: calcular() deja el reporte en la caché de
+        reportes y exportar() escribe el PDF (volviendo a pedirlo, sin costo).
+        """
+        def trabajo(tarea):
+            calcular()
+            tarea.progreso("Generando PDF...")
+            return exportar()
+
+        def informar(resultado):
+            ok, msg = resultado
+            messagebox.showinfo("Info", msg)
+
+        self._ejecutar(trabajo, informar)
+
     def _exportar_resumen_pdf(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
         ruta = self._elegir_ruta("resumen.pdf")
         if ruta: 
-            ok, msg = rpt_x.export_resumen_economico_pdf(ruta, f_d, f_h)
-            messagebox.showinfo("Info", msg)
+            self._exportar(
+                lambda: rpt.obtener_resumen_economico(f_d, f_h),
+                lambda: _pdf().export_resumen_economico_pdf(ruta, f_d, f_h),
+            )
 
     def _exportar_top_vehiculos_pdf(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
         ruta = self._elegir_ruta("top_vehiculos.pdf")
         if ruta:
-            ok, msg = rpt_x.export_top_vehiculos_pdf(ruta, f_d, f_h)
-            messagebox.showinfo("Info", msg)
+            self._exportar(
+                lambda: rpt.obtener_top_vehiculos(f_d, f_h, limite=20),
+                lambda: _pdf().export_top_vehiculos_pdf(ruta, f_d, f_h),
+            )
 
     def _exportar_top_clientes_pdf(self):
         f_d, f_h = self._obtener_rango_fechas()
         if not f_d: return
         ruta = self._elegir_ruta("top_clientes.pdf")
         if ruta:
-            ok, msg = rpt_x.export_top_clientes_pdf(ruta, f_d, f_h)
-            messagebox.showinfo("Info", msg)
+            self._exportar(
+                lambda: rpt.obtener_top_clientes(f_d, f_h, limite=20),
+                lambda: _pdf().export_top_clientes_pdf(ruta, f_d, f_h),
+            )
 
     def _exportar_estado_flota_pdf(self):
         ruta = self._elegir_ruta("estado_flota.pdf")
         if ruta:
-            ok, msg = rpt_x.export_estado_flota_pdf(ruta)
-            messagebox.showinfo("Info", msg)
\ No newline at end of file
+            hoy = date.today().isoformat()
+            self._exportar(
+                lambda: rpt.obtener_estado_flota(hoy),
+                lambda: _pdf().export_estado_flota_pdf(ruta, hoy),
+            )
@@ -0,0 +1,307 @@
+import tkinter as tk
+from tkinter import ttk
+
+import customtkinter as ctk
+
+
+class TablaVirtual(ctk.CTkFrame):
+    """
+    Tabla con la API básica de ttk.Treeview que sólo crea los ítems de las
+    filas visibles (más `buffer` arriba y abajo), así maneja cientos de
+    miles de filas sin que Tk se vuelva inusable.
+
+    Los datos viven en una secuencia de Python [(iid, valores)]: cualquier
+    objeto con len() y slicing, p. ej. una lista o una vista paginada de un
+    repositorio. La barra de desplazamiento recorre la secuencia completa y
+    al moverse se reemplazan los ítems materializados.
+
+    La selección es por iid: se conserva aunque la fila salga de la ventana,
+    al ordenar y al recargar si la fila sigue existiendo. <<TreeviewSelect>>
+    se genera sobre este widget sólo cuando el usuario cambia la selección.
+    """
+
+    def __init__(self, master, columns=(), buffer=30, **kwargs):
+        super().__init__(master, fg_color="transparent")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse", **kwargs)
+        self._tree.grid(row=0, column=0, sticky="nsew")
+        self._scroll = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scroll.grid(row=0, column=1, sticky="ns", padx=(5, 0))
+        self._tree.configure(yscrollcommand=self._on_tree_scroll)
+
+        self._buffer = buffer
+        self._filas = []
+        self._posiciones = None      # iid -> índice en _filas (se arma al necesitarlo)
+        self._primera = 0            # primera fila visible
+        self._inicio = 0             # rango materializado en el Treeview: [_inicio, _fin)
+        self._fin = 0
+        self._visibles = 20
+        self._seleccion = None
+        self._orden = None           # (columna, descendente)
+        self._textos = {}            # columna -> texto del encabezado sin flecha
+        self._rebase_pendiente = False
+
+        self._tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self._tree.bind("<Configure>", self._on_configure)
+
+    def bind(self, secuencia=None, comando=None, add=None):
+        # CTkFrame.bind enlaza sobre su canvas interno; acá se necesita el
+        # propio widget, que es donde se genera <<TreeviewSelect>>.
+        return tk.Misc.bind(self, secuencia, comando, add)
+
+    # ------------------------------------------------------------------
+    # Columnas (misma firma que ttk.Treeview)
+    # ------------------------------------------------------------------
+    def configurar_columnas(self, columnas):
+        """Reemplaza las columnas; descarta el orden y vuelve al principio."""
+        self._tree["columns"] = columnas
+        self._textos = {}
+        self._orden = None
+        self._primera = 0
+
+    def heading(self, columna, **kwargs):
+        if "text" in kwargs:
+            self._textos[columna] = kwargs["text"]
+            kwargs.setdefault("command", lambda c=columna: self.ordenar(c))
+        return self._tree.heading(columna, **kwargs)
+
+    def column(self, columna, **kwargs):
+        return self._tree.column(columna, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+    def cargar(self, filas):
+        """
+        Reemplaza los datos por `filas` ([(iid, valores)]). Se conservan la
+        posición de desplazamiento, el orden elegido y la selección si su
+        fila sigue estando.
+        """
+        self._filas = filas
+        self._posiciones = None
+        if self._orden is not None:
+            self._ordenar_filas()
+        if self._seleccion is not None and self._posicion(self._seleccion) is None:
+            self._seleccion = None
+        self._mostrar(self._primera, forzar=True)
+
+    def aplicar_cambios(self, filas, ids):
+        """
+        Actualiza sólo las filas de `ids`: las que vienen en `filas`
+        ([(iid, valores)]) se reemplazan en su lugar o se agregan al final
+        (o donde corresponda si hay un orden elegido); las que no vienen se
+        quitan. Los ítems materializados se tocan de a uno salvo que la
+        ventana visible haya cambiado de filas.
+        """
+        nuevas = dict(filas)
+        ids = {str(i) for i in ids}
+        if not isinstance(self._filas, list):
+            self._filas = list(self._filas)
+
+        agregadas = []
+        quitadas = set()
+        for iid in ids:
+            pos = self._posicion(iid)
+            if iid in nuevas:
+                if pos is None:
+                    agregadas.append((iid, nuevas[iid]))
+                else:
+                    self._filas[pos] = (iid, nuevas[iid])
+            elif pos is not None:
+                quitadas.add(iid)
+
+        if quitadas:
+            self._filas = [fila for fila in self._filas if fila[0] not in quitadas]
+            self._posiciones = None
+            if self._seleccion in quitadas:
+                self._seleccion = None
+        if agregadas:
+            self._filas.extend(agregadas)
+            self._posiciones = None
+        if self._orden is not None and (agregadas or ids & nuevas.keys()):
+            # Casi ordenada: timsort la resuelve en tiempo lineal
+            self._ordenar_filas()
+            self._posiciones = None
+
+        total = len(self._filas)
+        primera = max(0, min(self._primera, total - self._visibles))
+        inicio = max(0, primera - self._buffer)
+        fin = min(total, primera + self._visibles + self._buffer)
+        ventana = self._filas[inicio:fin]
+        if (inicio, fin) != (self._inicio, self._fin) or \
+                tuple(iid for iid, _ in ventana) != self._tree.get_children():
+            self._mostrar(primera, forzar=True)
+            return
+
+        for iid, valores in ventana:
+            if iid in ids:
+                self._tree.item(iid, values=valores)
+        self._restaurar_seleccion()
+        self._actualizar_barra()
+
+    def __len__(self):
+        return len(self._filas)
+
+    def get_children(self, item=""):
+        """Todos los iids (no sólo los materializados), en el orden actual."""
+        return tuple(iid for iid, _ in self._filas)
+
+    def item(self, iid, option=None):
+        pos = self._posicion(iid)
+        if pos is None:
+            raise tk.TclError(f'Item {iid} not found')
+        valores = self._filas[pos][1]
+        datos = {"values": valores}
+        return datos if option is None else datos[option]
+
+    def _posicion(self, iid):
+        if self._posiciones is None:
+            self._posiciones = {fila[0]: i for i, fila in enumerate(self._filas)}
+        return self._posiciones.get(iid)
+
+    # ------------------------------------------------------------------
+    # Orden
+    # ------------------------------------------------------------------
+    def ordenar(self, columna, descendente=None):
+        """Ordena por `columna`; sin `descendente`, alterna en cada clic."""
+        if descendente is None:
+            descendente = self._orden is not None and self._orden == (columna, False)
+        self._orden = (columna, descendente)
+        self._ordenar_filas()
+        self._posiciones = None
+
+        for col, texto in self._textos.items():
+            flecha = (" ▼" if descendente else " ▲") if col == columna else ""
+            self._tree.heading(col, text=texto + flecha)
+
+        pos = self._posicion(self._seleccion) if self._seleccion is not None else None
+        self._mostrar(pos - self._visibles // 2 if pos is not None else 0, forzar=True)
+
+    def _ordenar_filas(self):
+        columna, descendente = self._orden
+        indice = list(self._tree["columns"]).index(columna)
+
+        def clave(fila):
+            valor = fila[1][indice]
+            try:
+                return (0, float(valor), "")
+            except (TypeError, ValueError):
+                return (1, 0.0, str(valor).lower())
+
+        self._filas = sorted(self._filas, key=clave, reverse=descendente)
+
+    # ------------------------------------------------------------------
+    # Selección por iid
+    # ------------------------------------------------------------------
+    def selection(self):
+        return (self._seleccion,) if self._seleccion is not None else ()
+
+    def selection_set(self, iid):
+        """Selecciona `iid` y desplaza la tabla hasta él (no genera evento)."""
+        pos = self._posicion(iid)
+        if pos is None:
+            return
+        self._seleccion = iid
+        if not self._primera <= pos < self._primera + self._visibles:
+            self._mostrar(pos - self._visibles // 2)
+        else:
+            self._restaurar_seleccion()
+
+    def selection_remove(self, *iids):
+        if self._seleccion in iids or not iids:
+            self._seleccion = None
+            self._tree.selection_set(())
+
+    def see(self, iid):
+        pos = self._posicion(iid)
+        if pos is not None and not self._primera <= pos < self._primera + self._visibles:
+            self._mostrar(pos - self._visibles // 2)
+
+    def _on_tree_select(self, event):
+        seleccion = self._tree.selection()
+        if seleccion:
+            nueva = seleccion[0]
+        elif self._seleccion is not None and self._tree.exists(self._seleccion):
+            nueva = None
+        else:
+            # La fila seleccionada sólo dejó de estar materializada
+            nueva = self._seleccion
+        if nueva != self._seleccion:
+            self._seleccion = nueva
+            self.event_generate("<<TreeviewSelect>>")
+
+    def _restaurar_seleccion(self):
+        if self._seleccion is not None and self._tree.exists(self._seleccion):
+            if self._tree.selection() != (self._seleccion,):
+                self._tree.selection_set(self._seleccion)
+        elif self._tree.selection():
+            self._tree.selection_set(())
+
+    # ------------------------------------------------------------------
+    # Ventana de filas materializadas
+    # ------------------------------------------------------------------
+    def _mostrar(self, primera, forzar=False):
+        """Deja materializadas las filas alrededor de `primera`; con `forzar`
+        las vuelve a crear aunque el rango no cambie (datos u orden nuevos)."""
+        total = len(self._filas)
+        primera = max(0, min(int(primera), total - self._visibles))
+        inicio = max(0, primera - self._buffer)
+        fin = min(total, primera + self._visibles + self._buffer)
+
+        if forzar or (inicio, fin) != (self._inicio, self._fin):
+            self._tree.delete(*self._tree.get_children())
+            for iid, valores in self._filas[inicio:fin]:
+                self._tree.insert("", "end", iid=iid, values=valores)
+            self._inicio, self._fin = inicio, fin
+
+        self._primera = primera
+        if fin > inicio:
+            self._tree.yview_moveto((primera - inicio) / (fin - inicio))
+        self._restaurar_seleccion()
+        self._actualizar_barra()
+
+    def _actualizar_barra(self):
+        total = len(self._filas)
+        if total <= self._visibles:
+            self._scroll.set(0.0, 1.0)
+        else:
+            self._scroll.set(self._primera / total, (self._primera + self._visibles) / total)
+
+    def _on_scrollbar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._mostrar(float(cantidad) * len(self._filas))
+        elif accion == "scroll":
+            paso = self._visibles if unidad == "pages" else 1
+            self._mostrar(self._primera + int(cantidad) * paso)
+
+    def _on_tree_scroll(self, primero, ultimo):
+        # El Treeview se desplazó solo (rueda del mouse, flechas): se traduce
+        # a la posición en los datos y, cerca del borde del buffer, se corre
+        # la ventana materializada.
+        materializadas = self._fin - self._inicio
+        if not materializadas:
+            self._actualizar_barra()
+            return
+        self._primera = self._inicio + round(float(primero) * materializadas)
+        self._actualizar_barra()
+
+        margen = self._buffer // 2
+        cerca_arriba = self._inicio > 0 and self._primera - self._inicio < margen
+        cerca_abajo = self._fin < len(self._filas) and self._fin - (self._primera + self._visibles) < margen
+        if (cerca_arriba or cerca_abajo) and not self._rebase_pendiente:
+            self._rebase_pendiente = True
+            self.after_idle(self._rebase)
+
+    def _rebase(self):
+        self._rebase_pendiente = False
+        self._mostrar(self._primera)
+
+    def _on_configure(self, event):
+        alto_fila = int(ttk.Style().lookup("Treeview", "rowheight") or 25)
+        # Se descuenta el encabezado (aprox. una fila)
+        visibles = max(1, event.height // alto_fila - 1)
+        if visibles != self._visibles:
+            self._visibles = visibles
+            self._mostrar(self._primera, forzar=True)
@@ -0,0 +1,199 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.repositories.db_connection import get_connection, release_connection
+
+
+# Hilos compartidos por todas las pantallas (cada uno usa una conexión del pool)
+_MAX_HILOS = 4
+_pool = None
+_lock_pool = threading.Lock()
+
+
+def _pool_compartido():
+    global _pool
+    if _pool is None:
+        with _lock_pool:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_MAX_HILOS, thread_name_prefix="tarea")
+    return _pool
+
+
+class TareaCancelada(Exception):
+    """La tarea se canceló antes de terminar."""
+
+
+class Tarea:
+    """
+    Trabajo que corre en un hilo del EjecutorTareas.
+
+    La función de trabajo recibe la Tarea y puede informar avance con
+    progreso() y revisar con verificar() si la cancelaron. cancelar()
+    además interrumpe la consulta SQLite que esté en curso en su conexión.
+    """
+
+    def __init__(self, ejecutor, funcion, al_terminar, al_error, al_progreso):
+        self._ejecutor = ejecutor
+        self._funcion = funcion
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.al_progreso = al_progreso
+        self._cancelada = threading.Event()
+        self._lock = threading.Lock()
+        self._conexion = None      # la del hilo, sólo mientras corre
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def cancelar(self):
+        self._cancelada.set()
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.interrupt()
+
+    def verificar(self):
+        """Lanza TareaCancelada si se pidió cancelar (usar entre etapas)."""
+        if self._cancelada.is_set():
+            raise TareaCancelada()
+
+    def progreso(self, mensaje, hechos=None, total=None):
+        """Informa avance; con hechos/total la barra deja de ser indeterminada."""
+        self.verificar()
+        self._ejecutor._eventos.put((self, "progreso", (mensaje, hechos, total)))
+
+    def _correr(self):
+        try:
+            self.verificar()
+            with self._lock:
+                self._conexion = get_connection()
+            resultado = self._funcion(self)
+            self.verificar()
+            evento = ("terminado", resultado)
+        except TareaCancelada:
+            evento = ("cancelada", None)
+        except sqlite3.OperationalError as e:
+            # conn.interrupt() corta la consulta con "interrupted"
+            evento = ("cancelada", None) if self.cancelada else ("error", e)
+        except Exception as e:
+            evento = ("error", e)
+        finally:
+            with self._lock:
+                self._conexion = None
+            release_connection()
+        self._ejecutor._eventos.put((self,) + evento)
+
+
+class EjecutorTareas:
+    """
+    Corre funciones fuera del hilo de Tk y entrega sus resultados en el
+    hilo de la interfaz, revisando una cola con widget.after().
+
+    Los callbacks (al_terminar, al_error, al_progreso) siempre se invocan
+    desde el loop de Tk, así pueden tocar widgets directamente. Una tarea
+    cancelada no invoca ninguno. Al destruirse el widget (p. ej. al navegar
+    a otra pantalla) se cancela todo lo pendiente y sus resultados se
+    descartan.
+
+    Se usan hilos y no procesos: el trabajo pesado ocurre en SQLite y NumPy,
+    que liberan el GIL, y cada hilo tiene su propia conexión del pool.
+    """
+
+    def __init__(self, widget, intervalo_ms=50):
+        self._widget = widget
+        self._eventos = queue.Queue()
+        self._intervalo_ms = intervalo_ms
+        self._pendientes = set()
+        self._por_clave = {}        # clave -> última Tarea pedida con esa clave
+        self._llenados = {}         # id(tabla) -> número del último llenado pedido
+        self._revisando = False
+        self._cerrado = False
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def ejecutar(self, funcion, al_terminar=None, al_error=None, al_progreso=None, clave=None):
+        """
+        Encola funcion(tarea) y devuelve la Tarea (para cancelarla). Con
+        `clave`, cancela la tarea anterior de la misma clave que siga en
+        curso: de dos recargas de la misma tabla sólo se muestra la última.
+        """
+        tarea = Tarea(self, funcion, al_terminar, al_error, al_progreso)
+        if self._cerrado:
+            tarea.cancelar()
+            return tarea
+        if clave is not None:
+            anterior = self._por_clave.get(clave)
+            if anterior is not None:
+                anterior.cancelar()
+            self._por_clave[clave] = tarea
+        self._pendientes.add(tarea)
+        _pool_compartido().submit(tarea._correr)
+        if not self._revisando:
+            self._revisando = True
+            self._widget.after(self._intervalo_ms, self._revisar)
+        return tarea
+
+    @property
+    def ocupado(self):
+        return bool(self._pendientes)
+
+    def cancelar_todas(self):
+        for tarea in list(self._pendientes):
+            tarea.cancelar()
+
+    def llenar_tabla(self, tabla, filas, tamano_lote=500):
+        """
+        Reemplaza el contenido de un ttk.Treeview por `filas` ([(iid, valores)],
+        armadas en el hilo de trabajo), insertando de a `tamano_lote` por
+        vuelta del loop de Tk para no congelar la ventana con tablas grandes.
+        Un llenado nuevo de la misma tabla abandona el anterior.
+        """
+        numero = self._llenados.get(id(tabla), 0) + 1
+        self._llenados[id(tabla)] = numero
+        tabla.delete(*tabla.get_children())
+
+        def lote(desde):
+            if self._cerrado or self._llenados.get(id(tabla)) != numero:
+                return
+            for iid, valores in filas[desde:desde + tamano_lote]:
+                tabla.insert("", "end", iid=iid, values=valores)
+            if desde + tamano_lote < len(filas):
+                self._widget.after(1, lote, desde + tamano_lote)
+
+        lote(0)
+
+    def _revisar(self):
+        if self._cerrado:
+            return
+        while True:
+            try:
+                tarea, tipo, dato = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            if tipo != "progreso":
+                self._pendientes.discard(tarea)
+            if tarea.cancelada:
+                continue
+            callback = {
+                "progreso": tarea.al_progreso,
+                "terminado": tarea.al_terminar,
+                "error": tarea.al_error,
+            }.get(tipo)
+            if callback is None:
+                continue
+            if tipo == "progreso":
+                callback(*dato)
+            else:
+                callback(dato)
+
+        if self._pendientes:
+            self._widget.after(self._intervalo_ms, self._revisar)
+        else:
+            self._revisando = False
+
+    def _on_destroy(self, event):
+        if event.widget is not self._widget or self._cerrado:
+            return
+        self._cerrado = True
+        self.cancelar_todas()
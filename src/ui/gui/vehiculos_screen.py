@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import customtkinter as ctk
 from src.services.vehiculo_service import VehiculoService
+from src.ui.gui.tareas import EjecutorTareas
+from src.ui.gui.recarga_al_volver import RecargaAlVolver
 
 # Listas para los Combobox
 MARCAS = [
@@ -12,7 +14,7 @@ MARCAS = [
 ANOS = [str(a) for a in range(2000, 2026)]
 TIPOS = ["auto", "camioneta", "moto"]
 
-class VehiculosScreen(ctk.CTkFrame):
+class VehiculosScreen(RecargaAlVolver, ctk.CTkFrame):
     """
     Pantalla de gestión de vehículos (Versión Modernizada).
     """
@@ -23,10 +25,12 @@ class VehiculosScreen(ctk.CTkFrame):
         self.usuario_actual = usuario_actual
         self.on_back = on_back
         self._vehiculo_actual_id = None
+        self._tareas = EjecutorTareas(self)
 
+        # La consulta arranca antes de armar la UI; la tabla se llena al llegar
+        self._cargar_tabla()
         self._configurar_estilos_treeview()
         self._construir_ui()
-        self._cargar_tabla()
 
     def _configurar_estilos_treeview(self):
         """Aplica estilo oscuro a la tabla estándar de Tkinter."""
@@ -214,25 +218,35 @@ class VehiculosScreen(ctk.CTkFrame):
         if self.tree.selection():
             self.tree.selection_remove(self.tree.selection()[0])
 
+    def recargar(self):
+        self._cargar_tabla()
+
     def _cargar_tabla(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._tareas.ejecutar(
+            self._leer_vehiculos,
+            al_terminar=lambda filas: self._tareas.llenar_tabla(self.tree, filas),
+            clave="tabla",
+        )
 
+    def _leer_vehiculos(self, tarea):
+        """Corre en un hilo de trabajo: devuelve [(iid, valores)] para la tabla."""
         ok, vehiculos = VehiculoService.listar_vehiculos()
-        if not ok: return
+        if not ok: return []
 
+        filas = []
         for v in vehiculos:
             # Alerta visual simple
             alerta = "⚠ Bajo" if v.combustible_actual < 5 else "OK"
             if v.estado == "MANTENIMIENTO": alerta = "🔧 Taller"
             elif v.estado == "ALQUILADO": alerta = "🚗 En uso"
 
-            self.tree.insert("", "end", iid=str(v.id_vehiculo), values=(
+            filas.append((str(v.id_vehiculo), (
                 v.id_vehiculo, v.patente, v.marca, v.modelo, v.anio,
                 v.tipo, f"{v.precio_por_dia:.2f}", f"{v.km_actual:.0f}", 
                 f"{v.combustible_actual:.1f}", alerta,
                 "Sí" if v.activo else "No"
-            ))
+            )))
+        return filas
 
     def _on_tree_select(self, event):
         sel = self.tree.selection()